@@ -1,42 +1,129 @@
 """The Tech Controllers integration."""
 import asyncio
+from datetime import datetime, timedelta
 import logging
-
-from aiohttp import ClientSession
+import time
+from typing import TYPE_CHECKING
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_DESCRIPTION, CONF_NAME, CONF_TOKEN
-from homeassistant.core import HomeAssistant
-from homeassistant.exceptions import ConfigEntryAuthFailed
-from homeassistant.helpers import (
-    config_validation as cv,
-    device_registry as dr,
-    entity_registry as er,
+from homeassistant.const import (
+    CONF_NAME,
+    CONF_PASSWORD,
+    CONF_SCAN_INTERVAL,
+    CONF_TOKEN,
+    CONF_TYPE,
+    CONF_USERNAME,
+    CONF_ZONE,
+    EVENT_HOMEASSISTANT_CLOSE,
+    EVENT_HOMEASSISTANT_STOP,
+    Platform,
 )
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.helpers import config_validation as cv, entity_registry as er
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
+from homeassistant.util.ssl import get_default_context
 
 from . import assets
+from .accumulators import MAX_GAP_INTERVALS, OnTimeTracker
+from .aggregates import compute_aggregates
+from .connection import ConnectionStats, create_session
 from .const import (
     API_TIMEOUT,
+    BINARY_SENSOR_TILE_TYPES,
+    CONF_API_URL,
+    CONF_BINARY_SENSORS,
+    CONF_CONNECTION_LIMIT,
+    CONF_CONNECTION_LIMIT_PER_HOST,
+    CONF_DEDICATED_SESSION,
+    CONF_DNS_CACHE_TTL,
+    CONF_KEEPALIVE_TIMEOUT,
+    CONF_MAX_PARALLEL_POLLS,
+    CONF_MAX_STALE_AGE,
+    CONF_POLL_TIMEOUT,
+    CONF_RECORD_PAYLOADS,
+    CONF_RETRIES,
+    CONF_RETRY_BACKOFF,
+    CONF_TILE_TYPES,
+    CONF_TRIM_TRANSLATIONS,
+    CONF_UNAVAILABLE_AFTER_FAILURES,
+    CONF_UPDATE_TIMEOUT,
+    CONF_WARM_UP_LEAD,
+    CONF_WRITE_TIMEOUT,
+    CONF_ZONE_CLIMATE,
+    CONF_ZONE_SENSORS,
     CONTROLLER,
+    CONTROLLERS,
+    DATA_QUEUES,
+    DATA_SCHEDULERS,
+    DATA_SESSIONS,
+    DEFAULT_CONNECTION_LIMIT,
+    DEFAULT_CONNECTION_LIMIT_PER_HOST,
+    DEFAULT_DNS_CACHE_TTL,
+    DEFAULT_KEEPALIVE_TIMEOUT,
+    DEFAULT_MAX_PARALLEL_POLLS,
+    DEFAULT_MAX_STALE_AGE,
+    DEFAULT_UNAVAILABLE_AFTER_FAILURES,
+    DEFAULT_WARM_UP_LEAD,
     DOMAIN,
-    MANUFACTURER,
     PLATFORMS,
+    RECORDINGS_DIR,
     SCAN_INTERVAL,
     UDID,
     USER_ID,
     VER,
+    VISIBILITY,
 )
-from .tech import Tech, TechError, TechLoginError
+from .filters import DEFAULT_DEADBANDS
+from .scheduler import PollScheduler
+from .tech import (
+    DEFAULT_RETRIES,
+    DEFAULT_TIMEOUTS,
+    ENDPOINT_POLL,
+    ENDPOINT_WRITE,
+    RETRY_BACKOFF,
+    RequestQueue,
+    Tech,
+    TechError,
+    TechLoginError,
+)
+from .trends import ZoneTrend
+
+if TYPE_CHECKING:
+    from aiohttp import ClientSession
+
+    from .flight_recorder import PayloadRecorder
 
 _LOGGER = logging.getLogger(__name__)
 
 CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
 
+# options taking effect only when the entry is set up again, all others are
+# applied to the running entry
+RELOAD_OPTIONS = (
+    CONF_ZONE_CLIMATE,
+    CONF_ZONE_SENSORS,
+    CONF_TILE_TYPES,
+    CONF_BINARY_SENSORS,
+    CONF_TRIM_TRANSLATIONS,
+    CONF_DEDICATED_SESSION,
+    CONF_CONNECTION_LIMIT,
+    CONF_CONNECTION_LIMIT_PER_HOST,
+    CONF_DNS_CACHE_TTL,
+    CONF_KEEPALIVE_TIMEOUT,
+    CONF_API_URL,
+)
+
 
 async def async_setup(hass: HomeAssistant, config: dict):  # pylint: disable=unused-argument
     """Set up the Tech Controllers component."""
+    from .services import (  # pylint: disable=import-outside-toplevel
+        async_setup_services,
+    )
+
+    async_setup_services(hass)
     return True
 
 
@@ -56,119 +143,396 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
     token = entry.data[CONF_TOKEN]
     # Store an API object for your platforms to access
     hass.data.setdefault(DOMAIN, {})
-    websession = async_get_clientsession(hass)
+    websession, stats = async_get_entry_session(hass, entry)
+    queue = async_get_request_queue(hass, entry)
+
+    if CONTROLLERS in entry.data:
+        coordinator = TechAccountCoordinator(
+            hass,
+            websession,
+            user_id,
+            token,
+            entry.data[CONTROLLERS],
+            queue=queue,
+        )
+        # the account coordinator has no entities of its own, keep it polling
+        entry.async_on_unload(coordinator.async_add_listener(lambda: None))
+    else:
+        coordinator = TechCoordinator(
+            hass,
+            websession,
+            user_id,
+            token,
+            controller=entry.data[CONTROLLER],
+            queue=queue,
+        )
+    coordinator.connection_stats = stats
+    if CONF_USERNAME in entry.data:
+        coordinator.api.credentials = (
+            entry.data[CONF_USERNAME],
+            entry.data[CONF_PASSWORD],
+        )
+    if api_url := entry.options.get(CONF_API_URL):
+        coordinator.api.base_url = api_url
+    async_apply_options(hass, entry, coordinator)
+
+    async def _async_close_recorder(event: Event) -> None:
+        # entries are not unloaded on shutdown, end the recording here
+        if coordinator.api.recorder is not None:
+            await coordinator.api.recorder.async_close()
 
-    coordinator = TechCoordinator(hass, websession, user_id, token)
+    entry.async_on_unload(
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_close_recorder)
+    )
+    # no work is done per poll for the sensors of disabled categories
+    zone_sensors = entry.options.get(CONF_ZONE_SENSORS, True)
+    binary_sensors = entry.options.get(CONF_BINARY_SENSORS, True)
+    for controller_coordinator in coordinator.controller_coordinators:
+        controller_coordinator.track_trends = zone_sensors
+        if not zone_sensors and not binary_sensors:
+            controller_coordinator.on_time = None
+            continue
+        controller_coordinator.on_time.zones = zone_sensors
+        controller_coordinator.on_time.tiles = binary_sensors
+        await controller_coordinator.on_time.async_load()
+    platforms = async_get_entry_platforms(entry)
+    # entities of platforms disabled in the options are not provided anymore
+    entity_registry = er.async_get(hass)
+    for entity in er.async_entries_for_config_entry(entity_registry, entry.entry_id):
+        if entity.domain not in platforms:
+            entity_registry.async_remove(entity.entity_id)
     hass.data[DOMAIN][entry.entry_id] = coordinator
+    async_register_poll_phase(hass, entry, coordinator)
 
     await coordinator.async_config_entry_first_refresh()
-
-    await assets.load_subtitles(language_code, Tech(websession, user_id, token))
+    coordinator.platforms = async_get_used_platforms(coordinator, platforms)
+
+    referenced = None
+    if entry.options.get(CONF_TRIM_TRANSLATIONS):
+        referenced = assets.referenced_text_ids(
+            controller_coordinator.data
+            for controller_coordinator in coordinator.controller_coordinators
+            if controller_coordinator.data is not None
+        )
+    await assets.async_load_translations(
+        hass, entry, language_code, coordinator.api, referenced
+    )
+    if referenced is not None:
+        for controller_coordinator in coordinator.controller_coordinators:
+            controller_coordinator.trimmed_language = language_code
 
     hass.async_create_task(
-        hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+        hass.config_entries.async_forward_entry_setups(entry, coordinator.platforms)
     )
+    entry.async_on_unload(entry.add_update_listener(async_update_options))
 
     return True
 
 
+async def async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Apply changed options, reloading the entry only when they require it."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    if any(
+        entry.options.get(option) != coordinator.applied_options.get(option)
+        for option in RELOAD_OPTIONS
+    ):
+        await hass.config_entries.async_reload(entry.entry_id)
+    elif entry.options != coordinator.applied_options:
+        async_apply_options(hass, entry, coordinator)
+
+
+@callback
+def async_apply_options(
+    hass: HomeAssistant, entry: ConfigEntry, coordinator: "TechCoordinator"
+) -> None:
+    """Apply the tuning options of an entry to its coordinators and client.
+
+    None of these options needs the entities to be set up again, so they
+    are applied while the entry is running, taking effect with the next
+    request or poll.
+    """
+    options = entry.options
+    interval = options.get(CONF_SCAN_INTERVAL, SCAN_INTERVAL.total_seconds())
+    coordinator.update_interval = timedelta(seconds=interval)
+
+    api = coordinator.api
+    for endpoint, option in (
+        (ENDPOINT_POLL, CONF_POLL_TIMEOUT),
+        (ENDPOINT_WRITE, CONF_WRITE_TIMEOUT),
+    ):
+        api.set_total_timeout(
+            endpoint, options.get(option, DEFAULT_TIMEOUTS[endpoint].total)
+        )
+    api.retries = options.get(CONF_RETRIES, DEFAULT_RETRIES)
+    api.retry_backoff = options.get(CONF_RETRY_BACKOFF, RETRY_BACKOFF)
+    if not options.get(CONF_RECORD_PAYLOADS):
+        if api.recorder is not None:
+            hass.async_create_task(api.recorder.async_close())
+        api.recorder = None
+    elif api.recorder is None:
+        from .flight_recorder import (  # pylint: disable=import-outside-toplevel
+            PayloadRecorder,
+        )
+
+        api.recorder = PayloadRecorder(hass.config.path(RECORDINGS_DIR, entry.entry_id))
+        _LOGGER.info("Recording Tech API payloads to %s", api.recorder.directory)
+
+    if coordinator.connection_stats is not None:
+        coordinator.warm_up_lead = options.get(CONF_WARM_UP_LEAD, DEFAULT_WARM_UP_LEAD)
+    if isinstance(coordinator, TechAccountCoordinator):
+        max_parallel = options.get(CONF_MAX_PARALLEL_POLLS, DEFAULT_MAX_PARALLEL_POLLS)
+        coordinator.set_max_parallel(max_parallel)
+        # the account's queue would otherwise hold the polls to its default
+        api.queue.set_poll_limit(max_parallel)
+    deadbands = {
+        option: options.get(option, deadband)
+        for option, deadband in DEFAULT_DEADBANDS.items()
+    }
+    for controller_coordinator in coordinator.controller_coordinators:
+        controller_coordinator.update_timeout = options.get(
+            CONF_UPDATE_TIMEOUT, API_TIMEOUT
+        )
+        controller_coordinator.unavailable_after_failures = options.get(
+            CONF_UNAVAILABLE_AFTER_FAILURES, DEFAULT_UNAVAILABLE_AFTER_FAILURES
+        )
+        controller_coordinator.max_stale_age = options.get(
+            CONF_MAX_STALE_AGE, DEFAULT_MAX_STALE_AGE
+        )
+        controller_coordinator.deadbands = deadbands
+        if controller_coordinator.on_time is not None:
+            controller_coordinator.on_time.max_gap = MAX_GAP_INTERVALS * interval
+
+    coordinator.applied_options = dict(options)
+    coordinator.async_reschedule()
+
+
+@callback
+def async_get_entry_platforms(entry: ConfigEntry) -> list[Platform]:
+    """Return the platforms providing the entity categories enabled for an entry.
+
+    The sensor platform is always set up for the controller-wide sensors,
+    the others are skipped when their entities are disabled in the options.
+    """
+    disabled = set()
+    if not entry.options.get(CONF_ZONE_CLIMATE, True):
+        disabled.add(Platform.CLIMATE)
+    if not entry.options.get(CONF_BINARY_SENSORS, True):
+        disabled.add(Platform.BINARY_SENSOR)
+    return [platform for platform in PLATFORMS if platform not in disabled]
+
+
+@callback
+def async_get_used_platforms(
+    coordinator: "TechCoordinator", platforms: list[Platform]
+) -> list[Platform]:
+    """Return the platforms having entities for the fetched controllers.
+
+    A platform and the HA component behind it are imported only when an
+    entry is forwarded to it, so climate is skipped for controllers without
+    zones and binary_sensor for controllers without relay tiles.
+    """
+    modules = [
+        controller_coordinator.data
+        for controller_coordinator in coordinator.controller_coordinators
+        if controller_coordinator.data is not None
+    ]
+    unused = set()
+    if not any(module["zones"] for module in modules):
+        unused.add(Platform.CLIMATE)
+    if not any(
+        tile[VISIBILITY] and tile[CONF_TYPE] in BINARY_SENSOR_TILE_TYPES
+        for module in modules
+        for tile in module["tiles"].values()
+    ):
+        unused.add(Platform.BINARY_SENSOR)
+    return [platform for platform in platforms if platform not in unused]
+
+
+@callback
+def async_get_controller_coordinators(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> list["TechCoordinator"]:
+    """Return the coordinators of the controllers an entry provides entities for.
+
+    Controllers of an account entry that could not be fetched during setup
+    are skipped; they are added when the entry is reloaded.
+    """
+    coordinators = []
+    for coordinator in hass.data[DOMAIN][entry.entry_id].controller_coordinators:
+        if coordinator.data is None:
+            _LOGGER.warning(
+                "Skipping controller %s, it could not be fetched",
+                coordinator.controller[CONF_NAME],
+            )
+            continue
+        coordinators.append(coordinator)
+    return coordinators
+
+
+@callback
+def async_get_entry_session(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> tuple["ClientSession", ConnectionStats | None]:
+    """Return the HTTP session and connection statistics for an entry.
+
+    By default HA's shared session is used. With the dedicated_session option
+    all entries of the same account share their own tuned connection pool,
+    which is closed once the last of them is unloaded or Home Assistant
+    shuts down. The pool is built from the connection options of the entry
+    set up first; other entries of the account with different options use
+    it as it is.
+    """
+    if not entry.options.get(CONF_DEDICATED_SESSION):
+        return async_get_clientsession(hass), None
+
+    user_id = entry.data[USER_ID]
+    settings = {
+        "limit": entry.options.get(CONF_CONNECTION_LIMIT, DEFAULT_CONNECTION_LIMIT),
+        "limit_per_host": entry.options.get(
+            CONF_CONNECTION_LIMIT_PER_HOST, DEFAULT_CONNECTION_LIMIT_PER_HOST
+        ),
+        "ttl_dns_cache": entry.options.get(CONF_DNS_CACHE_TTL, DEFAULT_DNS_CACHE_TTL),
+        "keepalive_timeout": entry.options.get(
+            CONF_KEEPALIVE_TIMEOUT, DEFAULT_KEEPALIVE_TIMEOUT
+        ),
+    }
+    sessions = hass.data.setdefault(DATA_SESSIONS, {})
+    if user_id not in sessions:
+        stats = ConnectionStats()
+        session = create_session(
+            **settings, ssl_context=get_default_context(), stats=stats
+        )
+
+        async def _async_close_session(event: Event) -> None:
+            # entries are not unloaded on shutdown
+            if sessions.get(user_id, (None,))[0] is session:
+                del sessions[user_id]
+            await session.close()
+
+        unsub_close = hass.bus.async_listen_once(
+            EVENT_HOMEASSISTANT_CLOSE, _async_close_session
+        )
+        sessions[user_id] = (session, stats, set(), settings, unsub_close)
+
+    session, stats, entry_ids, pool_settings, unsub_close = sessions[user_id]
+    if settings != pool_settings:
+        _LOGGER.warning(
+            "Entry %s uses the connection pool of its account, created with "
+            "the connection options %s of another entry",
+            entry.title,
+            pool_settings,
+        )
+    entry_ids.add(entry.entry_id)
+
+    async def _async_release_session() -> None:
+        entry_ids.discard(entry.entry_id)
+        if not entry_ids and sessions.get(user_id, (None,))[0] is session:
+            del sessions[user_id]
+            unsub_close()
+            await session.close()
+
+    entry.async_on_unload(_async_release_session)
+    return session, stats
+
+
+@callback
+def async_get_request_queue(hass: HomeAssistant, entry: ConfigEntry) -> RequestQueue:
+    """Return the request queue shared by all entries of the entry's account.
+
+    Sharing the queue bounds the concurrent requests of the account, so that
+    the polls of many controllers cannot delay a write.
+    """
+    user_id = entry.data[USER_ID]
+    queues = hass.data.setdefault(DATA_QUEUES, {})
+    if user_id not in queues:
+        queues[user_id] = (
+            RequestQueue(
+                slots=entry.options.get(
+                    CONF_CONNECTION_LIMIT_PER_HOST, DEFAULT_CONNECTION_LIMIT_PER_HOST
+                )
+            ),
+            set(),
+        )
+
+    queue, entry_ids = queues[user_id]
+    entry_ids.add(entry.entry_id)
+
+    @callback
+    def _async_release_queue() -> None:
+        entry_ids.discard(entry.entry_id)
+        if not entry_ids and queues.get(user_id, (None,))[0] is queue:
+            del queues[user_id]
+
+    entry.async_on_unload(_async_release_queue)
+    return queue
+
+
+@callback
+def async_register_poll_phase(
+    hass: HomeAssistant, entry: ConfigEntry, coordinator: "TechCoordinator"
+) -> None:
+    """Give the entry's coordinator a poll phase among its account's entries."""
+    user_id = entry.data[USER_ID]
+    schedulers = hass.data.setdefault(DATA_SCHEDULERS, {})
+    scheduler = schedulers.setdefault(user_id, PollScheduler())
+    coordinator.poll_scheduler = scheduler
+    coordinator.poll_key = entry.entry_id
+    scheduler.async_register(entry.entry_id, coordinator)
+
+    @callback
+    def _async_unregister() -> None:
+        scheduler.async_unregister(entry.entry_id)
+        if not scheduler and schedulers.get(user_id) is scheduler:
+            del schedulers[user_id]
+
+    entry.async_on_unload(_async_unregister)
+
+
 async def async_migrate_entry(hass: HomeAssistant, config_entry: ConfigEntry):
     """Migrate old entry."""
-    _LOGGER.info("Migrating from version %s", config_entry.version)
+    from .migration import (  # pylint: disable=import-outside-toplevel
+        async_migrate_device_layout,
+        async_migrate_zone_devices,
+    )
 
-    device_registry = dr.async_get(hass)
-    entity_registry = er.async_get(hass)
-    udid = config_entry.data[UDID]
+    _LOGGER.info("Migrating from version %s", config_entry.version)
 
     if config_entry.version == 1:
         version = 2
+        udid = config_entry.data[UDID]
 
         http_session = async_get_clientsession(hass)
         api = Tech(
             http_session, config_entry.data[USER_ID], config_entry.data[CONF_TOKEN]
         )
-        controllers = await api.list_modules()
-        controller = next(obj for obj in controllers if obj.get(UDID) == udid)
+        controllers = {obj.get(UDID): obj for obj in await api.list_modules()}
+        if (controller := controllers.get(udid)) is None:
+            _LOGGER.error("Controller %s is no longer in the account", udid)
+            return False
         api.modules.setdefault(udid, {"last_update": None, "zones": {}, "tiles": {}})
+        # the zone names tell which entities are still provided
         zones = await api.get_module_zones(udid)
 
-        data = {
-            USER_ID: api.user_id,
-            CONF_TOKEN: api.token,
-            CONTROLLER: controller,
-            VER: controller[VER] + ": " + controller[CONF_NAME],
-        }
-
-        # Store the existing entity entries:
-        old_entity_entries: dict[str, er.RegistryEntry] = {
-            entry.unique_id: entry
-            for entry in er.async_entries_for_config_entry(
-                entity_registry, config_entry.entry_id
-            )
-        }
-
-        # Update config entry
         hass.config_entries.async_update_entry(
             config_entry,
-            data=data,
+            data={
+                USER_ID: api.user_id,
+                CONF_TOKEN: api.token,
+                CONTROLLER: controller,
+                VER: controller[VER] + ": " + controller[CONF_NAME],
+            },
             title=controller[CONF_NAME],
             unique_id=udid,
             version=version,
         )
+        async_migrate_zone_devices(hass, config_entry, controller, zones)
 
-        # Create new devices as version 1 did not have any:
-        for z in zones:
-            zone = zones[z]
-            device_registry.async_get_or_create(
-                config_entry_id=config_entry.entry_id,
-                identifiers={(DOMAIN, zone[CONF_DESCRIPTION][CONF_NAME])},
-                manufacturer=MANUFACTURER,
-                name=zone[CONF_DESCRIPTION][CONF_NAME],
-                model=controller[CONF_NAME] + ": " + controller[VER],
-                # sw_version= #TODO
-                # hw_version= #TODO
-            )
-
-        remaining_entities_to_remove: dict[str, er.RegistryEntry] = {
-            entry.unique_id: entry
-            for entry in er.async_entries_for_config_entry(
-                entity_registry, config_entry.entry_id
-            )
-        }
-
-        # Update all entities and link them to appropriate devices
-        # plus update unique_id, everything else as it was
-        for unique_id, old_entity_entry in old_entity_entries.items():
-            if old_entity_entry.original_name != "":
-                device = device_registry.async_get_device(
-                    {(DOMAIN, old_entity_entry.original_name)},
-                    set(),
-                )
-                if device and device.name == old_entity_entry.original_name:
-                    # since thsi entity stays, remove it from collection to remove
-                    del remaining_entities_to_remove[unique_id]
-                    entity_registry.async_update_entity(
-                        old_entity_entry.entity_id,
-                        area_id=old_entity_entry.area_id,
-                        device_class=old_entity_entry.device_class,
-                        device_id=device.id,
-                        disabled_by=old_entity_entry.disabled_by,
-                        hidden_by=old_entity_entry.hidden_by,
-                        icon=old_entity_entry.icon,
-                        name=old_entity_entry.name,
-                        new_entity_id=old_entity_entry.entity_id,
-                        new_unique_id=udid + "_" + str(unique_id),
-                        unit_of_measurement=old_entity_entry.unit_of_measurement,
-                    )
-
-        # Remove the remaining entities that are no longer provided by the integration
-        # Items that are not visible in emodul.
-
-        for entity_to_remove in remaining_entities_to_remove:
-            entity_registry.async_remove(
-                remaining_entities_to_remove[entity_to_remove].entity_id
-            )
+        _LOGGER.info("Migration to version %s successful", version)
 
+    if config_entry.version == 2:
+        version = 3
+        await async_migrate_device_layout(hass, config_entry)
+        hass.config_entries.async_update_entry(config_entry, version=version)
         _LOGGER.info("Migration to version %s successful", version)
 
     return True
@@ -180,12 +544,18 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
         await asyncio.gather(
             *[
                 hass.config_entries.async_forward_entry_unload(entry, component)
-                for component in PLATFORMS
+                for component in hass.data[DOMAIN][entry.entry_id].platforms
             ]
         )
     )
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id)
+        coordinator = hass.data[DOMAIN].pop(entry.entry_id)
+        if coordinator.api.recorder is not None:
+            await coordinator.api.recorder.async_close()
+        # a reload restores the counters from the store, write them now
+        for controller_coordinator in coordinator.controller_coordinators:
+            if controller_coordinator.on_time is not None:
+                await controller_coordinator.on_time.async_save()
 
     return unload_ok
 
@@ -196,7 +566,15 @@ class TechCoordinator(DataUpdateCoordinator):
     config_entry: ConfigEntry
 
     def __init__(
-        self, hass: HomeAssistant, session: ClientSession, user_id: str, token: str
+        self,
+        hass: HomeAssistant,
+        session: "ClientSession",
+        user_id: str,
+        token: str,
+        recorder: "PayloadRecorder | None" = None,
+        controller: dict | None = None,
+        update_interval: timedelta | None = SCAN_INTERVAL,
+        queue: RequestQueue | None = None,
     ) -> None:
         """Initialize my coordinator."""
         super().__init__(
@@ -205,21 +583,248 @@ class TechCoordinator(DataUpdateCoordinator):
             # Name of the data. For logging purposes.
             name=DOMAIN,
             # Polling interval. Will only be polled if there are subscribers.
-            update_interval=SCAN_INTERVAL,
+            update_interval=update_interval,
+        )
+        self.api = Tech(session, user_id, token, recorder=recorder, queue=queue)
+        self.controller = controller
+        self.connection_stats: ConnectionStats | None = None
+        self.warm_up_lead = 0
+        self.last_poll_duration: float | None = None
+        self.last_success_time: datetime | None = None
+        self.consecutive_failures = 0
+        self.unavailable_after_failures = DEFAULT_UNAVAILABLE_AFTER_FAILURES
+        self.max_stale_age = DEFAULT_MAX_STALE_AGE
+        self._cancel_warm_up: asyncio.TimerHandle | None = None
+        self._refresh_timer: asyncio.TimerHandle | None = None
+        self.poll_scheduler: PollScheduler | None = None
+        self.poll_key: str | None = None
+        self.aggregates: dict = {}
+        # cleared by the sensor platform if no aggregate has a sensor
+        self.track_aggregates = True
+        self.on_time = (
+            OnTimeTracker(hass, controller[UDID]) if controller is not None else None
+        )
+        self.trends: dict[int, ZoneTrend] = {}
+        self.track_trends = True
+        # language of the trimmed language pack to extend with new txtIds
+        self.trimmed_language: str | None = None
+        self.platforms: list[Platform] = PLATFORMS
+        self.update_timeout: float = API_TIMEOUT
+        self.deadbands: dict[str, float] = dict(DEFAULT_DEADBANDS)
+        self.applied_options: dict = {}
+
+    @callback
+    def async_reschedule(self) -> None:
+        """Move an already scheduled refresh to the current poll phase."""
+        if self._unsub_refresh is not None:
+            self._schedule_refresh()
+
+    @callback
+    def _schedule_refresh(self) -> None:
+        """Schedule a refresh and the connection warm-up preceding it.
+
+        With a poll scheduler the refresh is scheduled on the coordinator's
+        phase of the interval instead of one interval after the last one.
+        """
+        if self.update_interval is None or (
+            self.config_entry and self.config_entry.pref_disable_polling
+        ):
+            return
+        self._async_unsub_refresh()
+        loop = self.hass.loop
+        interval = self.update_interval.total_seconds()
+        if self.poll_scheduler is None:
+            next_refresh = int(loop.time()) + interval
+        else:
+            next_refresh = self.poll_scheduler.next_refresh(
+                self.poll_key, interval, loop.time()
+            )
+        self._refresh_timer = loop.call_at(
+            next_refresh, self.hass.async_run_hass_job, self._job
+        )
+        self._unsub_refresh = self._refresh_timer.cancel
+        if self.warm_up_lead:
+            self._cancel_warm_up = loop.call_at(
+                next_refresh - self.warm_up_lead, self._async_warm_up
+            )
+
+    @callback
+    def _async_unsub_refresh(self) -> None:
+        """Cancel the scheduled refresh and warm-up."""
+        super()._async_unsub_refresh()
+        self._refresh_timer = None
+        if self._cancel_warm_up is not None:
+            self._cancel_warm_up.cancel()
+            self._cancel_warm_up = None
+
+    @callback
+    def _async_warm_up(self) -> None:
+        """Open the connection used by the upcoming poll."""
+        self._cancel_warm_up = None
+        if self.connection_stats is not None:
+            self.connection_stats.warm_ups += 1
+        self.config_entry.async_create_background_task(
+            self.hass, self.api.warm_up(), f"{DOMAIN} connection warm-up"
         )
-        self.api = Tech(session, user_id, token)
+
+    @property
+    def controller_coordinators(self) -> list["TechCoordinator"]:
+        """Return the coordinators holding the data of each controller."""
+        return [self]
+
+    @property
+    def data_age(self) -> float | None:
+        """Return the age of the served data in seconds."""
+        if self.last_success_time is None:
+            return None
+        return (dt_util.utcnow() - self.last_success_time).total_seconds()
+
+    @property
+    def stale(self) -> bool:
+        """Return True when serving data from before a failed poll."""
+        return self.consecutive_failures > 0 and self.last_update_success
 
     async def _async_update_data(self):
         """Fetch data from TECH API endpoint(s)."""
 
         _LOGGER.debug("_async_update_data: %s", str(self.config_entry.data))
 
+        started = time.monotonic()
         try:
-            async with asyncio.timeout(API_TIMEOUT):
-                return await self.api.module_data(
-                    self.config_entry.data[CONTROLLER][UDID]
-                )
+            async with asyncio.timeout(self.update_timeout):
+                data = await self.api.module_data(self.controller[UDID])
         except TechLoginError as err:
             raise ConfigEntryAuthFailed from err
-        except TechError as err:
+        except (TechError, TimeoutError) as err:
+            return self._serve_stale(err)
+        self.last_poll_duration = time.monotonic() - started
+        self.last_success_time = dt_util.utcnow()
+        self.consecutive_failures = 0
+        if self.api.token != self.config_entry.data[CONF_TOKEN]:
+            # keep the renewed token for the next start
+            self.hass.config_entries.async_update_entry(
+                self.config_entry,
+                data={**self.config_entry.data, CONF_TOKEN: self.api.token},
+            )
+        if self.trimmed_language is not None:
+            await assets.async_extend_translations(
+                self.hass, self.trimmed_language, self.api, data
+            )
+        if self.track_aggregates:
+            self.aggregates = compute_aggregates(data)
+        timestamp = self.last_success_time.timestamp()
+        if self.on_time is not None:
+            self.on_time.async_update(data, timestamp)
+        if not self.track_trends:
+            return data
+        for zone_id, zone in data["zones"].items():
+            temperature = zone[CONF_ZONE]["currentTemperature"]
+            if temperature is not None:
+                self.trends.setdefault(zone_id, ZoneTrend()).push(
+                    timestamp, temperature / 10
+                )
+        return data
+
+    def _serve_stale(self, err: Exception):
+        """Return the last good data after a failed poll, or raise UpdateFailed.
+
+        The entities stay available with unchanged states until
+        unavailable_after_failures polls in a row have failed or the data is
+        older than max_stale_age, so a single transient API error does not
+        flip every entity of the controller to unavailable and back.
+        """
+        self.consecutive_failures += 1
+        age = self.data_age
+        if (
+            self.data is None
+            or age is None
+            or age > self.max_stale_age
+            or self.consecutive_failures >= self.unavailable_after_failures
+        ):
             raise UpdateFailed(f"Error communicating with API: {err}") from err
+        _LOGGER.warning(
+            "Error communicating with API: %s; serving data from %d s ago "
+            "(failure %s of %s)",
+            err,
+            age,
+            self.consecutive_failures,
+            self.unavailable_after_failures,
+        )
+        return self.data
+
+
+class TechAccountCoordinator(TechCoordinator):
+    """Coordinator polling all controllers of an account on one schedule.
+
+    Every controller keeps its own coordinator for its entities. Those are
+    not scheduled; this coordinator refreshes them concurrently, at most
+    max_parallel at a time, so a failing controller only affects its own
+    entities.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        session: "ClientSession",
+        user_id: str,
+        token: str,
+        controllers: list[dict],
+        recorder: "PayloadRecorder | None" = None,
+        max_parallel: int = DEFAULT_MAX_PARALLEL_POLLS,
+        queue: RequestQueue | None = None,
+    ) -> None:
+        """Initialize the account coordinator and one per controller."""
+        super().__init__(hass, session, user_id, token, recorder, queue=queue)
+        self.max_parallel = max_parallel
+        self._semaphore = asyncio.Semaphore(max_parallel)
+        self.controllers: dict[str, TechCoordinator] = {}
+        for controller in controllers:
+            coordinator = TechCoordinator(
+                hass,
+                session,
+                user_id,
+                token,
+                controller=controller,
+                update_interval=None,
+            )
+            # all controllers share one client, its module cache and token
+            coordinator.api = self.api
+            self.controllers[controller[UDID]] = coordinator
+
+    @property
+    def controller_coordinators(self) -> list[TechCoordinator]:
+        """Return the coordinators holding the data of each controller."""
+        return list(self.controllers.values())
+
+    def set_max_parallel(self, max_parallel: int) -> None:
+        """Change how many controllers are fetched at the same time.
+
+        Refreshes already holding a slot finish on the previous semaphore.
+        """
+        if max_parallel != self.max_parallel:
+            self.max_parallel = max_parallel
+            self._semaphore = asyncio.Semaphore(max_parallel)
+
+    async def _async_update_data(self):
+        """Refresh all controllers, failing only if none could be fetched."""
+        started = time.monotonic()
+        results = await asyncio.gather(
+            *(
+                self._async_refresh_controller(coordinator)
+                for coordinator in self.controllers.values()
+            )
+        )
+        self.last_poll_duration = time.monotonic() - started
+        if not any(results):
+            raise UpdateFailed("Error communicating with API: no controller updated")
+        self.last_success_time = dt_util.utcnow()
+        return dict(zip(self.controllers, results))
+
+    async def _async_refresh_controller(self, coordinator: TechCoordinator) -> bool:
+        """Refresh one controller, returning whether it succeeded."""
+        async with self._semaphore:
+            # a rejected token is the same for all controllers of the account
+            await coordinator._async_refresh(  # pylint: disable=protected-access
+                log_failures=True, raise_on_auth_failed=True
+            )
+        return coordinator.last_update_success
@@ -0,0 +1,124 @@
+"""Relay on-time and duty-cycle accumulators of a Tech controller."""
+import math
+
+from homeassistant.const import CONF_PARAMS, CONF_TYPE, CONF_ZONE
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, SCAN_INTERVAL, TYPE_ADDITIONAL_PUMP, TYPE_RELAY
+
+STORAGE_VERSION = 1
+# counters are written at most once per SAVE_DELAY and on shutdown
+SAVE_DELAY = 300
+# time constant of the duty cycle's exponential moving average
+DUTY_CYCLE_WINDOW = 3600
+# polls further apart than this many intervals (outages, restarts) are not
+# credited
+MAX_GAP_INTERVALS = 3
+MAX_GAP = MAX_GAP_INTERVALS * SCAN_INTERVAL.total_seconds()
+
+RELAY_TILE_TYPES = (TYPE_RELAY, TYPE_ADDITIONAL_PUMP)
+
+
+def zone_key(zone_id) -> str:
+    """Return the counter key of a zone's relay."""
+    return f"zone_{zone_id}"
+
+
+def tile_key(tile_id) -> str:
+    """Return the counter key of a relay tile."""
+    return f"tile_{tile_id}"
+
+
+def relay_states(data: dict, zones: bool = True, tiles: bool = True):
+    """Yield the counter key and on/off state of the relays of a controller.
+
+    Args:
+    data (dict): Module data as returned by Tech.module_data.
+    zones (bool): Whether to include the relays of the zones.
+    tiles (bool): Whether to include the relay tiles.
+
+    """
+    if zones:
+        for zone_id, zone in data["zones"].items():
+            yield zone_key(zone_id), zone[CONF_ZONE]["flags"]["relayState"] == "on"
+    if tiles:
+        for tile_id, tile in data["tiles"].items():
+            if tile[CONF_TYPE] in RELAY_TILE_TYPES:
+                yield tile_key(tile_id), bool(tile[CONF_PARAMS]["workingStatus"])
+
+
+class OnTimeTracker:
+    """Accumulate the on-time and duty cycle of a controller's relays.
+
+    Every poll credits the interval since the previous one to the state seen
+    then, so the work per poll is constant per relay and no history is kept.
+    The counters are stored per controller and survive restarts; the time a
+    controller was not polled is not credited.
+    """
+
+    def __init__(self, hass: HomeAssistant, udid: str) -> None:
+        """Initialize the tracker of a controller."""
+        self._store: Store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{udid}.on_time")
+        self.counters: dict[str, dict] = {}
+        # longest interval credited, following the poll interval
+        self.max_gap = MAX_GAP
+        # the relays with heating time sensors
+        self.zones = True
+        self.tiles = True
+
+    async def async_load(self) -> None:
+        """Restore the counters saved before the last shutdown."""
+        self.counters = await self._store.async_load() or {}
+
+    async def async_save(self) -> None:
+        """Write the counters without waiting for the delayed save."""
+        await self._store.async_save(self.counters)
+
+    @callback
+    def async_update(self, data: dict, now: float) -> None:
+        """Credit the interval since the previous poll and save later.
+
+        Args:
+        data (dict): Module data as returned by Tech.module_data.
+        now (float): POSIX timestamp of the poll.
+
+        """
+        for key, on in relay_states(data, self.zones, self.tiles):
+            self._update(key, on, now)
+        self._store.async_delay_save(lambda: self.counters, SAVE_DELAY)
+
+    def _update(self, key: str, on: bool, now: float) -> None:
+        counter = self.counters.get(key)
+        if counter is None:
+            self.counters[key] = {
+                "on_time": 0.0,
+                "duty_cycle": None,
+                "on": on,
+                "time": now,
+            }
+            return
+        elapsed = now - counter["time"]
+        if 0 < elapsed <= self.max_gap:
+            sample = 100.0 if counter["on"] else 0.0
+            if counter["on"]:
+                counter["on_time"] += elapsed
+            if counter["duty_cycle"] is None:
+                counter["duty_cycle"] = sample
+            else:
+                alpha = 1 - math.exp(-elapsed / DUTY_CYCLE_WINDOW)
+                counter["duty_cycle"] += alpha * (sample - counter["duty_cycle"])
+        counter["on"] = on
+        counter["time"] = now
+
+    def on_time(self, key: str) -> float | None:
+        """Return the accumulated on-time of a relay in hours."""
+        counter = self.counters.get(key)
+        return round(counter["on_time"] / 3600, 3) if counter is not None else None
+
+    def duty_cycle(self, key: str) -> float | None:
+        """Return the recent share of time a relay was on, in percent."""
+        counter = self.counters.get(key)
+        if counter is None or counter["duty_cycle"] is None:
+            return None
+        return round(counter["duty_cycle"], 1)
@@ -0,0 +1,101 @@
+"""Per-controller aggregates of the zones and tiles of a Tech controller."""
+from .const import TYPE_MIXING_VALVE, TYPE_VALVE
+
+AVERAGE_TEMPERATURE = "average_temperature"
+MIN_TEMPERATURE = "min_temperature"
+MAX_TEMPERATURE = "max_temperature"
+ZONES_HEATING = "zones_heating"
+ZONES_BELOW_SETPOINT = "zones_below_setpoint"
+MAX_VALVE_OPENING = "max_valve_opening"
+MIN_BATTERY = "min_battery"
+
+
+def supported_aggregates(data: dict) -> set[str]:
+    """Return the aggregates one controller has inputs for.
+
+    The choice depends on the zones and tiles of the controller only, not
+    on their values, so a sensor that reports nothing at the time (e.g. a
+    zone temperature of None) does not hide an aggregate.
+
+    Args:
+    data (dict): Module data as returned by Tech.module_data.
+
+    Returns:
+    set: Keys of the aggregates the controller provides.
+
+    """
+    zones = data["zones"].values()
+    supported = set()
+    if zones:
+        supported.update(
+            (
+                AVERAGE_TEMPERATURE,
+                MIN_TEMPERATURE,
+                MAX_TEMPERATURE,
+                ZONES_HEATING,
+                ZONES_BELOW_SETPOINT,
+            )
+        )
+    if any(zone["zone"].get("batteryLevel") is not None for zone in zones):
+        supported.add(MIN_BATTERY)
+    if any(
+        tile["type"] in (TYPE_VALVE, TYPE_MIXING_VALVE)
+        for tile in data["tiles"].values()
+    ):
+        supported.add(MAX_VALVE_OPENING)
+    return supported
+
+
+def compute_aggregates(data: dict) -> dict:
+    """Return the aggregates of one controller's data in a single pass.
+
+    Args:
+    data (dict): Module data as returned by Tech.module_data.
+
+    Returns:
+    dict: Aggregate values by key, in °C for temperatures. An aggregate
+    without any input (e.g. no valve tiles) is None.
+
+    """
+    total = 0
+    count = 0
+    lowest = highest = None
+    heating = 0
+    below_setpoint = 0
+    battery = None
+    for zone in data["zones"].values():
+        state = zone["zone"]
+        if state["flags"]["relayState"] == "on":
+            heating += 1
+        level = state.get("batteryLevel")
+        if level is not None and level >= 0 and (battery is None or level < battery):
+            battery = level
+        current = state["currentTemperature"]
+        if current is None:
+            continue
+        total += current
+        count += 1
+        if lowest is None or current < lowest:
+            lowest = current
+        if highest is None or current > highest:
+            highest = current
+        target = state["setTemperature"]
+        if target is not None and current < target:
+            below_setpoint += 1
+
+    valve_opening = None
+    for tile in data["tiles"].values():
+        if tile["type"] in (TYPE_VALVE, TYPE_MIXING_VALVE):
+            opening = tile["params"]["openingPercentage"]
+            if valve_opening is None or opening > valve_opening:
+                valve_opening = opening
+
+    return {
+        AVERAGE_TEMPERATURE: round(total / count / 10, 1) if count else None,
+        MIN_TEMPERATURE: lowest / 10 if lowest is not None else None,
+        MAX_TEMPERATURE: highest / 10 if highest is not None else None,
+        ZONES_HEATING: heating,
+        ZONES_BELOW_SETPOINT: below_setpoint,
+        MAX_VALVE_OPENING: valve_opening,
+        MIN_BATTERY: battery,
+    }
@@ -1,35 +1,167 @@
 """Assets for translations."""
+import asyncio
+from collections.abc import Iterable
 import logging
+import sys
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_PARAMS
+from homeassistant.core import HomeAssistant, callback
+
+from .const import (
+    DATA_TRANSLATIONS,
+    DEFAULT_ICON,
+    ICON_BY_ID,
+    ICON_BY_TYPE,
+    TXT_ID_BY_TYPE,
+    VALVE_SENSOR_CURRENT_TEMPERATURE,
+    VALVE_SENSOR_RETURN_TEMPERATURE,
+    VALVE_SENSOR_SET_TEMPERATURE,
+)
 
-from .const import DEFAULT_ICON, ICON_BY_ID, ICON_BY_TYPE, TXT_ID_BY_TYPE
-
-logging.basicConfig(level=logging.DEBUG)
 _LOGGER = logging.getLogger(__name__)
 
-TRANSLATIONS = None
+# txtId -> text of the active language
+TRANSLATIONS: dict[int, str] = {}
+# tile parameters holding a txtId
+TEXT_ID_PARAMS = ("txtId", "headerId", "statusId")
+
+
+class LanguagePack:
+    """The texts of one language, shared by all entries.
+
+    keep is None when the whole pack is loaded, otherwise the txtIds the
+    entries asked for.
+    """
 
+    def __init__(self, texts: dict[int, str], keep: set[int] | None) -> None:
+        """Initialize the pack."""
+        self.texts = texts
+        self.keep = keep
 
-async def load_subtitles(language, api):
-    """Load subtitles for the specified language.
+    def covers(self, referenced: set[int] | None) -> bool:
+        """Return whether the pack holds the texts asked for."""
+        if self.keep is None:
+            return True
+        return referenced is not None and referenced <= self.keep
 
-    Args:
-        language (str): The language code for the subtitles. Defaults to "pl".
-        api: object to use Tech api
 
-    Returns:
-        None
+def build_index(pack: dict, keep: Iterable[int] | None = None) -> dict[int, str]:
+    """Return the texts of a language pack by integer txtId.
 
+    The pack maps txtIds as strings to texts. Equal texts share one
+    interned string; with keep only those txtIds are indexed.
     """
+    data = pack["data"]
+    if keep is None:
+        items = ((int(text_id), text) for text_id, text in data.items())
+    else:
+        items = ((text_id, data.get(str(text_id))) for text_id in keep)
+    return {
+        text_id: sys.intern(text)
+        for text_id, text in items
+        if text_id != 0 and isinstance(text, str)
+    }
+
+
+def referenced_text_ids(modules: Iterable[dict]) -> set[int]:
+    """Return the txtIds the tiles of the modules and the sensors refer to."""
+    text_ids = set(TXT_ID_BY_TYPE.values())
+    text_ids.update(
+        sensor["txt_id"]
+        for sensor in (
+            VALVE_SENSOR_CURRENT_TEMPERATURE,
+            VALVE_SENSOR_RETURN_TEMPERATURE,
+            VALVE_SENSOR_SET_TEMPERATURE,
+        )
+    )
+    for module in modules:
+        for tile in module["tiles"].values():
+            params = tile[CONF_PARAMS]
+            for params in (params, params.get("widget1"), params.get("widget2")):
+                if not isinstance(params, dict):
+                    continue
+                text_ids.update(
+                    params[key]
+                    for key in TEXT_ID_PARAMS
+                    if isinstance(params.get(key), int)
+                )
+    return text_ids
+
+
+async def async_load_translations(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    language: str,
+    api,
+    referenced: set[int] | None = None,
+) -> None:
+    """Load the language pack, fetching it only when no entry did yet.
+
+    With referenced only those txtIds are kept. Entries share the pack: a
+    trimmed pack grows by the txtIds of each entry trimming it, and an
+    entry using the whole pack makes it whole again. The pack is dropped
+    with the last entry.
+    """
+    packs, lock, entry_ids = hass.data.setdefault(
+        DATA_TRANSLATIONS, ({}, asyncio.Lock(), set())
+    )
+    await _async_load_pack(packs, lock, language, api, referenced)
+    entry_ids.add(entry.entry_id)
+
+    @callback
+    def _async_release_translations() -> None:
+        entry_ids.discard(entry.entry_id)
+        if not entry_ids and hass.data.get(DATA_TRANSLATIONS, (packs,))[0] is packs:
+            del hass.data[DATA_TRANSLATIONS]
+
+    entry.async_on_unload(_async_release_translations)
+
+
+async def async_extend_translations(
+    hass: HomeAssistant, language: str, api, module: dict
+) -> None:
+    """Add the texts a module refers to that the trimmed pack lacks.
+
+    Called with every poll of an entry trimming the pack, so a status
+    first shown after the setup has its text by the time the entities
+    are updated. The pack is fetched again only for txtIds not asked for
+    before, including those the pack does not have.
+    """
+    if (translations := hass.data.get(DATA_TRANSLATIONS)) is None:
+        return
+    packs, lock, _ = translations
+    loaded = packs.get(language)
+    if loaded is None or loaded.keep is None:
+        return
+    referenced = referenced_text_ids((module,))
+    if not referenced <= loaded.keep:
+        await _async_load_pack(packs, lock, language, api, referenced)
+
+
+async def _async_load_pack(
+    packs: dict, lock: asyncio.Lock, language: str, api, referenced: set[int] | None
+) -> None:
+    """Fetch the pack of a language unless the loaded one covers referenced."""
+    async with lock:
+        loaded = packs.get(language)
+        if loaded is None or not loaded.covers(referenced):
+            keep = referenced
+            if loaded is not None and referenced is not None:
+                keep = loaded.keep | referenced
+            pack = await api.get_translations(language)
+            loaded = packs[language] = LanguagePack(build_index(pack, keep), keep)
+            _LOGGER.debug("Loaded %s texts of language %s", len(loaded.texts), language)
     global TRANSLATIONS  # noqa: PLW0603
-    TRANSLATIONS = await api.get_translations(language)
+    TRANSLATIONS = loaded.texts
 
 
 def get_text(text_id) -> str:
     """Get text by id."""
-    if text_id != 0:
-        return TRANSLATIONS["data"].get(str(text_id), f"txtId {text_id}")
-    else:
+    text = TRANSLATIONS.get(text_id)
+    if text is None:
         return f"txtId {text_id}"
+    return text
 
 
 def get_text_by_type(text_type) -> str:
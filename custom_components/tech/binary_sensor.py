@@ -4,16 +4,8 @@ import logging
 from homeassistant.components import binary_sensor
 from homeassistant.const import CONF_PARAMS, CONF_TYPE, STATE_OFF, STATE_ON
 
-from . import TechCoordinator, assets
-from .const import (
-    CONTROLLER,
-    DOMAIN,
-    TYPE_ADDITIONAL_PUMP,
-    TYPE_FIRE_SENSOR,
-    TYPE_RELAY,
-    UDID,
-    VISIBILITY,
-)
+from . import TechCoordinator, assets, async_get_controller_coordinators
+from .const import TYPE_ADDITIONAL_PUMP, TYPE_FIRE_SENSOR, TYPE_RELAY, UDID, VISIBILITY
 from .entity import TileEntity
 
 _LOGGER = logging.getLogger(__name__)
@@ -22,31 +14,28 @@ _LOGGER = logging.getLogger(__name__)
 async def async_setup_entry(hass, config_entry, async_add_entities):
     """Set up entry."""
     _LOGGER.debug("Setting up entry for sensors...")
-    controller = config_entry.data[CONTROLLER]
-    coordinator = hass.data[DOMAIN][config_entry.entry_id]
-
     entities = []
-    # for controller in controllers:
-    controller_udid = controller[UDID]
-    tiles = await coordinator.api.get_module_tiles(controller_udid)
-    _LOGGER.debug("Setting up entry for binary sensors...tiles: %s", tiles)
-    for t in tiles:
-        tile = tiles[t]
-        if tile[VISIBILITY] is False:
-            continue
-        if tile[CONF_TYPE] == TYPE_RELAY:
-            entities.append(RelaySensor(tile, coordinator, controller_udid))
-        if tile[CONF_TYPE] == TYPE_FIRE_SENSOR:
-            entities.append(
-                RelaySensor(
-                    tile,
-                    coordinator,
-                    controller_udid,
-                    binary_sensor.BinarySensorDeviceClass.MOTION,
+    for coordinator in async_get_controller_coordinators(hass, config_entry):
+        controller_udid = coordinator.controller[UDID]
+        tiles = await coordinator.api.get_module_tiles(controller_udid)
+        _LOGGER.debug("Setting up entry for binary sensors...tiles: %s", tiles)
+        for t in tiles:
+            tile = tiles[t]
+            if tile[VISIBILITY] is False:
+                continue
+            if tile[CONF_TYPE] == TYPE_RELAY:
+                entities.append(RelaySensor(tile, coordinator, controller_udid))
+            if tile[CONF_TYPE] == TYPE_FIRE_SENSOR:
+                entities.append(
+                    RelaySensor(
+                        tile,
+                        coordinator,
+                        controller_udid,
+                        binary_sensor.BinarySensorDeviceClass.MOTION,
+                    )
                 )
-            )
-        if tile[CONF_TYPE] == TYPE_ADDITIONAL_PUMP:
-            entities.append(RelaySensor(tile, coordinator, controller_udid))
+            if tile[CONF_TYPE] == TYPE_ADDITIONAL_PUMP:
+                entities.append(RelaySensor(tile, coordinator, controller_udid))
 
     async_add_entities(entities, True)
 
@@ -2,7 +2,7 @@
 import logging
 from typing import Any, Optional
 
-from custom_components.tech import TechCoordinator
+from custom_components.tech import TechCoordinator, async_get_controller_coordinators
 from homeassistant.components.climate import (
     ClimateEntity,
     ClimateEntityFeature,
@@ -10,12 +10,9 @@ from homeassistant.components.climate import (
     HVACMode,
 )
 from homeassistant.const import (
-    ATTR_IDENTIFIERS,
-    ATTR_MANUFACTURER,
     ATTR_TEMPERATURE,
     CONF_DESCRIPTION,
     CONF_ID,
-    CONF_MODEL,
     CONF_NAME,
     CONF_ZONE,
     STATE_OFF,
@@ -25,7 +22,8 @@ from homeassistant.const import (
 from homeassistant.core import callback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import CONTROLLER, DOMAIN, MANUFACTURER, UDID, VER
+from .const import MANUFACTURER, UDID, VER
+from .devices import zone_device_info
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -34,18 +32,15 @@ SUPPORT_HVAC = [HVACMode.HEAT, HVACMode.OFF]
 
 async def async_setup_entry(hass, config_entry, async_add_entities):
     """Set up entry."""
-    udid = config_entry.data[CONTROLLER][UDID]
-    coordinator = hass.data[DOMAIN][config_entry.entry_id]
-    _LOGGER.debug("Setting up entry, controller udid: %s", udid)
-    model = (
-        config_entry.data[CONTROLLER][CONF_NAME]
-        + ": "
-        + config_entry.data[CONTROLLER][VER]
-    )
-    zones = await coordinator.api.get_module_zones(udid)
-    thermostats = [
-        TechThermostat(zones[zone], coordinator, udid, model) for zone in zones
-    ]
+    thermostats = []
+    for coordinator in async_get_controller_coordinators(hass, config_entry):
+        udid = coordinator.controller[UDID]
+        _LOGGER.debug("Setting up entry, controller udid: %s", udid)
+        model = coordinator.controller[CONF_NAME] + ": " + coordinator.controller[VER]
+        zones = await coordinator.api.get_module_zones(udid)
+        thermostats.extend(
+            TechThermostat(zones[zone], coordinator, udid, model) for zone in zones
+        )
 
     async_add_entities(thermostats, True)
 
@@ -72,14 +67,9 @@ class TechThermostat(ClimateEntity, CoordinatorEntity):
     @property
     def device_info(self):
         """Returns device information in a dictionary format."""
-        return {
-            ATTR_IDENTIFIERS: {
-                (DOMAIN, self.device_name)
-            },  # Unique identifiers for the device
-            CONF_NAME: self.device_name,  # Name of the device
-            CONF_MODEL: self.model,  # Model of the device
-            ATTR_MANUFACTURER: self.manufacturer,  # Manufacturer of the device
-        }
+        return zone_device_info(
+            self._coordinator.controller, self._id, self.device_name
+        )
 
     def update_properties(self, device):
         """Update the properties of the HVAC device based on the data from the device.
@@ -1,24 +1,82 @@
 """Config flow for Tech Sterowniki integration."""
+import asyncio
+from collections.abc import Mapping
 import logging
-from typing import List
+from typing import Any
 import uuid
 
 import voluptuous as vol
 
 from homeassistant import config_entries, core, exceptions
-from homeassistant.config_entries import ConfigEntry
+from homeassistant.config_entries import ConfigEntry, OptionsFlow
 from homeassistant.const import (
     ATTR_ID,
     CONF_NAME,
     CONF_PASSWORD,
+    CONF_SCAN_INTERVAL,
     CONF_TOKEN,
     CONF_USERNAME,
 )
+from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.helpers import aiohttp_client, config_validation as cv
 
-from .const import CONTROLLER, CONTROLLERS, DOMAIN, UDID, USER_ID, VER
-from .tech import Tech, TechError, TechLoginError
+from .const import (
+    ACCOUNT,
+    API_TIMEOUT,
+    CONF_API_URL,
+    CONF_BINARY_SENSORS,
+    CONF_CONNECTION_LIMIT,
+    CONF_CONNECTION_LIMIT_PER_HOST,
+    CONF_DEDICATED_SESSION,
+    CONF_DNS_CACHE_TTL,
+    CONF_KEEPALIVE_TIMEOUT,
+    CONF_MAX_PARALLEL_POLLS,
+    CONF_MAX_STALE_AGE,
+    CONF_POLL_TIMEOUT,
+    CONF_RECORD_PAYLOADS,
+    CONF_RETRIES,
+    CONF_RETRY_BACKOFF,
+    CONF_TILE_TYPES,
+    CONF_TRIM_TRANSLATIONS,
+    CONF_UNAVAILABLE_AFTER_FAILURES,
+    CONF_UPDATE_TIMEOUT,
+    CONF_WARM_UP_LEAD,
+    CONF_WRITE_TIMEOUT,
+    CONF_ZONE_CLIMATE,
+    CONF_ZONE_SENSORS,
+    CONTROLLER,
+    CONTROLLERS,
+    DEFAULT_CONNECTION_LIMIT,
+    DEFAULT_CONNECTION_LIMIT_PER_HOST,
+    DEFAULT_DNS_CACHE_TTL,
+    DEFAULT_KEEPALIVE_TIMEOUT,
+    DEFAULT_MAX_PARALLEL_POLLS,
+    DEFAULT_MAX_STALE_AGE,
+    DEFAULT_UNAVAILABLE_AFTER_FAILURES,
+    DEFAULT_WARM_UP_LEAD,
+    DOMAIN,
+    FILTER,
+    MAX_SCAN_INTERVAL,
+    MIN_SCAN_INTERVAL,
+    SCAN_INTERVAL,
+    SELECT_ALL,
+    TILE_SENSOR_TYPES,
+    UDID,
+    USER_ID,
+    VER,
+)
+from .filters import DEFAULT_DEADBANDS
+from .tech import (
+    DEFAULT_RETRIES,
+    DEFAULT_TIMEOUTS,
+    ENDPOINT_POLL,
+    ENDPOINT_WRITE,
+    RETRY_BACKOFF,
+    Tech,
+    TechError,
+    TechLoginError,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -30,19 +88,120 @@ DATA_SCHEMA = vol.Schema(
 )
 
 
-def controllers_schema(controllers) -> vol.Schema:
-    """Return the data schema for controllers."""
+def controllers_schema(controllers: dict[str, dict], name_filter: str) -> vol.Schema:
+    """Return the data schema for the controllers matching the filter."""
 
     return vol.Schema(
         {
+            vol.Optional(FILTER, default=name_filter): cv.string,
             vol.Optional(CONTROLLERS): cv.multi_select(
                 {
-                    str(controller[CONTROLLER][ATTR_ID]): controller[CONTROLLER][
-                        CONF_NAME
-                    ]
-                    for controller in controllers
+                    controller_id: controller[CONTROLLER][CONF_NAME]
+                    for controller_id, controller in controllers.items()
                 }
-            )
+            ),
+            vol.Optional(SELECT_ALL, default=False): cv.boolean,
+            vol.Optional(ACCOUNT, default=False): cv.boolean,
+        }
+    )
+
+
+def filter_controllers(controllers: dict[str, dict], name_filter: str) -> dict:
+    """Return the controllers whose name or udid contains the filter."""
+    needle = name_filter.strip().casefold()
+    if not needle:
+        return controllers
+    return {
+        controller_id: controller
+        for controller_id, controller in controllers.items()
+        if needle in controller[CONTROLLER][CONF_NAME].casefold()
+        or needle in controller[CONTROLLER][UDID].casefold()
+    }
+
+
+def _option(options: dict, key: str, default) -> vol.Optional:
+    """Return a schema key defaulting to the current value of an option."""
+    return vol.Optional(key, default=options.get(key, default))
+
+
+def _int(minimum: int, maximum: int) -> vol.All:
+    return vol.All(vol.Coerce(int), vol.Range(min=minimum, max=maximum))
+
+
+def _float(minimum: float, maximum: float) -> vol.All:
+    return vol.All(vol.Coerce(float), vol.Range(min=minimum, max=maximum))
+
+
+def entities_schema(options: dict) -> vol.Schema:
+    """Return the schema of the entity categories created for an entry."""
+    tile_types = options.get(CONF_TILE_TYPES, TILE_SENSOR_TYPES)
+    return vol.Schema(
+        {
+            _option(options, CONF_ZONE_CLIMATE, True): cv.boolean,
+            _option(options, CONF_ZONE_SENSORS, True): cv.boolean,
+            vol.Optional(
+                CONF_TILE_TYPES, default=[str(tile_type) for tile_type in tile_types]
+            ): cv.multi_select(
+                {str(tile_type): name for tile_type, name in TILE_SENSOR_TYPES.items()}
+            ),
+            _option(options, CONF_BINARY_SENSORS, True): cv.boolean,
+            _option(options, CONF_TRIM_TRANSLATIONS, False): cv.boolean,
+        }
+    )
+
+
+def polling_schema(options: dict, account: bool) -> vol.Schema:
+    """Return the schema of the options applied to the running entry."""
+    schema = {
+        _option(options, CONF_SCAN_INTERVAL, int(SCAN_INTERVAL.total_seconds())): _int(
+            MIN_SCAN_INTERVAL, MAX_SCAN_INTERVAL
+        ),
+        _option(options, CONF_UPDATE_TIMEOUT, API_TIMEOUT): _int(5, 300),
+        _option(
+            options, CONF_POLL_TIMEOUT, DEFAULT_TIMEOUTS[ENDPOINT_POLL].total
+        ): _float(1, 120),
+        _option(
+            options, CONF_WRITE_TIMEOUT, DEFAULT_TIMEOUTS[ENDPOINT_WRITE].total
+        ): _float(1, 120),
+        _option(options, CONF_RETRIES, DEFAULT_RETRIES): _int(0, 5),
+        _option(options, CONF_RETRY_BACKOFF, RETRY_BACKOFF): _float(0, 30),
+        _option(
+            options, CONF_UNAVAILABLE_AFTER_FAILURES, DEFAULT_UNAVAILABLE_AFTER_FAILURES
+        ): _int(1, 100),
+        _option(options, CONF_MAX_STALE_AGE, DEFAULT_MAX_STALE_AGE): _int(0, 86400),
+    }
+    if account:
+        schema[
+            _option(options, CONF_MAX_PARALLEL_POLLS, DEFAULT_MAX_PARALLEL_POLLS)
+        ] = _int(1, 32)
+    for option, deadband in DEFAULT_DEADBANDS.items():
+        schema[_option(options, option, deadband)] = _float(0, 100)
+    schema[_option(options, CONF_RECORD_PAYLOADS, False)] = cv.boolean
+    return vol.Schema(schema)
+
+
+def connection_schema(options: dict) -> vol.Schema:
+    """Return the schema of the connection options, applied by a reload."""
+    return vol.Schema(
+        {
+            _option(options, CONF_DEDICATED_SESSION, False): cv.boolean,
+            _option(options, CONF_CONNECTION_LIMIT, DEFAULT_CONNECTION_LIMIT): _int(
+                1, 100
+            ),
+            _option(
+                options,
+                CONF_CONNECTION_LIMIT_PER_HOST,
+                DEFAULT_CONNECTION_LIMIT_PER_HOST,
+            ): _int(1, 100),
+            _option(options, CONF_DNS_CACHE_TTL, DEFAULT_DNS_CACHE_TTL): _int(0, 86400),
+            _option(options, CONF_KEEPALIVE_TIMEOUT, DEFAULT_KEEPALIVE_TIMEOUT): _int(
+                0, 3600
+            ),
+            _option(options, CONF_WARM_UP_LEAD, DEFAULT_WARM_UP_LEAD): _int(0, 60),
+            vol.Optional(
+                CONF_API_URL,
+                description={"suggested_value": options.get(CONF_API_URL)},
+            ): cv.url,
         }
     )
 
@@ -65,6 +224,8 @@ async def validate_input(hass: core.HomeAssistant, data):
     return {
         USER_ID: api.user_id,
         CONF_TOKEN: api.token,
+        CONF_USERNAME: data[CONF_USERNAME],
+        CONF_PASSWORD: data[CONF_PASSWORD],
         CONTROLLERS: modules,
     }
 
@@ -73,92 +234,138 @@ async def validate_input(hass: core.HomeAssistant, data):
 class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Tech Sterowniki."""
 
-    VERSION = 2
+    VERSION = 3
     # Pick one of the available connection classes in homeassistant/config_entries.py
     CONNECTION_CLASS = config_entries.CONN_CLASS_CLOUD_POLL
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> OptionsFlow:
+        """Return the options flow of an entry."""
+        return OptionsFlowHandler(config_entry)
+
     def __init__(self) -> None:
         """Initialize the config flow."""
         self._init_info: dict[str, str] | None = None
-        self._controllers: List[dict] | None = None
+        # controller id -> controller entry data, indexed once per flow
+        self._controllers: dict[str, dict] | None = None
+        self._filter = ""
+        self._reauth_entry: ConfigEntry | None = None
 
-    async def _async_finish_controller(self, user_input: dict[str, str]) -> FlowResult:
+    async def _async_finish_controller(self, user_input: dict[str, Any]) -> FlowResult:
         """Finish setting up controllers."""
-
-        if not user_input[CONTROLLERS]:
+        shown = filter_controllers(self._controllers, self._filter)
+        if user_input.get(SELECT_ALL):
+            controller_ids = list(shown)
+        else:
+            controller_ids = [
+                controller_id
+                for controller_id in user_input.get(CONTROLLERS, [])
+                if controller_id in self._controllers
+            ]
+
+        if not controller_ids:
             return self.async_abort(reason="no_modules")
 
-        if self._controllers is not None and user_input is not None:
-            controllers = user_input[CONTROLLERS]
-
-            if len(controllers) == 0:
-                return self.async_abort(reason="no_modules")
-
-            # check if we have any of the selected controllers already configured
-            # and abort if so
-            for controller_id in controllers:
-                controller = next(
-                    obj
-                    for obj in self._controllers
-                    if obj[CONTROLLER].get(ATTR_ID) == int(controller_id)
+        # check if we have any of the selected controllers already configured
+        # and abort if so
+        configured = self._configured_udids()
+        selected = [
+            self._controllers[controller_id] for controller_id in controller_ids
+        ]
+        if any(controller[CONTROLLER][UDID] in configured for controller in selected):
+            return self.async_abort(reason="already_configured")
+
+        if user_input.get(ACCOUNT):
+            return await self._async_create_account_entry(selected)
+
+        # add entries for all but the first controller in one batch, the
+        # first one finishes the flow
+        first, *others = selected
+        _LOGGER.debug("Adding config entries for %s controllers", len(others))
+        semaphore = asyncio.Semaphore(DEFAULT_MAX_PARALLEL_POLLS)
+
+        async def _async_add(controller: dict) -> None:
+            # adding an entry sets it up, which fetches its controller
+            async with semaphore:
+                await self.hass.config_entries.async_add(
+                    self._create_config_entry(controller=controller)
                 )
-                await self.async_set_unique_id(controller[CONTROLLER][UDID])
-                self._abort_if_unique_id_configured()
-
-            # process first controllers and add config entries for them
-            if len(controllers) > 1:
-                for controller_id in controllers[1 : len(controllers)]:
-                    controller = next(
-                        obj
-                        for obj in self._controllers
-                        if obj[CONTROLLER].get(ATTR_ID) == int(controller_id)
-                    )
-                    await self.async_set_unique_id(controller[CONTROLLER][UDID])
-
-                    _LOGGER.debug("Adding config entry for: %s", controller)
-
-                    await self.hass.config_entries.async_add(
-                        self._create_config_entry(controller=controller)
-                    )
-
-            # process last controller and async create entry finishing the step
-            controller_udid = next(
-                obj
-                for obj in self._controllers
-                if obj[CONTROLLER].get(ATTR_ID) == int(controllers[0])
-            )[CONTROLLER][UDID]
-
-            await self.async_set_unique_id(controller_udid)
-
-            return self.async_create_entry(
-                title=next(
-                    obj
-                    for obj in self._controllers
-                    if obj[CONTROLLER].get(ATTR_ID) == int(controllers[0])
-                )[CONTROLLER][CONF_NAME],
-                data=next(
-                    obj
-                    for obj in self._controllers
-                    if obj[CONTROLLER].get(ATTR_ID) == int(controllers[0])
-                ),
-            )
+
+        await asyncio.gather(*(_async_add(controller) for controller in others))
+
+        await self.async_set_unique_id(first[CONTROLLER][UDID])
+        return self.async_create_entry(title=first[CONTROLLER][CONF_NAME], data=first)
+
+    def _configured_udids(self) -> set[str]:
+        """Return the controllers set up by controller or account entries."""
+        udids = set()
+        for entry in self._async_current_entries(include_ignore=False):
+            if CONTROLLERS in entry.data:
+                udids.update(controller[UDID] for controller in entry.data[CONTROLLERS])
+            elif entry.unique_id is not None:
+                udids.add(entry.unique_id)
+        return udids
+
+    async def _async_create_account_entry(self, controllers: list[dict]) -> FlowResult:
+        """Create a single entry polling all selected controllers together."""
+        selected = [controller[CONTROLLER] for controller in controllers]
+        user_id = self._init_info[USER_ID]
+        await self.async_set_unique_id(f"{ACCOUNT}_{user_id}")
+        self._abort_if_unique_id_configured()
+        configured = {
+            entry.unique_id
+            for entry in self._async_current_entries(include_ignore=False)
+        }
+        for controller in selected:
+            if controller[UDID] in configured:
+                return self.async_abort(reason="already_configured")
+
+        return self.async_create_entry(
+            title=", ".join(controller[CONF_NAME] for controller in selected),
+            data={
+                USER_ID: user_id,
+                CONF_TOKEN: self._init_info[CONF_TOKEN],
+                CONF_USERNAME: self._init_info[CONF_USERNAME],
+                CONF_PASSWORD: self._init_info[CONF_PASSWORD],
+                CONTROLLERS: selected,
+            },
+        )
 
     async def async_step_select_controllers(
         self,
         user_input: dict[str, str] | None = None,
     ) -> FlowResult:
-        """Handle the selection of controllers."""
-        if not user_input:
-            self._controllers = self._create_controllers_array(
+        """Handle the selection of controllers.
+
+        Submitting a changed filter without selecting anything shows the
+        form again with the matching controllers only; select all takes the
+        controllers matching the filter submitted with it.
+        """
+        if self._controllers is None:
+            self._controllers = self._create_controllers_index(
                 validated_input=self._init_info
             )
-
-            return self.async_show_form(
-                step_id="select_controllers",
-                data_schema=controllers_schema(controllers=self._controllers),
-            )
-
-        return await self._async_finish_controller(user_input)
+        if user_input is not None:
+            name_filter = user_input.get(FILTER, "")
+            filter_changed = name_filter != self._filter
+            self._filter = name_filter
+            if (
+                not filter_changed
+                or user_input.get(CONTROLLERS)
+                or user_input.get(SELECT_ALL)
+            ):
+                return await self._async_finish_controller(user_input)
+
+        shown = filter_controllers(self._controllers, self._filter)
+        return self.async_show_form(
+            step_id="select_controllers",
+            data_schema=controllers_schema(shown, self._filter),
+            description_placeholders={
+                "shown": str(len(shown)),
+                "total": str(len(self._controllers)),
+            },
+        )
 
     async def async_step_user(self, user_input: dict[str, str] | None = None):
         """Handle the initial step."""
@@ -183,10 +390,47 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             step_id="user", data_schema=DATA_SCHEMA, errors=errors
         )
 
+    async def async_step_reauth(self, entry_data: Mapping[str, Any]) -> FlowResult:
+        """Ask for the credentials when the token was rejected."""
+        self._reauth_entry = self.hass.config_entries.async_get_entry(
+            self.context["entry_id"]
+        )
+        return await self.async_step_reauth_confirm()
+
+    async def async_step_reauth_confirm(
+        self, user_input: dict[str, str] | None = None
+    ) -> FlowResult:
+        """Authenticate again and store the credentials for token renewals."""
+        errors = {}
+        if user_input is not None:
+            try:
+                info = await validate_input(self.hass, user_input)
+            except TechLoginError:
+                errors["base"] = "invalid_auth"
+            except TechError:
+                errors["base"] = "cannot_connect"
+            else:
+                if info[USER_ID] != self._reauth_entry.data[USER_ID]:
+                    return self.async_abort(reason="wrong_account")
+                return self.async_update_reload_and_abort(
+                    self._reauth_entry,
+                    data={
+                        **self._reauth_entry.data,
+                        CONF_TOKEN: info[CONF_TOKEN],
+                        CONF_USERNAME: info[CONF_USERNAME],
+                        CONF_PASSWORD: info[CONF_PASSWORD],
+                    },
+                )
+
+        return self.async_show_form(
+            step_id="reauth_confirm", data_schema=DATA_SCHEMA, errors=errors
+        )
+
     def _create_config_entry(self, controller: dict) -> ConfigEntry:
         return ConfigEntry(
             data=controller,
             title=controller[CONTROLLER][CONF_NAME],
+            unique_id=controller[CONTROLLER][UDID],
             entry_id=uuid.uuid4().hex,
             domain=DOMAIN,
             version=ConfigFlow.VERSION,
@@ -194,11 +438,13 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             source=ConfigFlow.CONNECTION_CLASS,
         )
 
-    def _create_controllers_array(self, validated_input: dict) -> List[dict]:
-        return [
-            self._create_controller_dict(validated_input, controller_dict)
+    def _create_controllers_index(self, validated_input: dict) -> dict[str, dict]:
+        return {
+            str(controller_dict[ATTR_ID]): self._create_controller_dict(
+                validated_input, controller_dict
+            )
             for controller_dict in validated_input[CONTROLLERS]
-        ]
+        }
 
     def _create_controller_dict(
         self, validated_input: dict, controller_dict: dict
@@ -206,11 +452,78 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         return {
             USER_ID: validated_input[USER_ID],
             CONF_TOKEN: validated_input[CONF_TOKEN],
+            CONF_USERNAME: validated_input[CONF_USERNAME],
+            CONF_PASSWORD: validated_input[CONF_PASSWORD],
             CONTROLLER: controller_dict,
             VER: controller_dict[VER] + ": " + controller_dict[CONF_NAME],
         }
 
 
+class OptionsFlowHandler(OptionsFlow):
+    """Handle the options of a Tech Sterowniki entry.
+
+    Entity and connection options reload the entry, polling options are
+    applied to the running entry.
+    """
+
+    def __init__(self, config_entry: ConfigEntry) -> None:
+        """Initialize the options flow."""
+        self.config_entry = config_entry
+
+    async def async_step_init(self, user_input: dict | None = None) -> FlowResult:
+        """Choose the group of options to change."""
+        return self.async_show_menu(
+            step_id="init", menu_options=["entities", "polling", "connection"]
+        )
+
+    async def async_step_entities(self, user_input: dict | None = None) -> FlowResult:
+        """Choose the entity categories created for the entry."""
+        if user_input is not None:
+            user_input[CONF_TILE_TYPES] = [
+                int(tile_type) for tile_type in user_input[CONF_TILE_TYPES]
+            ]
+            return self._async_update_options(user_input)
+
+        return self.async_show_form(
+            step_id="entities", data_schema=entities_schema(self.config_entry.options)
+        )
+
+    async def async_step_polling(self, user_input: dict | None = None) -> FlowResult:
+        """Tune polling, timeouts, retries and state filtering."""
+        if user_input is not None:
+            return self._async_update_options(user_input)
+
+        return self.async_show_form(
+            step_id="polling",
+            data_schema=polling_schema(
+                self.config_entry.options, CONTROLLERS in self.config_entry.data
+            ),
+        )
+
+    async def async_step_connection(self, user_input: dict | None = None) -> FlowResult:
+        """Tune the connection pool and the API URL."""
+        if user_input is not None:
+            return self._async_update_options(user_input, CONF_API_URL)
+
+        return self.async_show_form(
+            step_id="connection",
+            data_schema=connection_schema(self.config_entry.options),
+        )
+
+    @callback
+    def _async_update_options(self, user_input: dict, *optional: str) -> FlowResult:
+        """Save the input, keeping the options of the other steps.
+
+        Optional options left empty in the form are removed.
+        """
+        options = {
+            key: value
+            for key, value in self.config_entry.options.items()
+            if key not in optional
+        }
+        return self.async_create_entry(title="", data={**options, **user_input})
+
+
 class CannotConnect(exceptions.HomeAssistantError):
     """Error to indicate we cannot connect."""
 
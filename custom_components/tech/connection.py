@@ -0,0 +1,123 @@
+"""Tuned aiohttp transport for the Tech API."""
+import logging
+import ssl
+import time
+
+import aiohttp
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ConnectionStats:
+    """Connection reuse statistics collected through aiohttp tracing."""
+
+    def __init__(self):
+        """Initialize the counters."""
+        self.requests = 0
+        self.connections_created = 0
+        self.connections_reused = 0
+        self.connect_time = 0.0
+        self.last_connect_time = None
+        self.dns_cache_hits = 0
+        self.dns_cache_misses = 0
+        self.warm_ups = 0
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        """Return a trace config feeding these statistics."""
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_request_start.append(self._on_request_start)
+        trace_config.on_connection_create_start.append(self._on_connection_start)
+        trace_config.on_connection_create_end.append(self._on_connection_end)
+        trace_config.on_connection_reuseconn.append(self._on_connection_reused)
+        trace_config.on_dns_cache_hit.append(self._on_dns_cache_hit)
+        trace_config.on_dns_cache_miss.append(self._on_dns_cache_miss)
+        return trace_config
+
+    async def _on_request_start(self, session, context, params):
+        self.requests += 1
+
+    async def _on_connection_start(self, session, context, params):
+        context.connect_started = time.monotonic()
+
+    async def _on_connection_end(self, session, context, params):
+        # Covers DNS, the TCP connect and the TLS handshake of a new connection.
+        self.connections_created += 1
+        self.last_connect_time = time.monotonic() - context.connect_started
+        self.connect_time += self.last_connect_time
+
+    async def _on_connection_reused(self, session, context, params):
+        self.connections_reused += 1
+
+    async def _on_dns_cache_hit(self, session, context, params):
+        self.dns_cache_hits += 1
+
+    async def _on_dns_cache_miss(self, session, context, params):
+        self.dns_cache_misses += 1
+
+    def as_dict(self) -> dict:
+        """Return the statistics for diagnostics."""
+        connections = self.connections_created + self.connections_reused
+        return {
+            "requests": self.requests,
+            "connections_created": self.connections_created,
+            "connections_reused": self.connections_reused,
+            "reuse_ratio": (
+                round(self.connections_reused / connections, 3) if connections else None
+            ),
+            "average_connect_ms": (
+                round(self.connect_time * 1000 / self.connections_created, 1)
+                if self.connections_created
+                else None
+            ),
+            "last_connect_ms": (
+                round(self.last_connect_time * 1000, 1)
+                if self.last_connect_time is not None
+                else None
+            ),
+            "dns_cache_hits": self.dns_cache_hits,
+            "dns_cache_misses": self.dns_cache_misses,
+            "warm_ups": self.warm_ups,
+        }
+
+
+def create_session(
+    limit: int,
+    limit_per_host: int,
+    ttl_dns_cache: int,
+    keepalive_timeout: float,
+    ssl_context: ssl.SSLContext | bool = True,
+    stats: ConnectionStats | None = None,
+) -> aiohttp.ClientSession:
+    """Create a client session with its own tuned connection pool.
+
+    Args:
+    limit (int): Maximum number of simultaneous connections.
+    limit_per_host (int): Maximum number of connections to emodul.eu.
+    ttl_dns_cache (int): Seconds to cache resolved addresses.
+    keepalive_timeout (float): Seconds to keep an idle connection open.
+    ssl_context: SSL context used for the TLS handshakes.
+    stats (ConnectionStats): Statistics to collect, if any.
+
+    Returns:
+    aiohttp.ClientSession: The new session; the caller must close it.
+
+    """
+    _LOGGER.debug(
+        "Creating Tech session: limit=%s, per host=%s, dns ttl=%s, keepalive=%s",
+        limit,
+        limit_per_host,
+        ttl_dns_cache,
+        keepalive_timeout,
+    )
+    connector = aiohttp.TCPConnector(
+        limit=limit,
+        limit_per_host=limit_per_host,
+        ttl_dns_cache=ttl_dns_cache,
+        use_dns_cache=ttl_dns_cache > 0,
+        keepalive_timeout=keepalive_timeout,
+        ssl=ssl_context,
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        trace_configs=[stats.trace_config()] if stats is not None else None,
+    )
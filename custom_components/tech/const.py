@@ -9,6 +9,9 @@ DOMAIN = "tech"
 CONTROLLER = "controller"
 CONTROLLERS = "controllers"
 VER = "version"
+ACCOUNT = "account"
+FILTER = "filter"
+SELECT_ALL = "select_all"
 UDID = "udid"
 USER_ID = "user_id"
 TILES = "tiles"
@@ -22,6 +25,73 @@ PLATFORMS = [Platform.BINARY_SENSOR, Platform.SENSOR, Platform.CLIMATE]
 
 SCAN_INTERVAL: Final = timedelta(seconds=120)
 API_TIMEOUT: Final = 30
+# bounds of the poll interval set in the options, in seconds
+MIN_SCAN_INTERVAL = 30
+MAX_SCAN_INTERVAL = 3600
+
+# services
+SERVICE_SET_ZONES = "set_zones"
+SERVICE_GET_SNAPSHOT = "get_snapshot"
+# zone writes of one set_zones call in flight at once
+MAX_PARALLEL_WRITES = 4
+
+# options
+CONF_RECORD_PAYLOADS = "record_payloads"
+CONF_DEDICATED_SESSION = "dedicated_session"
+CONF_CONNECTION_LIMIT = "connection_limit"
+CONF_CONNECTION_LIMIT_PER_HOST = "connection_limit_per_host"
+CONF_DNS_CACHE_TTL = "dns_cache_ttl"
+CONF_KEEPALIVE_TIMEOUT = "keepalive_timeout"
+CONF_WARM_UP_LEAD = "warm_up_lead"
+CONF_UNAVAILABLE_AFTER_FAILURES = "unavailable_after_failures"
+CONF_MAX_STALE_AGE = "max_stale_age"
+CONF_MAX_PARALLEL_POLLS = "max_parallel_polls"
+# base URL of the Tech API, e.g. of a caching proxy shared by several clients
+CONF_API_URL = "api_url"
+# entity categories created for an entry
+CONF_ZONE_CLIMATE = "zone_climate"
+CONF_ZONE_SENSORS = "zone_sensors"
+CONF_TILE_TYPES = "tile_types"
+CONF_BINARY_SENSORS = "binary_sensors"
+# keep only the texts the installation refers to of the language pack
+CONF_TRIM_TRANSLATIONS = "trim_translations"
+# timeouts in seconds of a whole update and of single poll and write requests
+CONF_UPDATE_TIMEOUT = "update_timeout"
+CONF_POLL_TIMEOUT = "poll_timeout"
+CONF_WRITE_TIMEOUT = "write_timeout"
+CONF_RETRIES = "retries"
+CONF_RETRY_BACKOFF = "retry_backoff"
+CONF_TEMPERATURE_DEADBAND = "temperature_deadband"
+CONF_VALVE_DEADBAND = "valve_deadband"
+CONF_HUMIDITY_DEADBAND = "humidity_deadband"
+
+DEFAULT_CONNECTION_LIMIT = 10
+DEFAULT_CONNECTION_LIMIT_PER_HOST = 4
+DEFAULT_DNS_CACHE_TTL = 300
+# longer than SCAN_INTERVAL so the connection survives between polls
+DEFAULT_KEEPALIVE_TIMEOUT = 150
+DEFAULT_WARM_UP_LEAD = 5
+# serve the last good data until this many polls in a row failed...
+DEFAULT_UNAVAILABLE_AFTER_FAILURES = 3
+# ...or the data is older than this many seconds
+DEFAULT_MAX_STALE_AGE = 900
+# controllers of an account entry fetched at the same time
+DEFAULT_MAX_PARALLEL_POLLS = 4
+
+# directory (inside HA config) holding the payload recordings of each entry
+RECORDINGS_DIR = "tech_recordings"
+
+# hass.data key of the dedicated sessions, shared by all entries of an account
+DATA_SESSIONS = f"{DOMAIN}_sessions"
+
+# hass.data key of the request queues, shared by all entries of an account
+DATA_QUEUES = f"{DOMAIN}_queues"
+
+# hass.data key of the poll schedulers spreading the polls of an account
+DATA_SCHEDULERS = f"{DOMAIN}_schedulers"
+
+# hass.data key of the language packs, shared by all entries
+DATA_TRANSLATIONS = f"{DOMAIN}_translations"
 
 # tile type
 TYPE_TEMPERATURE = 1
@@ -35,6 +105,19 @@ TYPE_MIXING_VALVE = 24
 TYPE_FUEL_SUPPLY = 31
 TYPE_TEXT = 40
 TYPE_SW_VERSION = 50
+# tiles set up as binary sensors
+BINARY_SENSOR_TILE_TYPES = (TYPE_FIRE_SENSOR, TYPE_RELAY, TYPE_ADDITIONAL_PUMP)
+
+# tile types with sensors, all created unless deselected in the options
+TILE_SENSOR_TYPES = {
+    TYPE_TEMPERATURE: "Temperature",
+    TYPE_TEMPERATURE_CH: "Central heating temperature",
+    TYPE_FAN: "Fan",
+    TYPE_VALVE: "Valve",
+    TYPE_MIXING_VALVE: "Mixing valve",
+    TYPE_FUEL_SUPPLY: "Fuel supply",
+    TYPE_TEXT: "Text",
+}
 
 # map iconId -> icon name
 ICON_BY_ID = {
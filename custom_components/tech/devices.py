@@ -0,0 +1,35 @@
+"""Device registry layout of the Tech Controllers integration.
+
+Every controller is a device holding its tiles and controller-wide
+sensors, and every zone is a device connected through its controller.
+"""
+from homeassistant.const import (
+    ATTR_IDENTIFIERS,
+    ATTR_MANUFACTURER,
+    ATTR_VIA_DEVICE,
+    CONF_MODEL,
+    CONF_NAME,
+)
+
+from .const import DOMAIN, MANUFACTURER, UDID, VER
+
+
+def controller_device_info(controller: dict) -> dict:
+    """Return the device info of a controller, holding its tiles."""
+    return {
+        ATTR_IDENTIFIERS: {(DOMAIN, controller[UDID])},
+        CONF_NAME: controller[CONF_NAME],
+        CONF_MODEL: controller[CONF_NAME] + ": " + controller[VER],
+        ATTR_MANUFACTURER: MANUFACTURER,
+    }
+
+
+def zone_device_info(controller: dict, zone_id, name: str) -> dict:
+    """Return the device info of a zone, connected through its controller."""
+    return {
+        ATTR_IDENTIFIERS: {(DOMAIN, f"{controller[UDID]}_{zone_id}")},
+        CONF_NAME: name,
+        CONF_MODEL: controller[CONF_NAME] + ": " + controller[VER],
+        ATTR_MANUFACTURER: MANUFACTURER,
+        ATTR_VIA_DEVICE: (DOMAIN, controller[UDID]),
+    }
@@ -0,0 +1,64 @@
+"""Diagnostics support for Tech Controllers."""
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_PASSWORD, CONF_TOKEN, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+
+from . import TechCoordinator
+from .const import DOMAIN, UDID, USER_ID
+
+TO_REDACT = {CONF_PASSWORD, CONF_TOKEN, CONF_USERNAME, USER_ID}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: TechCoordinator = hass.data[DOMAIN][entry.entry_id]
+    stats = coordinator.connection_stats
+    scheduler = coordinator.poll_scheduler
+    interval = coordinator.update_interval
+
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "coordinator": {
+            "last_update_success": coordinator.last_update_success,
+            "last_poll_ms": (
+                round(coordinator.last_poll_duration * 1000, 1)
+                if coordinator.last_poll_duration is not None
+                else None
+            ),
+            "warm_up_lead": coordinator.warm_up_lead,
+            "stale": coordinator.stale,
+            "data_age_s": (
+                round(coordinator.data_age)
+                if coordinator.data_age is not None
+                else None
+            ),
+            "consecutive_failures": coordinator.consecutive_failures,
+            "token_renewals": coordinator.api.token_renewals,
+            "can_renew_token": coordinator.api.credentials is not None,
+        },
+        "controllers": {
+            controller_coordinator.controller[UDID]: {
+                "last_update_success": controller_coordinator.last_update_success,
+                "stale": controller_coordinator.stale,
+                "consecutive_failures": controller_coordinator.consecutive_failures,
+            }
+            for controller_coordinator in coordinator.controller_coordinators
+        },
+        "poll_phase": (
+            {
+                "phase_s": round(
+                    scheduler.phase(entry.entry_id, interval.total_seconds()), 1
+                ),
+                **scheduler.as_dict(interval.total_seconds()),
+            }
+            if scheduler is not None and interval is not None
+            else None
+        ),
+        "request_queue": coordinator.api.queue.as_dict(),
+        "connection": stats.as_dict() if stats is not None else None,
+    }
@@ -1,35 +1,76 @@
 """TileEntity."""
 from abc import abstractmethod
 import logging
-from typing import Any
-
-from homeassistant.const import (
-    ATTR_IDENTIFIERS,
-    ATTR_MANUFACTURER,
-    CONF_DESCRIPTION,
-    CONF_ID,
-    CONF_MODEL,
-    CONF_NAME,
-    CONF_PARAMS,
-    CONF_TYPE,
-)
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.const import CONF_DESCRIPTION, CONF_ID, CONF_PARAMS, CONF_TYPE
 from homeassistant.core import callback
 from homeassistant.helpers import entity
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util import dt as dt_util
+
+from . import assets
+from .const import MANUFACTURER
+from .devices import controller_device_info
+from .filters import WriteFilter
 
-from . import TechCoordinator, assets
-from .const import DOMAIN, MANUFACTURER
+if TYPE_CHECKING:
+    from . import TechCoordinator
 
 _LOGGER = logging.getLogger(__name__)
 
 
+class FilteredStateMixin:
+    """Mixin for coordinator entities writing only significant changes.
+
+    Subclasses set _write_filter_settings to (deadband, min_interval,
+    heartbeat), _deadband_option to the option overriding the deadband,
+    and provide filtered_device(), returning their part of the coordinator
+    data, and filtered_value(), returning the value the filter compares.
+    Every coordinator update refreshes the properties, but the state is
+    only written if the WriteFilter accepts the new value or the
+    availability changed; properties that are not filtered go out with
+    the next write.
+    """
+
+    _write_filter_settings: tuple[float, float, float]
+    _deadband_option: str
+    _write_filter: WriteFilter | None = None
+    _written_available = True
+
+    async def async_added_to_hass(self) -> None:
+        """Start filtering from the state written when the entity was added."""
+        await super().async_added_to_hass()
+        self._write_filter = WriteFilter(*self._write_filter_settings)
+        self._write_filter.record(self.filtered_value(), dt_util.utcnow().timestamp())
+
+    @callback
+    def _handle_coordinator_update(self, *args: Any) -> None:
+        """Pass the update on if the new value is worth writing."""
+        available = self.available
+        if self._write_filter is not None:
+            # the deadbands follow the options without a reload
+            self._write_filter.deadband = self.coordinator.deadbands[
+                self._deadband_option
+            ]
+            if available == self._written_available and not (
+                self._write_filter.should_write(
+                    self.filtered_value(), dt_util.utcnow().timestamp()
+                )
+            ):
+                self.update_properties(self.filtered_device())
+                return
+        self._written_available = available
+        super()._handle_coordinator_update(*args)
+
+
 class TileEntity(
     CoordinatorEntity,
     entity.Entity,
 ):
     """Representation of a TileEntity."""
 
-    def __init__(self, device, coordinator: TechCoordinator, controller_uid):
+    def __init__(self, device, coordinator: "TechCoordinator", controller_uid):
         """Initialize the tile entity."""
         super().__init__(coordinator)
         self._controller_uid = controller_uid
@@ -48,14 +89,7 @@ class TileEntity(
     @property
     def device_info(self):
         """Get device info."""
-        return {
-            ATTR_IDENTIFIERS: {
-                (DOMAIN, self.unique_id)
-            },  # Unique identifiers for the device
-            CONF_NAME: self.name,  # Name of the device
-            CONF_MODEL: self._model,  # Model of the device
-            ATTR_MANUFACTURER: self.manufacturer,  # Manufacturer of the device
-        }
+        return controller_device_info(self._coordinator.controller)
 
     @property
     def unique_id(self) -> str:
@@ -0,0 +1,61 @@
+"""Filtering of noisy Tech sensor states before they are written."""
+from .const import (
+    CONF_HUMIDITY_DEADBAND,
+    CONF_TEMPERATURE_DEADBAND,
+    CONF_VALVE_DEADBAND,
+)
+
+# (deadband, minimum interval s, heartbeat s) per kind of sensor
+TEMPERATURE_FILTER = (0.2, 0, 3600)
+VALVE_FILTER = (5, 240, 3600)
+HUMIDITY_FILTER = (2, 0, 3600)
+# the deadbands can be changed in the entry options
+DEFAULT_DEADBANDS = {
+    CONF_TEMPERATURE_DEADBAND: TEMPERATURE_FILTER[0],
+    CONF_VALVE_DEADBAND: VALVE_FILTER[0],
+    CONF_HUMIDITY_DEADBAND: HUMIDITY_FILTER[0],
+}
+
+
+def _numeric(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+class WriteFilter:
+    """Decide which new values of a sensor are worth writing.
+
+    A new value is written when it differs from the last written one by at
+    least the deadband and the last write is at least min_interval ago. A
+    value that moved by less than the deadband is still written once the
+    last write is heartbeat seconds old, so slow drifts show up. Values
+    that are not numbers are written whenever they change.
+    """
+
+    def __init__(self, deadband: float, min_interval: float, heartbeat: float) -> None:
+        """Initialize the filter; nothing has been written yet."""
+        self.deadband = deadband
+        self.min_interval = min_interval
+        self.heartbeat = heartbeat
+        self._value = None
+        self._time: float | None = None
+
+    def record(self, value, now: float) -> None:
+        """Remember a value as written at time now."""
+        self._value = value
+        self._time = now
+
+    def should_write(self, value, now: float) -> bool:
+        """Return whether to write value, recording it if so."""
+        if value == self._value:
+            return False
+        if self._time is None or not _numeric(value) or not _numeric(self._value):
+            write = True
+        elif now - self._time >= self.heartbeat:
+            write = True
+        elif now - self._time < self.min_interval:
+            write = False
+        else:
+            write = abs(value - self._value) >= self.deadband
+        if write:
+            self.record(value, now)
+        return write
@@ -0,0 +1,278 @@
+"""Flight recorder of raw Tech API payloads and their replay."""
+import asyncio
+from collections import defaultdict, deque
+import gzip
+import json
+import logging
+import os
+import re
+import time
+
+_LOGGER = logging.getLogger(__name__)
+
+REDACTED = "**REDACTED**"
+REDACT_KEYS = {"token", "password", "username", "user_id", "email", "Authorization"}
+USER_PATH = re.compile(r"users/[^/]+")
+
+FILE_PREFIX = "tech-"
+FILE_SUFFIX = ".jsonl.gz"
+DEFAULT_MAX_FILE_BYTES = 1024 * 1024
+DEFAULT_MAX_TOTAL_BYTES = 10 * 1024 * 1024
+# records are flushed to the file in batches of this many bytes, or once
+# the oldest unflushed record is this many seconds old
+FLUSH_BYTES = 64 * 1024
+FLUSH_INTERVAL = 60
+
+
+def redact(data):
+    """Return a copy of data with credentials and user identifiers removed.
+
+    Args:
+    data: JSON-like structure (dict, list or scalar).
+
+    Returns:
+    The same structure with sensitive values replaced.
+
+    """
+    if isinstance(data, dict):
+        return {
+            key: REDACTED if key in REDACT_KEYS else redact(value)
+            for key, value in data.items()
+        }
+    if isinstance(data, list):
+        return [redact(value) for value in data]
+    return data
+
+
+def redact_path(request_path: str) -> str:
+    """Remove the user ID from an API request path."""
+    return USER_PATH.sub("users/" + REDACTED, request_path)
+
+
+class PayloadRecorder:
+    """Append raw API responses to rotating, compressed JSONL files.
+
+    Files are written from the executor so recording never blocks the event
+    loop. Each file is one gzip stream, kept open until it is rotated or the
+    recorder is closed. Records are flushed in batches, so they compress
+    almost as well as a whole file does and can be read up to the last
+    flush while the file is written. When a file grows past max_file_bytes
+    a new one is started, and the oldest files are deleted to keep the
+    directory, the new file included, under max_total_bytes.
+    """
+
+    def __init__(
+        self,
+        directory,
+        max_file_bytes=DEFAULT_MAX_FILE_BYTES,
+        max_total_bytes=DEFAULT_MAX_TOTAL_BYTES,
+    ):
+        """Initialize the recorder.
+
+        Args:
+        directory (str): Directory to store the recordings in.
+        max_file_bytes (int): Size after which a new file is started.
+        max_total_bytes (int): Disk cap for all recordings in the directory.
+
+        """
+        self.directory = directory
+        self.max_file_bytes = max_file_bytes
+        self.max_total_bytes = max_total_bytes
+        self._current = None
+        self._file: gzip.GzipFile | None = None
+        # uncompressed bytes written since the last flush and its time
+        self._pending = 0
+        self._flushed = 0.0
+        self._lock = asyncio.Lock()
+
+    async def async_record(
+        self, method, request_path, status, payload, elapsed, request_data=None
+    ):
+        """Record one API exchange.
+
+        Args:
+        method (str): HTTP method.
+        request_path (str): Path relative to the API base URL.
+        status (int): HTTP status of the response.
+        payload: Decoded JSON response, or text for failed requests.
+        elapsed (float): Request duration in seconds.
+        request_data (str): Body sent with the request, if any.
+
+        """
+        record = {
+            "ts": time.time(),
+            "method": method,
+            "path": redact_path(request_path),
+            "status": status,
+            "elapsed": round(elapsed, 4),
+            "payload": redact(payload),
+        }
+        if request_data is not None:
+            try:
+                record["request"] = redact(json.loads(request_data))
+            except ValueError:
+                record["request"] = REDACTED
+        line = json.dumps(record, separators=(",", ":")) + "\n"
+        async with self._lock:
+            await asyncio.get_running_loop().run_in_executor(None, self._write, line)
+
+    async def async_close(self):
+        """Finish the current file; the next record starts a new one."""
+        async with self._lock:
+            await asyncio.get_running_loop().run_in_executor(None, self._close)
+
+    def _write(self, line):
+        """Append a line to the current file, rotating and pruning as needed."""
+        if self._file is None or os.path.getsize(self._current) >= self.max_file_bytes:
+            self._close()
+            os.makedirs(self.directory, exist_ok=True)
+            # room for the new file to grow to its full size
+            self._prune(self.max_total_bytes - self.max_file_bytes)
+            self._current = os.path.join(
+                self.directory, f"{FILE_PREFIX}{time.time_ns()}{FILE_SUFFIX}"
+            )
+            self._file = gzip.open(self._current, "ab")
+        if not self._pending:
+            self._flushed = time.monotonic()
+        self._pending += self._file.write(line.encode("utf-8"))
+        if (
+            self._pending >= min(FLUSH_BYTES, self.max_file_bytes)
+            or time.monotonic() - self._flushed >= FLUSH_INTERVAL
+        ):
+            self._file.flush()
+            self._pending = 0
+
+    def _close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._pending = 0
+
+    def _prune(self, max_bytes):
+        """Delete the oldest recordings until they take at most max_bytes."""
+        files = recording_files(self.directory)
+        total = sum(os.path.getsize(path) for path in files)
+        while files and total > max_bytes:
+            oldest = files.pop(0)
+            total -= os.path.getsize(oldest)
+            os.remove(oldest)
+            _LOGGER.debug("Removed old payload recording %s", oldest)
+
+
+def recording_files(directory):
+    """Return the recording files in directory, oldest first."""
+    if not os.path.isdir(directory):
+        return []
+    return sorted(
+        os.path.join(directory, name)
+        for name in os.listdir(directory)
+        if name.startswith(FILE_PREFIX) and name.endswith(FILE_SUFFIX)
+    )
+
+
+def load_recording(directory):
+    """Read every record stored in directory in chronological order.
+
+    This does blocking file I/O; run it in the executor from the event loop.
+    """
+    records = []
+    for path in recording_files(directory):
+        with gzip.open(path, "rt", encoding="utf-8") as file:
+            try:
+                for line in file:
+                    if line.strip():
+                        records.append(json.loads(line))
+            except EOFError:
+                # the file being written lacks the end of its gzip stream
+                pass
+    return records
+
+
+class _ReplayResponse:
+    """Minimal aiohttp response built from a record."""
+
+    def __init__(self, record):
+        self.status = record["status"]
+        self._payload = record["payload"]
+
+    async def json(self):
+        return self._payload
+
+    async def text(self):
+        if isinstance(self._payload, str):
+            return self._payload
+        return json.dumps(self._payload)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return None
+
+
+class ReplaySession:
+    """Stand-in for aiohttp.ClientSession answering from a recording.
+
+    Responses are served per method and redacted path in the order they were
+    recorded; the last response of a path is repeated once it runs out.
+    """
+
+    def __init__(self, records, base_url):
+        """Initialize the session from recorded exchanges."""
+        self.base_url = base_url
+        self.requests = 0
+        self._responses = defaultdict(deque)
+        for record in records:
+            self._responses[(record["method"], record["path"])].append(record)
+
+    def _respond(self, method, url):
+        self.requests += 1
+        key = (method, redact_path(url.removeprefix(self.base_url)))
+        responses = self._responses.get(key)
+        if not responses:
+            return _ReplayResponse({"status": 404, "payload": "Not recorded"})
+        if len(responses) > 1:
+            return _ReplayResponse(responses.popleft())
+        return _ReplayResponse(responses[0])
+
+    def get(self, url, **kwargs):
+        """Return the next recorded GET response for url."""
+        return self._respond("GET", url)
+
+    def post(self, url, **kwargs):
+        """Return the next recorded POST response for url."""
+        return self._respond("POST", url)
+
+
+async def async_replay(coordinator, module_udid, records, speed=1.0):
+    """Feed a recording into a coordinator without touching the network.
+
+    The coordinator's client is switched to a ReplaySession and refreshed once
+    for every recorded poll of module_udid, waiting the recorded time between
+    polls divided by speed. A speed of 0 replays as fast as possible.
+
+    Args:
+    coordinator: TechCoordinator to feed.
+    module_udid (str): Controller whose polls should be replayed.
+    records (list): Records as returned by load_recording.
+    speed (float): Replay speed multiplier.
+
+    Returns:
+    int: Number of polls replayed.
+
+    """
+    api = coordinator.api
+    api.session = ReplaySession(records, api.base_url)
+    polls = [
+        record
+        for record in records
+        if record["method"] == "GET"
+        and record["path"].endswith("/modules/" + module_udid)
+    ]
+    previous = None
+    for record in polls:
+        if previous is not None and speed:
+            await asyncio.sleep(max(0.0, record["ts"] - previous) / speed)
+        previous = record["ts"]
+        await coordinator.async_refresh()
+    return len(polls)
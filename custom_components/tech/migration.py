@@ -0,0 +1,206 @@
+"""Registry migrations of the Tech Controllers integration."""
+import asyncio
+import logging
+import re
+
+from homeassistant.components.sensor import SensorDeviceClass
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_DESCRIPTION, CONF_NAME, Platform
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr, entity_registry as er
+
+from .const import CONTROLLER, CONTROLLERS, DOMAIN, MANUFACTURER, UDID, VER
+from .devices import controller_device_info, zone_device_info
+
+_LOGGER = logging.getLogger(__name__)
+
+# unique ids of the zone sensors before version 3, which lacked the udid
+OLD_ZONE_SENSOR_ID = re.compile(r"^(?:climate_(\d+)_(battery|humidity)|(\d+))$")
+# unique ids of the sensors derived from a zone, such as its trend
+ZONE_DERIVED_ID = re.compile(r"^zone_(\d+)_")
+# old devices detached between yields to the event loop
+DEVICE_REMOVAL_BATCH = 100
+
+
+def _udid_prefix(unique_id: str, udids: dict, lengths: set[int]) -> str | None:
+    """Return the udid a unique id starts with, looked up by udid length."""
+    for length in lengths:
+        if unique_id[length : length + 1] == "_" and unique_id[:length] in udids:
+            return unique_id[:length]
+    return None
+
+
+def _zone_sensor_id(entity: er.RegistryEntry) -> tuple[str, str] | None:
+    """Return the zone id and kind of a zone sensor from before version 3."""
+    if (match := OLD_ZONE_SENSOR_ID.match(entity.unique_id)) is None:
+        return None
+    if match[3] is not None:
+        return match[3], "battery"
+    if match[2] == "humidity":
+        return match[1], "humidity"
+    # the temperature sensor had the unique id of a battery sensor
+    if entity.original_device_class == SensorDeviceClass.TEMPERATURE:
+        return match[1], "temperature"
+    return match[1], "battery"
+
+
+@callback
+def async_migrate_zone_devices(
+    hass: HomeAssistant, entry: ConfigEntry, controller: dict, zones: dict
+) -> None:
+    """Link the entities of a version 1 entry to devices of their zones.
+
+    Version 1 had no devices; an entity named after a zone goes to that
+    zone's new device and gets a unique id including the udid, all other
+    entities are no longer provided and are removed. The zone devices are
+    indexed by name and the entities listed once, so every entity costs
+    a dictionary lookup and at most one registry update.
+    """
+    device_registry = dr.async_get(hass)
+    entity_registry = er.async_get(hass)
+    udid = controller[UDID]
+    devices: dict[str, dr.DeviceEntry] = {}
+    for zone in zones.values():
+        name = zone[CONF_DESCRIPTION][CONF_NAME]
+        devices[name] = device_registry.async_get_or_create(
+            config_entry_id=entry.entry_id,
+            identifiers={(DOMAIN, name)},
+            manufacturer=MANUFACTURER,
+            name=name,
+            model=controller[CONF_NAME] + ": " + controller[VER],
+        )
+
+    for entity in er.async_entries_for_config_entry(entity_registry, entry.entry_id):
+        device = devices.get(entity.original_name) if entity.original_name else None
+        unique_id = f"{udid}_{entity.unique_id}"
+        if device is None or entity_registry.async_get_entity_id(
+            entity.domain, entity.platform, unique_id
+        ):
+            entity_registry.async_remove(entity.entity_id)
+            continue
+        entity_registry.async_update_entity(
+            entity.entity_id, new_unique_id=unique_id, device_id=device.id
+        )
+
+
+async def async_migrate_device_layout(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Move the entities of an entry to one device per controller and zone.
+
+    Before version 3 every tile entity had a device of its own and zones
+    had devices identified by their name. The thermostat of each zone
+    tells which old device was the zone's; zone sensors follow it and get
+    unique ids including the udid, all other entities move to their
+    controller's device. Zone devices take the area of the old zone
+    device, and entities moved off a device with an area keep it as
+    their own unless they had one. The old devices are detached from the
+    entry, which removes them along with any entities the integration no
+    longer provides. Every entity is placed with dictionary lookups only, and all
+    changes are made in one pass and saved by the registries at once.
+    """
+    device_registry = dr.async_get(hass)
+    entity_registry = er.async_get(hass)
+    controllers = {
+        controller[UDID]: controller
+        for controller in entry.data.get(CONTROLLERS) or [entry.data[CONTROLLER]]
+    }
+    # new device identifier -> device id
+    devices: dict[str, str] = {}
+    # new device id -> area id
+    areas: dict[str, str | None] = {}
+    for udid, controller in controllers.items():
+        device = device_registry.async_get_or_create(
+            config_entry_id=entry.entry_id, **controller_device_info(controller)
+        )
+        devices[udid] = device.id
+        areas[device.id] = device.area_id
+
+    entities = er.async_entries_for_config_entry(entity_registry, entry.entry_id)
+    # old zone device id -> (udid, zone id)
+    zones: dict[str, tuple[str, str]] = {}
+    for entity in entities:
+        if entity.domain != Platform.CLIMATE:
+            continue
+        udid, _, zone_id = entity.unique_id.rpartition("_")
+        if udid not in controllers:
+            continue
+        old_device = (
+            device_registry.async_get(entity.device_id) if entity.device_id else None
+        )
+        name = (old_device and old_device.name) or entity.original_name or zone_id
+        device = device_registry.async_get_or_create(
+            config_entry_id=entry.entry_id,
+            **zone_device_info(controllers[udid], zone_id, name),
+        )
+        if old_device is not None:
+            zones[old_device.id] = (udid, zone_id)
+            if old_device.area_id and device.area_id is None:
+                device = device_registry.async_update_device(
+                    device.id, area_id=old_device.area_id
+                )
+        devices[entity.unique_id] = device.id
+        areas[device.id] = device.area_id
+
+    single_udid = next(iter(controllers)) if len(controllers) == 1 else None
+    udid_lengths = {len(udid) for udid in controllers}
+    for entity in entities:
+        unique_id = entity.unique_id
+        device_key = None
+        if (zone_sensor := _zone_sensor_id(entity)) is not None:
+            zone_id, kind = zone_sensor
+            udid, zone_id = zones.get(entity.device_id, (single_udid, zone_id))
+            if udid is None:
+                continue
+            device_key = f"{udid}_{zone_id}"
+            unique_id = f"{device_key}_{kind}"
+        elif entity.domain == Platform.CLIMATE:
+            device_key = unique_id
+        else:
+            udid = _udid_prefix(unique_id, controllers, udid_lengths)
+            if udid is None:
+                continue
+            device_key = udid
+            if match := ZONE_DERIVED_ID.match(unique_id[len(udid) + 1 :]):
+                device_key = f"{udid}_{match[1]}"
+        device_id = devices.get(device_key)
+        if device_id is None:
+            continue
+        if unique_id != entity.unique_id and entity_registry.async_get_entity_id(
+            entity.domain, entity.platform, unique_id
+        ):
+            # the entity was already set up under its new unique id
+            entity_registry.async_remove(entity.entity_id)
+            continue
+        changes = {}
+        if unique_id != entity.unique_id:
+            changes["new_unique_id"] = unique_id
+        if device_id != entity.device_id:
+            changes["device_id"] = device_id
+            old_device = (
+                device_registry.async_get(entity.device_id)
+                if entity.device_id and entity.area_id is None
+                else None
+            )
+            if old_device and old_device.area_id not in (None, areas[device_id]):
+                # the entity's area came from its old device
+                changes["area_id"] = old_device.area_id
+        if changes:
+            entity_registry.async_update_entity(entity.entity_id, **changes)
+
+    kept = set(devices.values())
+    removed = 0
+    for device in dr.async_entries_for_config_entry(device_registry, entry.entry_id):
+        if device.id not in kept:
+            device_registry.async_update_device(
+                device.id, remove_config_entry_id=entry.entry_id
+            )
+            removed += 1
+            # removing a device scans the whole registry for devices linked
+            # through it, let the event loop run between batches
+            if removed % DEVICE_REMOVAL_BATCH == 0:
+                await asyncio.sleep(0)
+    _LOGGER.debug(
+        "Moved %s entities to %s devices, detached %s old devices",
+        len(entities),
+        len(kept),
+        removed,
+    )
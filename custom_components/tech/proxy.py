@@ -0,0 +1,263 @@
+"""Caching proxy of the Tech API shared by several clients.
+
+The proxy speaks the same API paths as emodul.eu, so any Tech client (a
+Home Assistant instance with the api_url option, or a script) can use it
+as its base URL. It polls the modules that have been asked for once per
+interval, serves module data, module lists and translations from its
+cache, and passes zone writes through to emodul.eu, dropping the cached
+data of the written module so the next read shows the change.
+
+Run it with::
+
+    python -m custom_components.tech.proxy --username USER --password PASS
+"""
+import argparse
+import asyncio
+from collections import Counter
+import logging
+import time
+
+import aiohttp
+from aiohttp import web
+
+from .tech import AUTHENTICATION_PATH, ENDPOINT_BULK, ENDPOINT_WRITE, Tech, TechError
+
+_LOGGER = logging.getLogger(__name__)
+
+API_PREFIX = "/api/v1/"
+DEFAULT_INTERVAL = 120
+# module lists and language packs hardly ever change
+MODULE_LIST_TTL = 3600
+TRANSLATIONS_TTL = 86400
+# tokens of client logins accepted, the oldest are dropped first
+MAX_CLIENT_TOKENS = 32
+
+
+class TechProxy:
+    """Caching proxy of one emodul account."""
+
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        user_id: str,
+        token: str,
+        upstream_url: str = Tech.TECH_API_URL,
+        interval: float = DEFAULT_INTERVAL,
+        credentials: tuple[str, str] | None = None,
+    ) -> None:
+        """Initialize the proxy.
+
+        Args:
+        session (aiohttp.ClientSession): Session used for the upstream requests.
+        user_id (str): The user ID of the account.
+        token (str): The upstream token, also accepted from the clients.
+        upstream_url (str): Base URL of the upstream API.
+        interval (float): Seconds between the upstream polls of a module.
+        credentials (tuple): Username and password to renew the upstream
+            token with once it expires.
+
+        """
+        self.api = Tech(
+            session, user_id, token, base_url=upstream_url, credentials=credentials
+        )
+        self.interval = interval
+        self.stats: Counter = Counter()
+        self._token = token
+        # insertion ordered, used as a set of the latest client logins
+        self._client_tokens: dict[str, None] = {}
+        self._cache: dict[str, tuple[float, object]] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._poller: asyncio.Task | None = None
+
+    def application(self) -> web.Application:
+        """Return the aiohttp application serving the API."""
+        app = web.Application(middlewares=[self._middleware])
+        app.router.add_head(API_PREFIX, self._warm_up)
+        app.router.add_post(API_PREFIX + "authentication", self._authenticate)
+        app.router.add_get(API_PREFIX + "users/{user_id}/modules", self._modules)
+        app.router.add_get(API_PREFIX + "users/{user_id}/modules/{udid}", self._module)
+        app.router.add_post(
+            API_PREFIX + "users/{user_id}/modules/{udid}/zones", self._zones
+        )
+        app.router.add_get(API_PREFIX + "i18n/{language}", self._translations)
+        app.on_startup.append(self._async_start)
+        app.on_cleanup.append(self._async_stop)
+        return app
+
+    async def _async_start(self, app: web.Application) -> None:
+        self._poller = asyncio.create_task(self._async_poll())
+
+    async def _async_stop(self, app: web.Application) -> None:
+        if self._poller is not None:
+            self._poller.cancel()
+            self._poller = None
+
+    async def _async_poll(self) -> None:
+        """Refresh the known modules once per interval."""
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.async_refresh()
+
+    async def async_refresh(self) -> None:
+        """Fetch every module that has been asked for from upstream."""
+        udids = [
+            key.removeprefix("module:")
+            for key in self._cache
+            if key.startswith("module:")
+        ]
+        results = await asyncio.gather(
+            *(self._async_fetch_module(udid) for udid in udids),
+            return_exceptions=True,
+        )
+        for udid, result in zip(udids, results):
+            if isinstance(result, TechError):
+                _LOGGER.warning("Unable to refresh module %s: %s", udid, result.status)
+            elif isinstance(result, Exception):
+                _LOGGER.error(
+                    "Unexpected error refreshing module %s", udid, exc_info=result
+                )
+
+    async def _async_fetch_module(self, udid: str):
+        data = await self.api.get_module_data(udid)
+        self.stats["upstream"] += 1
+        self._cache["module:" + udid] = (time.monotonic(), data)
+        return data
+
+    async def _async_cached(self, key: str, ttl: float, fetch):
+        """Return cached data, fetching it once for all waiting clients."""
+        cached = self._cache.get(key)
+        if cached is not None and time.monotonic() - cached[0] < ttl:
+            self.stats["hits"] += 1
+            return cached[1]
+        async with self._locks.setdefault(key, asyncio.Lock()):
+            cached = self._cache.get(key)
+            if cached is not None and time.monotonic() - cached[0] < ttl:
+                self.stats["hits"] += 1
+                return cached[1]
+            self.stats["misses"] += 1
+            self.stats["upstream"] += 1
+            data = await fetch()
+            self._cache[key] = (time.monotonic(), data)
+            return data
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler):
+        if handler not in (self._authenticate, self._warm_up):
+            token = request.headers.get("Authorization", "").removeprefix("Bearer ")
+            if token != self._token and token not in self._client_tokens:
+                return web.Response(status=401, text="Unauthorized")
+            user_id = request.match_info.get("user_id")
+            if user_id is not None and user_id != self.api.user_id:
+                return web.Response(status=403, text="Forbidden")
+        try:
+            return await handler(request)
+        except TechError as err:
+            return web.Response(status=err.status_code, text=str(err.status))
+
+    async def _warm_up(self, request: web.Request) -> web.Response:
+        return web.Response()
+
+    async def _authenticate(self, request: web.Request) -> web.Response:
+        """Pass a login through, accepting the token for the proxied account.
+
+        The login is sent as a write, with its timeouts and retries; a
+        rejected login reaches the client as an error with its status.
+        """
+        self.stats["upstream"] += 1
+        result = await self.api.post(
+            AUTHENTICATION_PATH, await request.text(), ENDPOINT_WRITE
+        )
+        if result.get("authenticated") and (
+            str(result.get("user_id")) == self.api.user_id
+        ):
+            self._client_tokens.pop(result["token"], None)
+            self._client_tokens[result["token"]] = None
+            if len(self._client_tokens) > MAX_CLIENT_TOKENS:
+                del self._client_tokens[next(iter(self._client_tokens))]
+        return web.json_response(result)
+
+    async def _modules(self, request: web.Request) -> web.Response:
+        return web.json_response(
+            await self._async_cached("modules", MODULE_LIST_TTL, self.api.list_modules)
+        )
+
+    async def _module(self, request: web.Request) -> web.Response:
+        udid = request.match_info["udid"]
+        return web.json_response(
+            await self._async_cached(
+                "module:" + udid,
+                self.interval,
+                lambda: self.api.get_module_data(udid),
+            )
+        )
+
+    async def _zones(self, request: web.Request) -> web.Response:
+        """Pass a zone write through and drop the module's cached data."""
+        udid = request.match_info["udid"]
+        self.stats["writes"] += 1
+        self.stats["upstream"] += 1
+        result = await self.api.post(
+            "users/" + self.api.user_id + "/modules/" + udid + "/zones",
+            await request.text(),
+        )
+        self._cache.pop("module:" + udid, None)
+        return web.json_response(result)
+
+    async def _translations(self, request: web.Request) -> web.Response:
+        language = request.match_info["language"]
+        return web.json_response(
+            await self._async_cached(
+                "i18n:" + language,
+                TRANSLATIONS_TTL,
+                lambda: self.api.get("i18n/" + language, ENDPOINT_BULK),
+            )
+        )
+
+
+async def _async_main(args: argparse.Namespace) -> None:
+    async with aiohttp.ClientSession() as session:
+        user_id, token, credentials = args.user_id, args.token, None
+        if args.username:
+            api = Tech(session, base_url=args.upstream)
+            await api.authenticate(args.username, args.password)
+            user_id, token = api.user_id, api.token
+            credentials = (args.username, args.password)
+        proxy = TechProxy(
+            session, user_id, token, args.upstream, args.interval, credentials
+        )
+        runner = web.AppRunner(proxy.application())
+        await runner.setup()
+        await web.TCPSite(runner, args.host, args.port).start()
+        _LOGGER.info(
+            "Serving the Tech API of user %s on http://%s:%s%s",
+            user_id,
+            args.host,
+            args.port,
+            API_PREFIX,
+        )
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await runner.cleanup()
+
+
+def main() -> None:
+    """Run the proxy from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument("--upstream", default=Tech.TECH_API_URL)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--interval", type=float, default=DEFAULT_INTERVAL)
+    parser.add_argument("--username")
+    parser.add_argument("--password")
+    parser.add_argument("--user-id")
+    parser.add_argument("--token")
+    args = parser.parse_args()
+    if not args.username and not (args.user_id and args.token):
+        parser.error("either --username/--password or --user-id/--token is required")
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_async_main(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Poll phase assignment for the coordinators of a Tech account."""
+import logging
+
+from homeassistant.core import callback
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class PollScheduler:
+    """Spread the polls of an account's coordinators evenly over the interval.
+
+    Every member gets a phase: the i-th of n members (ordered by key) polls
+    at i/n of the interval, measured on the event loop clock. Polls are
+    scheduled on their phase rather than relative to the previous poll, so
+    members set up together do not stay aligned and a slow or failed poll
+    does not shift the schedule. Keys are stable across reloads, so a
+    reloaded entry gets its old phase back.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the scheduler without members."""
+        self._members: dict = {}
+
+    def __len__(self) -> int:
+        """Return the number of members."""
+        return len(self._members)
+
+    @callback
+    def async_register(self, key: str, coordinator) -> None:
+        """Add a coordinator and rebalance the phases."""
+        self._members[key] = coordinator
+        self._async_rebalance()
+
+    @callback
+    def async_unregister(self, key: str) -> None:
+        """Remove a coordinator and rebalance the phases."""
+        self._members.pop(key, None)
+        self._async_rebalance()
+
+    @callback
+    def _async_rebalance(self) -> None:
+        """Move the already scheduled polls to their new phases."""
+        for coordinator in self._members.values():
+            coordinator.async_reschedule()
+
+    def phase(self, key: str, interval: float) -> float:
+        """Return the offset of a member's polls within the interval."""
+        index = sorted(self._members).index(key)
+        return index * interval / len(self._members)
+
+    def next_refresh(self, key: str, interval: float, now: float) -> float:
+        """Return the loop time of a member's next poll.
+
+        The next poll is at least half an interval away, so that a refresh
+        requested just before a phase does not lead to two polls in a row.
+        """
+        phase = self.phase(key, interval)
+        next_refresh = now - (now - phase) % interval + interval
+        if next_refresh - now < interval / 2:
+            next_refresh += interval
+        return next_refresh
+
+    def as_dict(self, interval: float) -> dict:
+        """Return the phase assignment for diagnostics."""
+        return {
+            "members": len(self._members),
+            "phases_s": [
+                round(self.phase(key, interval), 1) for key in sorted(self._members)
+            ],
+        }
@@ -4,8 +4,10 @@ import logging
 from typing import Any, Dict
 
 from homeassistant.components.sensor import (
+    DOMAIN as SENSOR_DOMAIN,
     SensorDeviceClass,
     SensorEntity,
+    SensorEntityDescription,
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
@@ -22,16 +24,36 @@ from homeassistant.const import (
     PERCENTAGE,
     STATE_OFF,
     STATE_ON,
+    EntityCategory,
     UnitOfTemperature,
+    UnitOfTime,
 )
 from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr, entity_registry as er
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from . import TechCoordinator, assets
+from . import TechCoordinator, assets, async_get_controller_coordinators
+from .accumulators import RELAY_TILE_TYPES, tile_key, zone_key
+from .aggregates import (
+    AVERAGE_TEMPERATURE,
+    MAX_TEMPERATURE,
+    MAX_VALVE_OPENING,
+    MIN_BATTERY,
+    MIN_TEMPERATURE,
+    ZONES_BELOW_SETPOINT,
+    ZONES_HEATING,
+    supported_aggregates,
+)
 from .const import (
-    CONTROLLER,
+    CONF_BINARY_SENSORS,
+    CONF_HUMIDITY_DEADBAND,
+    CONF_TEMPERATURE_DEADBAND,
+    CONF_TILE_TYPES,
+    CONF_VALVE_DEADBAND,
+    CONF_ZONE_SENSORS,
     DOMAIN,
     MANUFACTURER,
+    TILE_SENSOR_TYPES,
     TYPE_FAN,
     TYPE_FUEL_SUPPLY,
     TYPE_MIXING_VALVE,
@@ -41,34 +63,96 @@ from .const import (
     TYPE_VALVE,
     UDID,
     VALUE,
+    VALVE_SENSOR_CURRENT_TEMPERATURE,
+    VALVE_SENSOR_RETURN_TEMPERATURE,
     VER,
     VISIBILITY,
 )
-from .entity import TileEntity
+from .devices import controller_device_info, zone_device_info
+from .entity import FilteredStateMixin, TileEntity
+from .filters import HUMIDITY_FILTER, TEMPERATURE_FILTER, VALVE_FILTER
 
 _LOGGER = logging.getLogger(__name__)
 
+AGGREGATE_SENSORS = (
+    SensorEntityDescription(
+        key=AVERAGE_TEMPERATURE,
+        name="average temperature",
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        device_class=SensorDeviceClass.TEMPERATURE,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    SensorEntityDescription(
+        key=MIN_TEMPERATURE,
+        name="minimum temperature",
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        device_class=SensorDeviceClass.TEMPERATURE,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    SensorEntityDescription(
+        key=MAX_TEMPERATURE,
+        name="maximum temperature",
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        device_class=SensorDeviceClass.TEMPERATURE,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    SensorEntityDescription(
+        key=ZONES_HEATING,
+        name="zones heating",
+        icon="mdi:radiator",
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    SensorEntityDescription(
+        key=ZONES_BELOW_SETPOINT,
+        name="zones below setpoint",
+        icon="mdi:thermometer-chevron-down",
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    SensorEntityDescription(
+        key=MAX_VALVE_OPENING,
+        name="maximum valve opening",
+        icon="mdi:valve",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    SensorEntityDescription(
+        key=MIN_BATTERY,
+        name="lowest battery",
+        native_unit_of_measurement=PERCENTAGE,
+        device_class=SensorDeviceClass.BATTERY,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+)
+
 
 async def async_setup_entry(
     hass: HomeAssistant, config_entry: ConfigEntry, async_add_entities
 ) -> None:
     """Set up entry."""
-    _LOGGER.debug(
-        "Setting up sensor entry, controller udid: %s",
-        config_entry.data[CONTROLLER][UDID],
-    )
-    coordinator = hass.data[DOMAIN][config_entry.entry_id]
-    controller_udid = config_entry.data[CONTROLLER][UDID]
+    for coordinator in async_get_controller_coordinators(hass, config_entry):
+        await _async_setup_controller(coordinator, config_entry, async_add_entities)
+
+
+async def _async_setup_controller(
+    coordinator: TechCoordinator, config_entry: ConfigEntry, async_add_entities
+) -> None:
+    """Set up the sensors of one controller."""
+    controller_udid = coordinator.controller[UDID]
+    _LOGGER.debug("Setting up sensor entry, controller udid: %s", controller_udid)
 
     zones = await coordinator.api.get_module_zones(controller_udid)
     tiles = await coordinator.api.get_module_tiles(controller_udid)
     _LOGGER.debug("Setting up sensor entry, zones: %s", zones)
     _LOGGER.debug("Setting up sensor entry, tiles: %s", tiles)
 
+    tile_types = set(config_entry.options.get(CONF_TILE_TYPES, TILE_SENSOR_TYPES))
+    _async_remove_disabled_sensors(
+        coordinator.hass, config_entry, controller_udid, zones, tiles, tile_types
+    )
     entities = []
     for t in tiles:
         tile = tiles[t]
-        if tile[VISIBILITY] is False:
+        if tile[VISIBILITY] is False or tile[CONF_TYPE] not in tile_types:
             continue
         if tile[CONF_TYPE] == TYPE_TEMPERATURE:
             entities.append(TileTemperatureSensor(tile, coordinator, controller_udid))
@@ -78,10 +162,15 @@ async def async_setup_entry(
             entities.append(TileFanSensor(tile, coordinator, controller_udid))
         if tile[CONF_TYPE] == TYPE_VALVE:
             entities.append(TileValveSensor(tile, coordinator, controller_udid))
-            # TODO: this class _init_ definition needs to be fixed. See comment below.
-            # entities.append(TileValveTemperatureSensor(tile, api, controller_udid, VALVE_SENSOR_RETURN_TEMPERATURE))
-            # entities.append(TileValveTemperatureSensor(tile, api, controller_udid, VALVE_SENSOR_SET_TEMPERATURE))
-            # entities.append(TileValveTemperatureSensor(tile, api, controller_udid, VALVE_SENSOR_CURRENT_TEMPERATURE))
+            for valve_sensor in (
+                VALVE_SENSOR_CURRENT_TEMPERATURE,
+                VALVE_SENSOR_RETURN_TEMPERATURE,
+            ):
+                entities.append(
+                    TileValveTemperatureSensor(
+                        tile, coordinator, controller_udid, valve_sensor
+                    )
+                )
         if tile[CONF_TYPE] == TYPE_MIXING_VALVE:
             entities.append(TileMixingValveSensor(tile, coordinator, controller_udid))
         if tile[CONF_TYPE] == TYPE_FUEL_SUPPLY:
@@ -99,6 +188,10 @@ async def async_setup_entry(
     #     True,
     # )
 
+    # zone sensors include the trend and heating time sensors below
+    if not config_entry.options.get(CONF_ZONE_SENSORS, True):
+        zones = {}
+
     battery_devices = map_to_battery_sensors(zones, coordinator, config_entry)
     temperature_sensors = map_to_temperature_sensors(zones, coordinator, config_entry)
     humidity_sensors = map_to_humidity_sensors(zones, coordinator, config_entry)
@@ -113,6 +206,106 @@ async def async_setup_entry(
         True,
     )
 
+    # aggregates without inputs on this controller (e.g. no valves) are skipped
+    supported = supported_aggregates(coordinator.data)
+    aggregate_sensors = [
+        ControllerAggregateSensor(coordinator, description)
+        for description in AGGREGATE_SENSORS
+        if description.key in supported
+    ]
+    coordinator.track_aggregates = bool(aggregate_sensors)
+    async_add_entities(aggregate_sensors)
+
+    async_add_entities(
+        sensor
+        for zone in zones.values()
+        if is_temperature_operating_device(zone)
+        for sensor in (
+            ZoneTrendSensor(zone, coordinator),
+            ZoneTimeToSetpointSensor(zone, coordinator),
+        )
+    )
+
+    # relays as key -> (name, device info); tiles sit on the controller device
+    relays = {}
+    for zone_id, zone in zones.items():
+        name = zone[CONF_DESCRIPTION][CONF_NAME]
+        relays[zone_key(zone_id)] = (
+            f"{name} heating",
+            zone_device_info(coordinator.controller, zone_id, name),
+        )
+    # relay tiles are binary sensors, their heating time sensors go with them
+    if not config_entry.options.get(CONF_BINARY_SENSORS, True):
+        tiles = {}
+    for tile_id, tile in tiles.items():
+        if tile[VISIBILITY] and tile[CONF_TYPE] in RELAY_TILE_TYPES:
+            txt_id = tile[CONF_PARAMS].get("txtId")
+            name = (
+                assets.get_text(txt_id)
+                if txt_id
+                else assets.get_text_by_type(tile[CONF_TYPE])
+            )
+            relays[tile_key(tile_id)] = (name, None)
+    async_add_entities(
+        sensor
+        for key, (name, device_info) in relays.items()
+        for sensor in (
+            RelayOnTimeSensor(coordinator, key, f"{name} on time", device_info),
+            RelayDutyCycleSensor(coordinator, key, f"{name} duty cycle", device_info),
+        )
+    )
+
+
+@callback
+def _async_remove_disabled_sensors(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    udid: str,
+    zones: dict,
+    tiles: dict,
+    tile_types: set[int],
+) -> None:
+    """Remove the registry entries of sensors disabled in the options.
+
+    Zone sensors are found by their zone device, tile sensors by the unique
+    id of their tile and the heating time sensors of relay tiles by their
+    key, so the sensors do not linger as unavailable entities.
+    """
+    zone_devices = set()
+    if not config_entry.options.get(CONF_ZONE_SENSORS, True):
+        device_registry = dr.async_get(hass)
+        for zone_id in zones:
+            device = device_registry.async_get_device({(DOMAIN, f"{udid}_{zone_id}")})
+            if device is not None:
+                zone_devices.add(device.id)
+    disabled_tiles = {
+        f"{udid}_{tile_id}"
+        for tile_id, tile in tiles.items()
+        if tile[CONF_TYPE] in TILE_SENSOR_TYPES and tile[CONF_TYPE] not in tile_types
+    }
+    relay_prefix = (
+        None if config_entry.options.get(CONF_BINARY_SENSORS, True) else f"{udid}_tile_"
+    )
+    if not zone_devices and not disabled_tiles and relay_prefix is None:
+        return
+
+    valve_keys = {
+        VALVE_SENSOR_CURRENT_TEMPERATURE["state_key"],
+        VALVE_SENSOR_RETURN_TEMPERATURE["state_key"],
+    }
+    entity_registry = er.async_get(hass)
+    for entity in er.async_entries_for_config_entry(
+        entity_registry, config_entry.entry_id
+    ):
+        tile, _, key = entity.unique_id.rpartition("_")
+        if entity.domain == SENSOR_DOMAIN and (
+            entity.device_id in zone_devices
+            or entity.unique_id in disabled_tiles
+            or (tile in disabled_tiles and key in valve_keys)
+            or (relay_prefix and entity.unique_id.startswith(relay_prefix))
+        ):
+            entity_registry.async_remove(entity.entity_id)
+
 
 def map_to_battery_sensors(zones, coordinator, config_entry):
     """Map the battery-operating devices in the zones to TechBatterySensor objects.
@@ -263,6 +456,165 @@ def is_outside_temperature_tile(device) -> bool:
     return device[CONF_PARAMS][CONF_DESCRIPTION] == "Temperature sensor"
 
 
+class ControllerSensor(CoordinatorEntity, SensorEntity):
+    """Representation of a value the coordinator derives from each poll.
+
+    The state is written only when the value or the availability changes.
+    """
+
+    def __init__(
+        self,
+        coordinator: TechCoordinator,
+        unique_id: str,
+        name: str,
+        device_info: dict | None = None,
+    ):
+        """Initialize the sensor, on the controller device unless given another."""
+        super().__init__(coordinator)
+        self._attr_unique_id = f"{coordinator.controller[UDID]}_{unique_id}"
+        self._attr_name = name
+        self._attr_device_info = device_info or controller_device_info(
+            coordinator.controller
+        )
+        self._attr_native_value = self.get_value()
+        self._written_available = True
+
+    def get_value(self):
+        """Return the current value from the coordinator."""
+        raise NotImplementedError
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state if the value or the availability changed."""
+        value = self.get_value()
+        available = self.available
+        if value == self._attr_native_value and available == self._written_available:
+            return
+        self._attr_native_value = value
+        self._written_available = available
+        self.async_write_ha_state()
+
+
+class ControllerAggregateSensor(ControllerSensor):
+    """Representation of an aggregate over all zones or tiles of a controller."""
+
+    def __init__(
+        self, coordinator: TechCoordinator, description: SensorEntityDescription
+    ):
+        """Initialize the aggregate sensor."""
+        self.entity_description = description
+        super().__init__(
+            coordinator,
+            description.key,
+            f"{coordinator.controller[CONF_NAME]} {description.name}",
+        )
+
+    def get_value(self):
+        """Return the aggregate computed at the last poll."""
+        return self.coordinator.aggregates.get(self.entity_description.key)
+
+
+class RelayOnTimeSensor(ControllerSensor):
+    """Representation of the accumulated on-time of a relay."""
+
+    _attr_native_unit_of_measurement = UnitOfTime.HOURS
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+
+    def __init__(
+        self,
+        coordinator: TechCoordinator,
+        key: str,
+        name: str,
+        device_info: dict | None = None,
+    ):
+        """Initialize the on-time sensor of a relay."""
+        self._key = key
+        super().__init__(coordinator, f"{key}_on_time", name, device_info)
+
+    def get_value(self):
+        """Return the on-time in hours."""
+        return self.coordinator.on_time.on_time(self._key)
+
+
+class RelayDutyCycleSensor(ControllerSensor):
+    """Representation of the recent duty cycle of a relay."""
+
+    _attr_native_unit_of_measurement = PERCENTAGE
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_icon = "mdi:percent-circle"
+
+    def __init__(
+        self,
+        coordinator: TechCoordinator,
+        key: str,
+        name: str,
+        device_info: dict | None = None,
+    ):
+        """Initialize the duty cycle sensor of a relay."""
+        self._key = key
+        super().__init__(coordinator, f"{key}_duty_cycle", name, device_info)
+
+    def get_value(self):
+        """Return the duty cycle in percent."""
+        return self.coordinator.on_time.duty_cycle(self._key)
+
+
+class ZoneTrendSensor(ControllerSensor):
+    """Representation of the temperature trend of a zone."""
+
+    _attr_native_unit_of_measurement = "°C/h"
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_suggested_display_precision = 2
+    _attr_icon = "mdi:thermometer-chevron-up"
+
+    def __init__(self, zone, coordinator: TechCoordinator):
+        """Initialize the trend sensor of a zone."""
+        self._id = zone[CONF_ZONE][CONF_ID]
+        name = zone[CONF_DESCRIPTION][CONF_NAME]
+        super().__init__(
+            coordinator,
+            f"zone_{self._id}_temperature_trend",
+            f"{name} temperature trend",
+            zone_device_info(coordinator.controller, self._id, name),
+        )
+
+    def get_value(self):
+        """Return the trend over the recent readings in °C/h."""
+        trend = self.coordinator.trends.get(self._id)
+        rate = trend.rate if trend is not None else None
+        return round(rate, 2) if rate is not None else None
+
+
+class ZoneTimeToSetpointSensor(ControllerSensor):
+    """Representation of the estimated time until a zone reaches its setpoint."""
+
+    _attr_native_unit_of_measurement = UnitOfTime.MINUTES
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_icon = "mdi:timer-outline"
+
+    def __init__(self, zone, coordinator: TechCoordinator):
+        """Initialize the time to setpoint sensor of a zone."""
+        self._id = zone[CONF_ZONE][CONF_ID]
+        name = zone[CONF_DESCRIPTION][CONF_NAME]
+        super().__init__(
+            coordinator,
+            f"zone_{self._id}_time_to_setpoint",
+            f"{name} time to setpoint",
+            zone_device_info(coordinator.controller, self._id, name),
+        )
+
+    def get_value(self):
+        """Return the minutes to the setpoint at the current trend."""
+        trend = self.coordinator.trends.get(self._id)
+        target = self.coordinator.data["zones"][self._id][CONF_ZONE]["setTemperature"]
+        if trend is None or target is None:
+            return None
+        minutes = trend.time_to(target / 10)
+        return round(minutes) if minutes is not None else None
+
+
 class TechBatterySensor(CoordinatorEntity, SensorEntity):
     """Representation of a Tech battery sensor."""
 
@@ -279,9 +631,7 @@ class TechBatterySensor(CoordinatorEntity, SensorEntity):
         self._id = device[CONF_ZONE][CONF_ID]
         self._device_name = device[CONF_DESCRIPTION][CONF_NAME]
         self._model = (
-            config_entry.data[CONTROLLER][CONF_NAME]
-            + ": "
-            + config_entry.data[CONTROLLER][VER]
+            coordinator.controller[CONF_NAME] + ": " + coordinator.controller[VER]
         )
         self._manufacturer = MANUFACTURER
         self.update_properties(device)
@@ -351,13 +701,11 @@ class TechTemperatureSensor(CoordinatorEntity, SensorEntity):
         self._coordinator = coordinator
         self._id = device[CONF_ZONE][CONF_ID]
         self._unique_id = (
-            config_entry.data[CONTROLLER][UDID] + "_" + str(device[CONF_ZONE][CONF_ID])
+            coordinator.controller[UDID] + "_" + str(device[CONF_ZONE][CONF_ID])
         )
         self._device_name = device[CONF_DESCRIPTION][CONF_NAME]
         self._model = (
-            config_entry.data[CONTROLLER][CONF_NAME]
-            + ": "
-            + config_entry.data[CONTROLLER][VER]
+            coordinator.controller[CONF_NAME] + ": " + coordinator.controller[VER]
         )
         self._manufacturer = MANUFACTURER
         self.update_properties(device)
@@ -434,16 +782,14 @@ class TechOutsideTempTile(CoordinatorEntity, SensorEntity):
         self._id = device[CONF_ID]
         self._device_name = device[CONF_DESCRIPTION][CONF_NAME]
         self._model = (
-            config_entry.data[CONTROLLER][CONF_NAME]
-            + ": "
-            + config_entry.data[CONTROLLER][VER]
+            coordinator.controller[CONF_NAME] + ": " + coordinator.controller[VER]
         )
         self._manufacturer = MANUFACTURER
         self.update_properties(device)
         _LOGGER.debug(
             "Init TechOutsideTemperatureTile...: %s, udid: %s, id: %s",
             self._name,
-            self._config_entry.data[CONTROLLER][UDID],
+            self._coordinator.controller[UDID],
             self._id,
         )
 
@@ -520,9 +866,7 @@ class TechHumiditySensor(CoordinatorEntity, SensorEntity):
         self._id = device[CONF_ZONE][CONF_ID]
         self._device_name = device[CONF_DESCRIPTION][CONF_NAME]
         self._model = (
-            config_entry.data[CONTROLLER][CONF_NAME]
-            + ": "
-            + config_entry.data[CONTROLLER][VER]
+            coordinator.controller[CONF_NAME] + ": " + coordinator.controller[VER]
         )
         self._manufacturer = MANUFACTURER
         self.update_properties(device)
@@ -594,13 +938,11 @@ class ZoneSensor(CoordinatorEntity, SensorEntity):
         self._coordinator = coordinator
         self._id = device[CONF_ZONE][CONF_ID]
         self._unique_id = (
-            config_entry.data[CONTROLLER][UDID] + "_" + str(device[CONF_ZONE][CONF_ID])
+            coordinator.controller[UDID] + "_" + str(device[CONF_ZONE][CONF_ID])
         )
         self._device_name = device[CONF_DESCRIPTION][CONF_NAME]
         self._model = (
-            config_entry.data[CONTROLLER][CONF_NAME]
-            + ": "
-            + config_entry.data[CONTROLLER][VER]
+            coordinator.controller[CONF_NAME] + ": " + coordinator.controller[VER]
         )
         self._manufacturer = MANUFACTURER
         self.update_properties(device)
@@ -644,20 +986,14 @@ class ZoneSensor(CoordinatorEntity, SensorEntity):
         dict: A dictionary containing device information.
 
         """
-        # Return device information
-        return {
-            ATTR_IDENTIFIERS: {
-                (DOMAIN, self._device_name)
-            },  # Unique identifiers for the device
-            CONF_NAME: self._device_name,  # Name of the device
-            CONF_MODEL: self._model,  # Model of the device
-            ATTR_MANUFACTURER: self._manufacturer,  # Manufacturer of the device
-        }
+        return zone_device_info(
+            self._coordinator.controller, self._id, self._device_name
+        )
 
     @property
     def unique_id(self) -> str:
         """Return a unique ID."""
-        return self._id
+        return self._unique_id
 
     @property
     def name(self):
@@ -680,7 +1016,7 @@ class ZoneTemperatureSensor(ZoneSensor):
     @property
     def unique_id(self) -> str:
         """Return a unique ID."""
-        return f"climate_{self._id}_battery"
+        return f"{self._unique_id}_temperature"
 
     def update_properties(self, device):
         """Update the properties of the TechTemperatureSensor object.
@@ -709,6 +1045,11 @@ class ZoneBatterySensor(ZoneSensor):
     _attr_device_class = SensorDeviceClass.BATTERY
     _attr_state_class = SensorStateClass.MEASUREMENT
 
+    @property
+    def unique_id(self) -> str:
+        """Return a unique ID."""
+        return f"{self._unique_id}_battery"
+
     @property
     def name(self):
         """Return the name of the device."""
@@ -728,17 +1069,28 @@ class ZoneBatterySensor(ZoneSensor):
         self._attr_native_value = device[CONF_ZONE]["batteryLevel"]
 
 
-class ZoneHumiditySensor(ZoneSensor):
+class ZoneHumiditySensor(FilteredStateMixin, ZoneSensor):
     """Representation of a Zone Temperature Sensor."""
 
     _attr_native_unit_of_measurement = PERCENTAGE
     _attr_device_class = SensorDeviceClass.HUMIDITY
     _attr_state_class = SensorStateClass.MEASUREMENT
+    _write_filter_settings = HUMIDITY_FILTER
+    _deadband_option = CONF_HUMIDITY_DEADBAND
+
+    def filtered_device(self):
+        """Return the zone in the coordinator data."""
+        return self._coordinator.data["zones"][self._id]
+
+    def filtered_value(self):
+        """Return the humidity from the coordinator data."""
+        humidity = self.filtered_device()[CONF_ZONE]["humidity"]
+        return humidity if humidity != 0 else None
 
     @property
     def unique_id(self) -> str:
         """Return a unique ID."""
-        return f"climate_{self._id}_humidity"
+        return f"{self._unique_id}_humidity"
 
     @property
     def name(self):
@@ -809,10 +1161,21 @@ class TileSensor(TileEntity, CoordinatorEntity):
     def get_state(self, device):
         """Get the state of the device."""
 
+    def filtered_device(self):
+        """Return the tile in the coordinator data."""
+        return self._coordinator.data["tiles"][self._id]
+
+    def filtered_value(self):
+        """Return the state of the tile in the coordinator data."""
+        return self.get_state(self.filtered_device())
+
 
-class TileTemperatureSensor(TileSensor, SensorEntity):
+class TileTemperatureSensor(FilteredStateMixin, TileSensor, SensorEntity):
     """Representation of a Tile Temperature Sensor."""
 
+    _write_filter_settings = TEMPERATURE_FILTER
+    _deadband_option = CONF_TEMPERATURE_DEADBAND
+
     def __init__(self, device, coordinator: TechCoordinator, controller_udid):
         """Initialize the sensor."""
         TileSensor.__init__(self, device, coordinator, controller_udid)
@@ -860,6 +1223,13 @@ class TileFanSensor(TileSensor):
 class TileTextSensor(TileSensor):
     """Representation of a Tile Text Sensor."""
 
+    # status texts are rarely used, enable them in the entity settings
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    # the last statusId and its text, resolved again only when it changes
+    _status_id = None
+    _status = None
+
     def __init__(self, device, coordinator, controller_udid):
         """Initialize the sensor."""
         TileSensor.__init__(self, device, coordinator, controller_udid)
@@ -868,12 +1238,19 @@ class TileTextSensor(TileSensor):
 
     def get_state(self, device):
         """Get the state of the device."""
-        return assets.get_text(device[CONF_PARAMS]["statusId"])
+        status_id = device[CONF_PARAMS]["statusId"]
+        if status_id != self._status_id:
+            self._status_id = status_id
+            self._status = assets.get_text(status_id)
+        return self._status
 
 
-class TileWidgetSensor(TileSensor):
+class TileWidgetSensor(FilteredStateMixin, TileSensor):
     """Representation of a Tile Widget Sensor."""
 
+    _write_filter_settings = TEMPERATURE_FILTER
+    _deadband_option = CONF_TEMPERATURE_DEADBAND
+
     _attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
     _attr_device_class = SensorDeviceClass.TEMPERATURE
     _attr_state_class = SensorStateClass.MEASUREMENT
@@ -888,8 +1265,27 @@ class TileWidgetSensor(TileSensor):
         return device[CONF_PARAMS]["widget2"][VALUE] / 10
 
 
-class TileValveSensor(TileSensor, SensorEntity):
-    """Representation of a Tile Valve Sensor."""
+class TileValveSensor(FilteredStateMixin, TileSensor, SensorEntity):
+    """Representation of a Tile Valve Sensor.
+
+    The temperatures and settings in the attributes change either all the
+    time or hardly ever, so they are not recorded; the temperatures have
+    their own TileValveTemperatureSensor.
+    """
+
+    _write_filter_settings = VALVE_FILTER
+    _deadband_option = CONF_VALVE_DEADBAND
+    _unrecorded_attributes = frozenset(
+        {
+            "currentTemp",
+            "returnTemp",
+            "setTempCorrection",
+            "valvePump",
+            "boilerProtection",
+            "returnProtection",
+            "setTemp",
+        }
+    )
 
     def __init__(self, device, coordinator, controller_udid):
         """Initialize the sensor."""
@@ -900,6 +1296,7 @@ class TileValveSensor(TileSensor, SensorEntity):
         name = assets.get_text_by_type(device[CONF_TYPE])
         self._name = f"{name} {device[CONF_PARAMS]['valveNumber']}"
         self.attrs: Dict[str, Any] = {}
+        self.update_properties(device)
 
     def get_state(self, device):
         """Get the state of the device."""
@@ -908,9 +1305,7 @@ class TileValveSensor(TileSensor, SensorEntity):
     @property
     def extra_state_attributes(self) -> Dict[str, Any]:
         """Return the state attributes."""
-        attributes = {}
-        attributes.update(self.attrs)
-        return attributes
+        return self.attrs
 
     def update_properties(self, device):
         """Update the properties of the device based on the provided device information.
@@ -938,9 +1333,12 @@ class TileValveSensor(TileSensor, SensorEntity):
         self.attrs["setTemp"] = device[CONF_PARAMS]["setTemp"]
 
 
-class TileMixingValveSensor(TileSensor, SensorEntity):
+class TileMixingValveSensor(FilteredStateMixin, TileSensor, SensorEntity):
     """Representation of a Tile Mixing Valve Sensor."""
 
+    _write_filter_settings = VALVE_FILTER
+    _deadband_option = CONF_VALVE_DEADBAND
+
     _attr_native_unit_of_measurement = PERCENTAGE
     _attr_state_class = SensorStateClass.MEASUREMENT
 
@@ -958,28 +1356,24 @@ class TileMixingValveSensor(TileSensor, SensorEntity):
         return device[CONF_PARAMS]["openingPercentage"]
 
 
-# TODO: this sensor's ID assignment needs to be fixed as base on such ID
-#  tech api doesn't return value and we get KeyError
-#
-# class TileValveTemperatureSensor(TileSensor):
-#     def __init__(self, device, api, controller_udid, valve_sensor):
-#         self._state_key = valve_sensor["state_key"]
-#         sensor_name = assets.get_text(valve_sensor["txt_id"])
-#         TileSensor.__init__(self, device, api, controller_udid)
-#         self._id = f"{self._id}_{self._state_key}"
-#         name = assets.get_text_by_type(device[CONF_TYPE])
-#         self._name = f"{name} {device[CONF_PARAMS]['valveNumber']} {sensor_name}"
-
-#     @property
-#     def device_class(self):
-#         return sensor.DEVICE_CLASS_TEMPERATURE
-
-#     @property
-#     def unit_of_measurement(self):
-#         return TEMP_CELSIUS
-
-#     def get_state(self, device):
-#         state = device[CONF_PARAMS][self._state_key]
-#         if state > 100:
-#             state = state / 10
-#         return state
+class TileValveTemperatureSensor(FilteredStateMixin, TileSensor, SensorEntity):
+    """Representation of one of the temperatures measured by a valve."""
+
+    _attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
+    _attr_device_class = SensorDeviceClass.TEMPERATURE
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _write_filter_settings = TEMPERATURE_FILTER
+    _deadband_option = CONF_TEMPERATURE_DEADBAND
+
+    def __init__(self, device, coordinator, controller_udid, valve_sensor):
+        """Initialize the sensor."""
+        self._state_key = valve_sensor["state_key"]
+        TileSensor.__init__(self, device, coordinator, controller_udid)
+        self._unique_id = f"{self._unique_id}_{self._state_key}"
+        name = assets.get_text_by_type(device[CONF_TYPE])
+        sensor_name = assets.get_text(valve_sensor["txt_id"])
+        self._name = f"{name} {device[CONF_PARAMS]['valveNumber']} {sensor_name}"
+
+    def get_state(self, device):
+        """Get the state of the device."""
+        return device[CONF_PARAMS][self._state_key] / 10
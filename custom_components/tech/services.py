@@ -0,0 +1,259 @@
+"""Services for the Tech Controllers integration."""
+import asyncio
+import logging
+
+import voluptuous as vol
+
+from homeassistant.components.climate import (
+    ATTR_HVAC_MODE,
+    DOMAIN as CLIMATE_DOMAIN,
+    HVACMode,
+)
+from homeassistant.const import ATTR_TEMPERATURE, CONF_NAME, CONF_PARAMS, CONF_TYPE
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv, entity_registry as er
+from homeassistant.helpers.service import async_extract_entity_ids
+
+from . import assets
+from .const import (
+    CONTROLLER,
+    DOMAIN,
+    MAX_PARALLEL_WRITES,
+    SERVICE_GET_SNAPSHOT,
+    SERVICE_SET_ZONES,
+    TYPE_ADDITIONAL_PUMP,
+    TYPE_FAN,
+    TYPE_FIRE_SENSOR,
+    TYPE_FUEL_SUPPLY,
+    TYPE_MIXING_VALVE,
+    TYPE_RELAY,
+    TYPE_TEMPERATURE,
+    TYPE_TEMPERATURE_CH,
+    TYPE_TEXT,
+    TYPE_VALVE,
+    UDID,
+    VALUE,
+    VISIBILITY,
+)
+from .tech import TechError
+
+_LOGGER = logging.getLogger(__name__)
+
+SET_ZONES_SCHEMA = vol.All(
+    cv.make_entity_service_schema(
+        {
+            vol.Optional(ATTR_TEMPERATURE): vol.Coerce(float),
+            vol.Optional(ATTR_HVAC_MODE): vol.In([HVACMode.HEAT, HVACMode.OFF]),
+        }
+    ),
+    cv.has_at_least_one_key(ATTR_TEMPERATURE, ATTR_HVAC_MODE),
+)
+
+GET_SNAPSHOT_SCHEMA = vol.Schema({vol.Optional(CONTROLLER): cv.string})
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the Tech services."""
+
+    async def async_set_zones(call: ServiceCall) -> ServiceResponse:
+        return await _async_set_zones(hass, call)
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SET_ZONES,
+        async_set_zones,
+        schema=SET_ZONES_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    async def async_get_snapshot(call: ServiceCall) -> ServiceResponse:
+        return _async_get_snapshot(hass, call)
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_SNAPSHOT,
+        async_get_snapshot,
+        schema=GET_SNAPSHOT_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+
+@callback
+def _async_resolve_zone(hass: HomeAssistant, entity_id: str):
+    """Return the coordinator and zone ID of a Tech climate entity.
+
+    Raises:
+    ValueError: If the entity is not a zone of a loaded Tech controller.
+
+    """
+    entry = er.async_get(hass).async_get(entity_id)
+    if entry is None or entry.platform != DOMAIN or entry.domain != CLIMATE_DOMAIN:
+        raise ValueError("not a Tech zone")
+    udid, _, zone_id = entry.unique_id.rpartition("_")
+    coordinator = hass.data[DOMAIN].get(entry.config_entry_id)
+    if coordinator is None:
+        raise ValueError("controller not loaded")
+    for controller_coordinator in coordinator.controller_coordinators:
+        if controller_coordinator.controller[UDID] == udid:
+            return controller_coordinator, int(zone_id)
+    raise ValueError("controller not loaded")
+
+
+async def _async_set_zones(hass: HomeAssistant, call: ServiceCall) -> ServiceResponse:
+    """Write the target temperature and/or mode of many zones at once.
+
+    The writes run concurrently, at most MAX_PARALLEL_WRITES at a time on top
+    of the account's request queue, and every controller written to is
+    refreshed once when all of them are done.
+    """
+    temperature = call.data.get(ATTR_TEMPERATURE)
+    hvac_mode = call.data.get(ATTR_HVAC_MODE)
+    semaphore = asyncio.Semaphore(MAX_PARALLEL_WRITES)
+    results: dict[str, dict] = {}
+    written = {}
+
+    async def _async_write(entity_id: str) -> None:
+        try:
+            coordinator, zone_id = _async_resolve_zone(hass, entity_id)
+        except ValueError as err:
+            results[entity_id] = {"success": False, "error": str(err)}
+            return
+        udid = coordinator.controller[UDID]
+        written[udid] = coordinator
+        async with semaphore:
+            try:
+                if temperature is not None:
+                    await coordinator.api.set_const_temp(udid, zone_id, temperature)
+                if hvac_mode is not None:
+                    await coordinator.api.set_zone(
+                        udid, zone_id, hvac_mode == HVACMode.HEAT
+                    )
+            except (TechError, KeyError) as err:
+                _LOGGER.warning("Unable to set zone %s: %s", entity_id, err)
+                results[entity_id] = {"success": False, "error": repr(err)}
+                return
+        results[entity_id] = {"success": True}
+
+    entity_ids = sorted(await async_extract_entity_ids(hass, call))
+    await asyncio.gather(*(_async_write(entity_id) for entity_id in entity_ids))
+    await asyncio.gather(
+        *(coordinator.async_refresh() for coordinator in written.values())
+    )
+    return {"zones": {entity_id: results[entity_id] for entity_id in entity_ids}}
+
+
+def _tenths(value):
+    """Return a value sent in tenths of a unit, scaled to the unit."""
+    return value / 10 if value is not None else None
+
+
+def _zone_snapshot(zone: dict) -> dict:
+    """Return the scaled state of a zone."""
+    state = zone["zone"]
+    humidity = state.get("humidity")
+    return {
+        "id": state["id"],
+        "name": zone["description"][CONF_NAME],
+        "hvac_mode": (
+            HVACMode.HEAT
+            if state["zoneState"] in ("zoneOn", "noAlarm")
+            else HVACMode.OFF
+        ),
+        "temperature": _tenths(state.get("currentTemperature")),
+        "target_temperature": _tenths(state.get("setTemperature")),
+        "humidity": humidity if humidity is not None and humidity >= 0 else None,
+        "battery": state.get("batteryLevel"),
+        "relay": state["flags"]["relayState"] == "on",
+    }
+
+
+def _tile_snapshot(tile: dict) -> dict:
+    """Return the scaled state of a tile, named as its entity is."""
+    params = tile[CONF_PARAMS]
+    tile_type = tile[CONF_TYPE]
+    if params.get("txtId"):
+        name = assets.get_text(params["txtId"])
+    else:
+        name = assets.get_text_by_type(tile_type)
+    snapshot = {"id": tile["id"], "type": tile_type}
+    if tile_type == TYPE_TEMPERATURE:
+        snapshot["value"] = _tenths(params[VALUE])
+    elif tile_type == TYPE_TEMPERATURE_CH:
+        name = assets.get_text(params["widget2"]["txtId"])
+        snapshot["value"] = _tenths(params["widget2"][VALUE])
+    elif tile_type in (TYPE_RELAY, TYPE_FIRE_SENSOR, TYPE_ADDITIONAL_PUMP):
+        snapshot["value"] = bool(params["workingStatus"])
+    elif tile_type == TYPE_FAN:
+        snapshot["value"] = params["gear"]
+    elif tile_type == TYPE_VALVE:
+        name = f"{name} {params['valveNumber']}"
+        snapshot["value"] = params["openingPercentage"]
+        snapshot["current_temperature"] = _tenths(params["currentTemp"])
+        snapshot["return_temperature"] = _tenths(params["returnTemp"])
+        snapshot["pump"] = params["valvePump"] == "1"
+    elif tile_type == TYPE_MIXING_VALVE:
+        name = f"{name} {params['valveNumber']}"
+        snapshot["value"] = params["openingPercentage"]
+    elif tile_type == TYPE_FUEL_SUPPLY:
+        snapshot["value"] = params["percentage"]
+    elif tile_type == TYPE_TEXT:
+        name = assets.get_text(params["headerId"])
+        snapshot["value"] = assets.get_text(params["statusId"])
+    else:
+        # tiles without an entity are listed by name only
+        snapshot["value"] = None
+    snapshot[CONF_NAME] = name
+    return snapshot
+
+
+@callback
+def _async_get_snapshot(hass: HomeAssistant, call: ServiceCall) -> ServiceResponse:
+    """Return the polled state of one or all controllers in one response.
+
+    The values come from the coordinators' last poll, scaled and named the
+    same way as the entities, so no request is sent to emodul.eu.
+
+    Raises:
+    ServiceValidationError: If the requested controller is not loaded.
+
+    """
+    wanted = call.data.get(CONTROLLER)
+    controllers = []
+    for coordinator in hass.data.get(DOMAIN, {}).values():
+        for controller_coordinator in coordinator.controller_coordinators:
+            controller = controller_coordinator.controller
+            if wanted is not None and wanted not in (
+                controller[UDID],
+                controller[CONF_NAME],
+            ):
+                continue
+            data = controller_coordinator.data
+            age = controller_coordinator.data_age
+            controllers.append(
+                {
+                    "udid": controller[UDID],
+                    CONF_NAME: controller[CONF_NAME],
+                    "age_s": round(age, 1) if age is not None else None,
+                    "stale": controller_coordinator.stale,
+                    "zones": [
+                        _zone_snapshot(zone)
+                        for zone in (data or {}).get("zones", {}).values()
+                    ],
+                    "tiles": [
+                        _tile_snapshot(tile)
+                        for tile in (data or {}).get("tiles", {}).values()
+                        if tile[VISIBILITY]
+                    ],
+                }
+            )
+    if wanted is not None and not controllers:
+        raise ServiceValidationError(f"Tech controller {wanted} is not loaded")
+    return {"controllers": controllers}
@@ -1,14 +1,184 @@
 """Python wrapper for getting interaction with Tech devices."""
 import asyncio
+import bisect
+import contextlib
+import itertools
 import json
 import logging
 import time
 
 import aiohttp
 
-logging.basicConfig(level=logging.DEBUG)
 _LOGGER = logging.getLogger(__name__)
 
+# endpoint classes, each with its own timeouts
+ENDPOINT_POLL = "poll"
+ENDPOINT_WRITE = "write"
+ENDPOINT_BULK = "bulk"
+
+# connect covers DNS, TCP and TLS; sock_read is the longest wait for the next
+# byte (the first byte of the response included); total caps the whole request
+DEFAULT_TIMEOUTS = {
+    ENDPOINT_POLL: aiohttp.ClientTimeout(total=12, sock_connect=5, sock_read=8),
+    ENDPOINT_WRITE: aiohttp.ClientTimeout(total=15, sock_connect=5, sock_read=10),
+    ENDPOINT_BULK: aiohttp.ClientTimeout(total=45, sock_connect=5, sock_read=20),
+}
+DEFAULT_RETRIES = 1
+RETRY_BACKOFF = 0.5
+
+# request priority classes, lower values are served first
+PRIORITY_WRITE = 0
+PRIORITY_CONFIRM = 1
+PRIORITY_POLL = 2
+PRIORITY_BULK = 3
+PRIORITY_NAMES = {
+    PRIORITY_WRITE: "write",
+    PRIORITY_CONFIRM: "confirm",
+    PRIORITY_POLL: "poll",
+    PRIORITY_BULK: "bulk",
+}
+PRIORITY_BY_ENDPOINT = {
+    ENDPOINT_POLL: PRIORITY_POLL,
+    ENDPOINT_WRITE: PRIORITY_WRITE,
+    ENDPOINT_BULK: PRIORITY_BULK,
+}
+# requests in flight at once, and per priority class; polls and bulk fetches
+# can never take all slots, so a write always finds one free
+DEFAULT_QUEUE_SLOTS = 4
+DEFAULT_QUEUE_LIMITS = {
+    PRIORITY_WRITE: 4,
+    PRIORITY_CONFIRM: 2,
+    PRIORITY_POLL: 2,
+    PRIORITY_BULK: 1,
+}
+# a module read within this many seconds after a write confirms the write
+CONFIRM_WINDOW = 15
+
+AUTHENTICATION_PATH = "authentication"
+
+
+class QueueStats:
+    """Queue-wait statistics of one priority class."""
+
+    def __init__(self):
+        """Initialize the counters."""
+        self.requests = 0
+        self.wait_time = 0.0
+        self.max_wait = 0.0
+
+    def record(self, wait):
+        """Record the queue wait of one request."""
+        self.requests += 1
+        self.wait_time += wait
+        self.max_wait = max(self.max_wait, wait)
+
+    def as_dict(self) -> dict:
+        """Return the statistics for diagnostics."""
+        return {
+            "requests": self.requests,
+            "average_wait_ms": (
+                round(self.wait_time * 1000 / self.requests, 1)
+                if self.requests
+                else None
+            ),
+            "max_wait_ms": round(self.max_wait * 1000, 1),
+        }
+
+
+class RequestQueue:
+    """Priority queue bounding the concurrent requests of an account.
+
+    At most `slots` requests run at once and at most limits[priority] of
+    each priority class. When a slot frees up, the waiting request of the
+    highest priority class that is below its own limit starts next.
+    """
+
+    def __init__(self, slots=DEFAULT_QUEUE_SLOTS, limits=None):
+        """Initialize the queue.
+
+        Args:
+        slots (int): Maximum number of requests in flight.
+        limits (dict): Maximum requests in flight per priority class,
+            overriding DEFAULT_QUEUE_LIMITS.
+
+        """
+        self.slots = slots
+        self.limits = {**DEFAULT_QUEUE_LIMITS, **(limits or {})}
+        self.stats = {priority: QueueStats() for priority in PRIORITY_NAMES}
+        self._active = 0
+        self._active_by_priority = dict.fromkeys(PRIORITY_NAMES, 0)
+        self._waiters = []
+        self._sequence = itertools.count()
+
+    def _can_start(self, priority):
+        return (
+            self._active < self.slots
+            and self._active_by_priority[priority] < self.limits[priority]
+        )
+
+    def _start(self, priority):
+        self._active += 1
+        self._active_by_priority[priority] += 1
+
+    def set_poll_limit(self, max_polls):
+        """Allow up to max_polls polls at once, keeping a slot for writes."""
+        self.limits[PRIORITY_POLL] = max(1, min(max_polls, self.slots - 1))
+        self._start_waiters()
+
+    def _release(self, priority):
+        self._active -= 1
+        self._active_by_priority[priority] -= 1
+        self._start_waiters()
+
+    def _start_waiters(self):
+        for waiter in list(self._waiters):
+            if self._active >= self.slots:
+                break
+            waiter_priority, _, future = waiter
+            if not future.done() and self._can_start(waiter_priority):
+                self._waiters.remove(waiter)
+                self._start(waiter_priority)
+                future.set_result(None)
+
+    @contextlib.asynccontextmanager
+    async def slot(self, priority):
+        """Wait for a free slot for a request of the given priority class."""
+        started = time.monotonic()
+        if self._can_start(priority) and not any(
+            waiter[0] <= priority for waiter in self._waiters
+        ):
+            self._start(priority)
+        else:
+            future = asyncio.get_running_loop().create_future()
+            waiter = (priority, next(self._sequence), future)
+            bisect.insort(self._waiters, waiter)
+            try:
+                await future
+            except asyncio.CancelledError:
+                if future.done() and not future.cancelled():
+                    # the slot was granted just before the cancellation
+                    self._release(priority)
+                else:
+                    self._waiters.remove(waiter)
+                raise
+        self.stats[priority].record(time.monotonic() - started)
+        try:
+            yield
+        finally:
+            self._release(priority)
+
+    def as_dict(self) -> dict:
+        """Return the queue state and wait statistics for diagnostics."""
+        return {
+            name: {
+                **self.stats[priority].as_dict(),
+                "limit": self.limits[priority],
+                "active": self._active_by_priority[priority],
+                "queued": sum(1 for waiter in self._waiters if waiter[0] == priority),
+            }
+            for priority, name in PRIORITY_NAMES.items()
+        }
+
 
 class Tech:
     """Main class to perform Tech API requests."""
@@ -22,6 +192,12 @@ class Tech:
         token=None,
         base_url=TECH_API_URL,
         # update_interval=130,
+        recorder=None,
+        timeouts=None,
+        retries=DEFAULT_RETRIES,
+        queue=None,
+        retry_backoff=RETRY_BACKOFF,
+        credentials=None,
     ):
         """Initialize the Tech object.
 
@@ -31,6 +207,15 @@ class Tech:
         token (str): The authentication token.
         base_url (str): The base URL for the API.
         update_interval (int): The interval for updates in seconds.
+        recorder (PayloadRecorder): Optional recorder of raw API responses.
+        timeouts (dict): aiohttp.ClientTimeout per endpoint class, overriding
+            DEFAULT_TIMEOUTS.
+        retries (int): Retries of a request that timed out or lost its connection.
+        queue (RequestQueue): Request queue shared by the clients of an account.
+        retry_backoff (float): Seconds to wait before the first retry, growing
+            linearly with every further retry.
+        credentials (tuple): Username and password to authenticate with again
+            when the token is rejected.
 
         """
         _LOGGER.debug("Init Tech")
@@ -44,61 +229,222 @@ class Tech:
             self.headers.setdefault("Authorization", "Bearer " + token)
             self.authenticated = True
         else:
+            self.user_id = None
+            self.token = None
             self.authenticated = False
         self.last_update = None
         self.update_lock = asyncio.Lock()
         self.modules = {}
+        self.recorder = recorder
+        self.timeouts = {**DEFAULT_TIMEOUTS, **(timeouts or {})}
+        self.retries = retries
+        self.retry_backoff = retry_backoff
+        self.queue = queue if queue is not None else RequestQueue()
+        self._confirm_until = {}
+        self.credentials = credentials
+        self.token_renewals = 0
+        self._renew_lock = asyncio.Lock()
         # self.zones = {}
         # self.tiles = {}
 
-    async def get(self, request_path):
+    def set_total_timeout(self, endpoint, total):
+        """Set the total timeout of an endpoint class.
+
+        The connect and read timeouts stay at their defaults unless longer
+        than the new total.
+
+        Args:
+        endpoint (str): Endpoint class whose timeouts to change.
+        total (float): Total timeout of a request in seconds.
+
+        """
+        default = DEFAULT_TIMEOUTS[endpoint]
+        self.timeouts[endpoint] = aiohttp.ClientTimeout(
+            total=total,
+            sock_connect=min(default.sock_connect, total),
+            sock_read=min(default.sock_read, total),
+        )
+
+    async def get(self, request_path, endpoint=ENDPOINT_POLL, priority=None):
         """Perform a GET request to the specified request path.
 
         Args:
         request_path (str): The path to send the GET request to.
+        endpoint (str): Endpoint class selecting the timeouts to apply.
+        priority (int): Queue priority class, by default that of the endpoint.
 
         Returns:
         dict: The JSON response data.
 
         Raises:
-        TechError: If the response status is not 200.
+        TechError: If the response status is not 200 or the request timed out.
 
         """
-        url = self.base_url + request_path
-        _LOGGER.debug("Sending GET request: %s", url)
-        async with self.session.get(url, headers=self.headers) as response:
-            if response.status != 200:
-                _LOGGER.warning("Invalid response from Tech API: %s", response.status)
-                raise TechError(response.status, await response.text())
-
-            data = await response.json()
-            return data
+        return await self._request("GET", request_path, endpoint, priority=priority)
 
-    async def post(self, request_path, post_data):
+    async def post(
+        self, request_path, post_data, endpoint=ENDPOINT_WRITE, priority=None
+    ):
         """Send a POST request to the specified URL with the given data.
 
         Args:
         request_path: The path for the request.
         post_data: The data to be sent with the request.
+        endpoint (str): Endpoint class selecting the timeouts to apply.
+        priority (int): Queue priority class, by default that of the endpoint.
 
         Returns:
         The JSON response from the request.
 
         Raises:
-        TechError: If the response status is not 200.
+        TechError: If the response status is not 200 or the request timed out.
+
+        """
+        return await self._request(
+            "POST", request_path, endpoint, post_data, priority=priority
+        )
+
+    async def _request(
+        self, method, request_path, endpoint, post_data=None, priority=None
+    ):
+        """Send a request, renewing an expired token once.
+
+        A request rejected with 401 authenticates again with the stored
+        credentials and is sent once more. Requests failing at the same
+        time wait for the same renewal. Without credentials, or when the
+        renewed token is rejected too, TechLoginError is raised.
+        """
+        token = self.token
+        try:
+            return await self._send(method, request_path, endpoint, post_data, priority)
+        except TechError as err:
+            if err.status_code != 401 or request_path == AUTHENTICATION_PATH:
+                raise
+            if self.credentials is None:
+                raise TechLoginError(401, "Unauthorized") from err
+        await self._renew_token(token)
+        try:
+            return await self._send(method, request_path, endpoint, post_data, priority)
+        except TechError as err:
+            if err.status_code != 401:
+                raise
+            raise TechLoginError(401, "Unauthorized") from err
+
+    async def _renew_token(self, expired_token):
+        """Authenticate again unless another request already did."""
+        async with self._renew_lock:
+            if self.token != expired_token:
+                return
+            _LOGGER.info("Tech API token was rejected, authenticating again")
+            if not await self.authenticate(*self.credentials):
+                raise TechLoginError(401, "Unauthorized")
+            self.token_renewals += 1
+
+    async def _send(
+        self, method, request_path, endpoint, post_data=None, priority=None
+    ):
+        """Send a request, retrying quickly when the connection stalls.
 
+        A request that cannot connect within the connect timeout, waits
+        longer than the read timeout for the next byte, or exceeds its total
+        timeout is cancelled and retried up to self.retries times, so that a
+        hung TCP connection does not use up the caller's whole time budget.
+        Every attempt waits for a slot of its priority class in the queue.
         """
         url = self.base_url + request_path
-        _LOGGER.debug("Sending POST request: %s", url)
-        async with self.session.post(
-            url, data=post_data, headers=self.headers
-        ) as response:
-            if response.status != 200:
-                _LOGGER.warning("Invalid response from Tech API: %s", response.status)
-                raise TechError(response.status, await response.text())
+        timeout = self.timeouts[endpoint]
+        if priority is None:
+            priority = PRIORITY_BY_ENDPOINT[endpoint]
+        send = self.session.get if method == "GET" else self.session.post
+        kwargs = {"headers": self.headers, "timeout": timeout}
+        if post_data is not None:
+            kwargs["data"] = post_data
+        for attempt in range(self.retries + 1):
+            _LOGGER.debug("Sending %s request: %s", method, url)
+            started = time.monotonic()
+            try:
+                async with self.queue.slot(priority):
+                    # the time spent queued is not part of the request's latency
+                    started = time.monotonic()
+                    async with send(url, **kwargs) as response:
+                        if response.status != 200:
+                            _LOGGER.warning(
+                                "Invalid response from Tech API: %s", response.status
+                            )
+                            text = await response.text()
+                            await self._record(
+                                method,
+                                request_path,
+                                response.status,
+                                text,
+                                started,
+                                post_data,
+                            )
+                            raise TechError(response.status, text)
+
+                        data = await response.json()
+                        await self._record(
+                            method,
+                            request_path,
+                            response.status,
+                            data,
+                            started,
+                            post_data,
+                        )
+                        return data
+            except (asyncio.TimeoutError, aiohttp.ClientConnectionError) as err:
+                if attempt < self.retries:
+                    _LOGGER.debug(
+                        "%s request to %s failed after %.1f s (%s), retrying",
+                        method,
+                        request_path,
+                        time.monotonic() - started,
+                        repr(err),
+                    )
+                    await asyncio.sleep(self.retry_backoff * (attempt + 1))
+                    continue
+                _LOGGER.warning(
+                    "Tech API request %s failed: %s", request_path, repr(err)
+                )
+                raise TechError(408, f"Request failed: {err!r}") from err
 
-            data = await response.json()
-            return data
+    async def _record(
+        self, method, request_path, status, payload, started, post_data=None
+    ):
+        """Pass a response to the payload recorder, if recording is enabled."""
+        if self.recorder is None:
+            return
+        try:
+            await self.recorder.async_record(
+                method,
+                request_path,
+                status,
+                payload,
+                time.monotonic() - started,
+                post_data,
+            )
+        except OSError as err:
+            _LOGGER.warning("Unable to record Tech API payload: %s", err)
+
+    async def warm_up(self):
+        """Open a connection to the Tech API ahead of the next request.
+
+        The response itself is irrelevant: the point is to leave a kept-alive
+        connection with a completed TLS handshake in the session's pool.
+
+        Returns:
+        bool, indicating whether the API could be reached.
+
+        """
+        _LOGGER.debug("Warming up connection to %s", self.base_url)
+        try:
+            async with self.session.head(
+                self.base_url, timeout=self.timeouts[ENDPOINT_POLL]
+            ) as response:
+                return response.status < 500
+        except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+            _LOGGER.debug("Warm-up of Tech API connection failed: %s", err)
+            return False
 
     async def authenticate(self, username, password):
         """Authenticate the user with the given username and password.
@@ -111,7 +457,7 @@ class Tech:
         bool, indicating whether the user was authenticated successfully
 
         """
-        path = "authentication"
+        path = AUTHENTICATION_PATH
         post_data = '{"username": "' + username + '", "password": "' + password + '"}'
         try:
             result = await self.post(path, post_data)
@@ -125,6 +471,8 @@ class Tech:
                     "Authorization": "Bearer " + self.token,
                 }
         except TechError as err:
+            if err.status_code == 408:
+                raise
             raise TechLoginError(401, "Unauthorized") from err
         return result["authenticated"]
 
@@ -142,7 +490,7 @@ class Tech:
             # Construct the path for the user's modules
             path = "users/" + self.user_id + "/modules"
             # Make a GET request to retrieve the modules
-            result = await self.get(path)
+            result = await self.get(path, ENDPOINT_BULK)
         else:
             # Raise an error if the user is not authenticated
             raise TechError(401, "Unauthorized")
@@ -165,7 +513,11 @@ class Tech:
         _LOGGER.debug("Getting module data...  %s,  %s", module_udid, self.user_id)
         if self.authenticated:
             path = "users/" + self.user_id + "/modules/" + module_udid
-            result = await self.get(path)
+            # a read shortly after a write shows its result, serve it first
+            if time.monotonic() < self._confirm_until.get(module_udid, 0):
+                result = await self.get(path, priority=PRIORITY_CONFIRM)
+            else:
+                result = await self.get(path)
         else:
             raise TechError(401, "Unauthorized")
         return result
@@ -186,7 +538,7 @@ class Tech:
         _LOGGER.debug("Getting %s language.", language)
         if self.authenticated:
             path = "i18n/" + language
-            result = await self.get(path)
+            result = await self.get(path, ENDPOINT_BULK)
             # API already takes care of wrong and non-existent languages by returning "en"
         else:
             raise TechError(401, "Unauthorized")
@@ -371,6 +723,7 @@ class Tech:
             }
             _LOGGER.debug(data)
             result = await self.post(path, json.dumps(data))
+            self._confirm_until[module_udid] = time.monotonic() + CONFIRM_WINDOW
             _LOGGER.debug(result)
         else:
             raise TechError(401, "Unauthorized")
@@ -394,6 +747,7 @@ class Tech:
             data = {"zone": {"id": zone_id, "zoneState": "zoneOn" if on else "zoneOff"}}
             _LOGGER.debug(data)
             result = await self.post(path, json.dumps(data))
+            self._confirm_until[module_udid] = time.monotonic() + CONFIRM_WINDOW
             _LOGGER.debug(result)
         else:
             raise TechError(401, "Unauthorized")
@@ -421,22 +775,11 @@ class TechError(Exception):
         self.status = status
 
 
-class TechLoginError(Exception):
-    """Raised when Tech API login fails.
+class TechLoginError(TechError):
+    """Raised when Tech API login fails or a token is rejected.
 
     Attributes:
         status_code - error code returned by Tech API
         status - more detailed description
 
     """
-
-    def __init__(self, status_code, status):
-        """Initialize the status code and status of the object.
-
-        Args:
-            status_code (int): The status code to be assigned.
-            status (str): The status to be assigned.
-
-        """
-        self.status_code = status_code
-        self.status = status
@@ -0,0 +1,105 @@
+"""Temperature trends of Tech zones from a ring buffer of recent readings."""
+from array import array
+
+# readings kept per zone, half an hour at the default poll interval
+TREND_SAMPLES = 15
+# readings needed before a trend is reported
+MIN_TREND_SAMPLES = 3
+# slower changes (°C/h) are treated as flat when estimating time to setpoint
+MIN_TREND_RATE = 0.05
+# readings this close (°C) to the target count as having reached it
+TARGET_TOLERANCE = 0.1
+
+
+class ZoneTrend:
+    """Least-squares temperature trend over a zone's recent readings.
+
+    The readings live in fixed-size arrays used as a ring buffer. The sums
+    of the regression are updated incrementally as readings are added and
+    evicted, so every poll costs the same regardless of the window size.
+    Times are kept relative to an origin that moves whenever the buffer
+    wraps around, when the sums are also recomputed from the buffer, which
+    keeps rounding errors from building up.
+    """
+
+    def __init__(self, size: int = TREND_SAMPLES) -> None:
+        """Initialize an empty buffer holding size readings."""
+        self.size = size
+        self._times = array("d", bytes(8 * size))
+        self._values = array("d", bytes(8 * size))
+        self._next = 0
+        self.count = 0
+        self._origin: float | None = None
+        self._sum_t = self._sum_y = self._sum_tt = self._sum_ty = 0.0
+
+    def push(self, timestamp: float, value: float) -> None:
+        """Add a reading, evicting the oldest one when the buffer is full."""
+        if self._origin is None:
+            self._origin = timestamp
+        t = timestamp - self._origin
+        if self.count == self.size:
+            old_t = self._times[self._next]
+            old_y = self._values[self._next]
+            self._sum_t -= old_t
+            self._sum_y -= old_y
+            self._sum_tt -= old_t * old_t
+            self._sum_ty -= old_t * old_y
+        else:
+            self.count += 1
+        self._times[self._next] = t
+        self._values[self._next] = value
+        self._sum_t += t
+        self._sum_y += value
+        self._sum_tt += t * t
+        self._sum_ty += t * value
+        self._next = (self._next + 1) % self.size
+        if self._next == 0:
+            self._rebase(t)
+
+    def _rebase(self, origin: float) -> None:
+        """Move the time origin to the latest reading and recompute the sums."""
+        self._origin += origin
+        self._sum_t = self._sum_y = self._sum_tt = self._sum_ty = 0.0
+        for i in range(self.count):
+            t = self._times[i] - origin
+            self._times[i] = t
+            self._sum_t += t
+            self._sum_y += self._values[i]
+            self._sum_tt += t * t
+            self._sum_ty += t * self._values[i]
+
+    @property
+    def latest(self) -> float | None:
+        """Return the latest reading."""
+        if self.count == 0:
+            return None
+        return self._values[(self._next - 1) % self.size]
+
+    @property
+    def rate(self) -> float | None:
+        """Return the trend in units per hour, None with too few readings."""
+        if self.count < MIN_TREND_SAMPLES:
+            return None
+        n = self.count
+        denominator = n * self._sum_tt - self._sum_t * self._sum_t
+        if denominator <= 0:
+            return None
+        slope = (n * self._sum_ty - self._sum_t * self._sum_y) / denominator
+        return slope * 3600
+
+    def time_to(self, target: float) -> float | None:
+        """Return the estimated minutes until the readings reach target.
+
+        0 once the latest reading is within TARGET_TOLERANCE of target,
+        None while the trend is flat or heading away from it.
+        """
+        rate = self.rate
+        latest = self.latest
+        if rate is None or latest is None:
+            return None
+        remaining = target - latest
+        if abs(remaining) <= TARGET_TOLERANCE:
+            return 0.0
+        if abs(rate) < MIN_TREND_RATE or (remaining > 0) != (rate > 0):
+            return None
+        return remaining / rate * 60
@@ -0,0 +1 @@
+"""Tests for the Tech Controllers integration."""
@@ -0,0 +1,144 @@
+"""Record/replay of Tech API traffic at the aiohttp session level.
+
+A CassetteSession stands in for aiohttp.ClientSession. In record mode it
+forwards every request to a real server (the local fake emodul stand-in),
+rewriting the emodul.eu base URL, and stores the exchanges in a JSON
+cassette. In replay mode it answers from the cassette only, so the tests
+are deterministic and never touch the network.
+
+Set TECH_CASSETTE_RECORD=1 to re-record the cassettes.
+"""
+from collections import defaultdict, deque
+import json
+import os
+from pathlib import Path
+import time
+
+from custom_components.tech.tech import Tech
+
+CASSETTES = Path(__file__).parent / "cassettes"
+RECORD = os.environ.get("TECH_CASSETTE_RECORD") == "1"
+
+
+class CassetteError(AssertionError):
+    """Raised when a request is not found in the cassette."""
+
+
+class _Response:
+    """Response replayed from a cassette interaction."""
+
+    def __init__(self, interaction: dict) -> None:
+        self.status = interaction["status"]
+        self._body = interaction["body"]
+
+    async def json(self):
+        return json.loads(self._body)
+
+    async def text(self):
+        return self._body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return None
+
+
+class _Request:
+    """Awaitable context manager issuing one cassette request."""
+
+    def __init__(self, session: "CassetteSession", method, url, data, headers):
+        self._session = session
+        self._args = (method, url, data, headers)
+        self._started = 0.0
+
+    async def __aenter__(self):
+        self._started = time.perf_counter()
+        return await self._session.request(*self._args)
+
+    async def __aexit__(self, *args):
+        self._session.latencies.append(time.perf_counter() - self._started)
+
+
+class CassetteSession:
+    """aiohttp.ClientSession stand-in recording or replaying interactions."""
+
+    def __init__(self, path: Path, upstream=None, upstream_url: str | None = None):
+        """Initialize the session.
+
+        Args:
+        path: Cassette file.
+        upstream: Real aiohttp session used in record mode.
+        upstream_url: Base URL of the stand-in server in record mode.
+
+        """
+        self.path = path
+        self.upstream = upstream
+        self.upstream_url = upstream_url
+        self.interactions: list[dict] = []
+        self.served: list[dict] = []
+        self.requests: list[tuple[str, str]] = []
+        self.latencies: list[float] = []
+        self._replay = defaultdict(deque)
+        if upstream is None:
+            if not path.exists():
+                raise CassetteError(
+                    f"Missing cassette {path.name}, record it with TECH_CASSETTE_RECORD=1"
+                )
+            for interaction in json.loads(path.read_text(encoding="utf-8")):
+                self._replay[self._key(interaction)].append(interaction)
+
+    @staticmethod
+    def _key(interaction: dict) -> tuple:
+        return interaction["method"], interaction["path"], interaction["data"]
+
+    def request_count(self, method: str | None = None, path: str | None = None) -> int:
+        """Return the number of requests issued, optionally filtered."""
+        return sum(
+            1
+            for req_method, req_path in self.requests
+            if method in (None, req_method) and path in (None, req_path)
+        )
+
+    def interactions_for(self, method: str, path: str) -> list[dict]:
+        """Return the interactions served for method and path, in order."""
+        return [
+            interaction
+            for interaction in self.served
+            if interaction["method"] == method and interaction["path"] == path
+        ]
+
+    async def request(self, method: str, url: str, data, headers=None) -> _Response:
+        """Issue a request against the upstream or the cassette."""
+        path = url.removeprefix(Tech.TECH_API_URL)
+        self.requests.append((method, path))
+        interaction = {"method": method, "path": path, "data": data}
+        if self.upstream is not None:
+            async with self.upstream.request(
+                method, self.upstream_url + path, data=data, headers=headers
+            ) as response:
+                interaction["status"] = response.status
+                interaction["body"] = await response.text()
+            self.interactions.append(interaction)
+        else:
+            recorded = self._replay.get(self._key(interaction))
+            if not recorded:
+                raise CassetteError(f"Unexpected request {method} {path} {data}")
+            interaction = recorded.popleft()
+        self.served.append(interaction)
+        return _Response(interaction)
+
+    def get(self, url, headers=None, **kwargs) -> _Request:
+        """Issue a GET request."""
+        return _Request(self, "GET", url, None, headers)
+
+    def post(self, url, data=None, headers=None, **kwargs) -> _Request:
+        """Issue a POST request."""
+        return _Request(self, "POST", url, data, headers)
+
+    def save(self) -> None:
+        """Write the recorded interactions to the cassette file."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(
+            json.dumps(self.interactions, indent=1) + "\n", encoding="utf-8"
+        )
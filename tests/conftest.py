@@ -0,0 +1,130 @@
+"""Fixtures for the Tech Controllers tests."""
+from functools import partial
+from unittest.mock import patch
+
+from aiohttp import ClientSession
+from aiohttp.test_utils import TestServer
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.tech.const import CONTROLLER, DOMAIN, UDID, USER_ID, VER
+from custom_components.tech.tech import Tech
+from homeassistant.const import CONF_NAME, CONF_TOKEN
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+
+from .cassette import CASSETTES, RECORD, CassetteSession
+from .fake_emodul import (
+    TILE_PARAMS,
+    TOKEN,
+    USER_ID as FAKE_USER_ID,
+    FakeEmodul,
+    build_controller,
+)
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations):
+    """Enable loading the integration from custom_components."""
+    return
+
+
+@pytest.fixture
+async def fake_emodul_factory(socket_enabled):
+    """Return a factory starting fake emodul servers on localhost."""
+    servers: list[TestServer] = []
+
+    async def _start(controllers=1, zones=8, tiles=16) -> tuple[FakeEmodul, str]:
+        fake = FakeEmodul(controllers=controllers, zones=zones, tiles=tiles)
+        server = TestServer(fake.application(), host="127.0.0.1")
+        await server.start_server()
+        servers.append(server)
+        return fake, str(server.make_url("/api/v1/"))
+
+    yield _start
+
+    for server in servers:
+        await server.close()
+
+
+@pytest.fixture
+async def fake_emodul(fake_emodul_factory):
+    """Start a fake emodul server and point the integration at it."""
+    fake, url = await fake_emodul_factory()
+    with patch_base_url(url):
+        yield fake
+
+
+def patch_base_url(url: str):
+    """Point every Tech client created by the integration at url."""
+    return patch("custom_components.tech.Tech", partial(Tech, base_url=url))
+
+
+def build_config_entry(controller: dict) -> MockConfigEntry:
+    """Return a version 3 config entry for the given controller."""
+    return MockConfigEntry(
+        domain=DOMAIN,
+        title=controller[CONF_NAME],
+        unique_id=controller[UDID],
+        version=3,
+        data={
+            USER_ID: FAKE_USER_ID,
+            CONF_TOKEN: TOKEN,
+            CONTROLLER: controller,
+            VER: controller[VER] + ": " + controller[CONF_NAME],
+        },
+    )
+
+
+@pytest.fixture
+async def cassette(request):
+    """Return a session replaying the cassette named after the test.
+
+    With TECH_CASSETTE_RECORD=1 the cassette is recorded against a fake
+    emodul server with two zones and one tile of every type instead.
+    """
+    path = CASSETTES / request.module.__name__.rsplit(".", 1)[-1]
+    path = path / f"{request.node.name}.json"
+    if not RECORD:
+        yield CassetteSession(path)
+        return
+
+    request.getfixturevalue("socket_enabled")
+    fake = FakeEmodul(zones=2, tiles=len(TILE_PARAMS))
+    async with TestServer(
+        fake.application(), host="127.0.0.1"
+    ) as server, ClientSession() as upstream:
+        session = CassetteSession(path, upstream, str(server.make_url("/api/v1/")))
+        yield session
+    session.save()
+
+
+@pytest.fixture
+def hass_cassette(cassette):
+    """Make the integration use the cassette session instead of HA's."""
+    with patch(
+        "custom_components.tech.async_get_clientsession", return_value=cassette
+    ), patch(
+        "custom_components.tech.config_flow.aiohttp_client.async_get_clientsession",
+        return_value=cassette,
+    ):
+        yield cassette
+
+
+async def async_init_integration(
+    hass: HomeAssistant, controller: dict | None = None, **data
+) -> MockConfigEntry:
+    """Set up one controller entry and wait for its platforms."""
+    entry = build_config_entry(controller or build_controller(0))
+    entry.add_to_hass(hass)
+    hass.config_entries.async_update_entry(entry, data={**entry.data, **data})
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    return entry
+
+
+def entity_id_for(hass: HomeAssistant, platform: str, unique_id: str) -> str:
+    """Return the entity ID registered for a unique ID."""
+    entity_id = er.async_get(hass).async_get_entity_id(platform, DOMAIN, unique_id)
+    assert entity_id is not None, unique_id
+    return entity_id
@@ -0,0 +1,224 @@
+"""Local stand-in for the emodul.eu API used by the tests and benchmarks."""
+import asyncio
+from collections import Counter
+import json
+import time
+
+from aiohttp import web
+
+USER_ID = "1234"
+TOKEN = "fake-token"
+USERNAME = "user@example.com"
+PASSWORD = "secret"
+LANGUAGE = "en"
+
+# tile type -> params generator, covering every type handled by the platforms
+TILE_PARAMS = {
+    1: lambda i: {"description": "Temperature sensor", "txtId": 0, "value": 200 + i},
+    2: lambda i: {"description": "Fire sensor", "txtId": 0, "workingStatus": i % 2},
+    6: lambda i: {
+        "description": "Central heating",
+        "txtId": 0,
+        "widget2": {"txtId": 1000 + i, "value": 450 + i},
+    },
+    11: lambda i: {
+        "description": "Relay",
+        "txtId": 1000 + i,
+        "iconId": 17,
+        "workingStatus": i % 2 == 0,
+    },
+    21: lambda i: {
+        "description": "Additional pump",
+        "txtId": 0,
+        "workingStatus": i % 2 == 1,
+    },
+    22: lambda i: {"description": "Fan", "txtId": 0, "gear": i % 5},
+    23: lambda i: {
+        "description": "Valve",
+        "txtId": 0,
+        "valveNumber": i,
+        "openingPercentage": i % 100,
+        "currentTemp": 400 + i,
+        "returnTemp": 300 + i,
+        "setTempCorrection": 0,
+        "valvePump": "1",
+        "boilerProtection": "0",
+        "returnProtection": "1",
+        "setTemp": 45,
+    },
+    24: lambda i: {
+        "description": "Mixing valve",
+        "txtId": 0,
+        "valveNumber": i,
+        "openingPercentage": (i * 7) % 100,
+    },
+    31: lambda i: {"description": "Fuel supply", "txtId": 0, "percentage": i % 100},
+    40: lambda i: {
+        "description": "Text",
+        "txtId": 0,
+        "headerId": 1000 + i,
+        "iconId": 50,
+        "statusId": 2000 + i % 10,
+    },
+    50: lambda i: {"description": "Software version", "txtId": 0, "version": "1.0"},
+}
+
+
+def build_controller(index: int) -> dict:
+    """Return a controller entry as listed by users/<id>/modules."""
+    return {
+        "id": 100 + index,
+        "udid": f"udid-{index:04d}",
+        "name": f"Controller {index}",
+        "version": "1.0.0",
+    }
+
+
+def build_zone(zone_id: int) -> dict:
+    """Return a visible, registered zone element."""
+    return {
+        "zone": {
+            "id": zone_id,
+            "visibility": True,
+            "zoneState": "zoneOn",
+            "setTemperature": 210,
+            "currentTemperature": 195 + zone_id % 20,
+            "humidity": 40 + zone_id % 30,
+            "batteryLevel": 90,
+            "flags": {"relayState": "on", "algorithm": "heating"},
+        },
+        "description": {"name": f"Zone {zone_id}"},
+        "mode": {"id": 10_000 + zone_id},
+    }
+
+
+def build_tile(tile_id: int) -> dict:
+    """Return a visible tile, cycling through the known tile types."""
+    types = list(TILE_PARAMS)
+    tile_type = types[tile_id % len(types)]
+    return {
+        "id": tile_id,
+        "type": tile_type,
+        "visibility": True,
+        "params": TILE_PARAMS[tile_type](tile_id),
+    }
+
+
+def build_module(zones: int, tiles: int) -> dict:
+    """Return a module payload as returned by users/<id>/modules/<udid>."""
+    return {
+        "zones": {"elements": [build_zone(z) for z in range(1, zones + 1)]},
+        "tiles": [build_tile(t) for t in range(1, tiles + 1)],
+    }
+
+
+def build_translations(tiles: int) -> dict:
+    """Return a language pack covering every txtId used by the fake payloads."""
+    ids = {205, 747, 961, 991, 1065, 2010, 4135, 5731}
+    ids.update(range(1000, 1001 + tiles))
+    ids.update(range(2000, 2010))
+    return {"data": {str(i): f"Text {i}" for i in sorted(ids)}}
+
+
+class FakeEmodul:
+    """In-memory emodul.eu API served by aiohttp on localhost."""
+
+    def __init__(self, controllers: int = 1, zones: int = 8, tiles: int = 16) -> None:
+        """Initialize the fake installation."""
+        self.controllers = [build_controller(i) for i in range(controllers)]
+        self.modules = {
+            controller["udid"]: build_module(zones, tiles)
+            for controller in self.controllers
+        }
+        self.translations = build_translations(tiles)
+        self.requests: Counter = Counter()
+        self.writes: list[dict] = []
+        self.delay = 0.0
+        # requests being served and the most served at once
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.stalls = 0
+        self.stall_seconds = 30.0
+        self.status_override: int | None = None
+        # the token accepted and handed out; change it to expire sessions
+        self.token = TOKEN
+        self.cpu_time = 0.0
+
+    @property
+    def total_requests(self) -> int:
+        """Return the number of requests served."""
+        return sum(self.requests.values())
+
+    def reset_stats(self) -> None:
+        """Forget the counters collected so far."""
+        self.requests.clear()
+        self.writes.clear()
+        self.cpu_time = 0.0
+        self.max_in_flight = 0
+
+    def application(self) -> web.Application:
+        """Return the aiohttp application serving the API."""
+        app = web.Application(middlewares=[self._middleware])
+        app.router.add_post("/api/v1/authentication", self._authenticate)
+        app.router.add_get("/api/v1/users/{user_id}/modules", self._list_modules)
+        app.router.add_get("/api/v1/users/{user_id}/modules/{udid}", self._module)
+        app.router.add_post("/api/v1/users/{user_id}/modules/{udid}/zones", self._zones)
+        app.router.add_get("/api/v1/i18n/{language}", self._translations)
+        return app
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler):
+        started = time.process_time()
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            resource = request.match_info.route.resource
+            self.requests[resource.canonical if resource else request.path] += 1
+            if self.stalls:
+                self.stalls -= 1
+                await asyncio.sleep(self.stall_seconds)
+            if self.delay:
+                await asyncio.sleep(self.delay)
+            if self.status_override is not None:
+                return web.Response(status=self.status_override, text="overridden")
+            if handler != self._authenticate and request.headers.get(
+                "Authorization"
+            ) != ("Bearer " + self.token):
+                return web.Response(status=401, text="Unauthorized")
+            return await handler(request)
+        finally:
+            self.in_flight -= 1
+            self.cpu_time += time.process_time() - started
+
+    async def _authenticate(self, request: web.Request) -> web.Response:
+        body = json.loads(await request.text())
+        if body.get("username") != USERNAME or body.get("password") != PASSWORD:
+            return web.json_response({"authenticated": False}, status=401)
+        return web.json_response(
+            {"authenticated": True, "user_id": int(USER_ID), "token": self.token}
+        )
+
+    async def _list_modules(self, request: web.Request) -> web.Response:
+        return web.json_response(self.controllers)
+
+    async def _module(self, request: web.Request) -> web.Response:
+        module = self.modules.get(request.match_info["udid"])
+        if module is None:
+            return web.Response(status=404, text="Not found")
+        return web.json_response(module)
+
+    async def _zones(self, request: web.Request) -> web.Response:
+        body = json.loads(await request.text())
+        self.writes.append(body)
+        module = self.modules[request.match_info["udid"]]
+        zones = {z["zone"]["id"]: z for z in module["zones"]["elements"]}
+        if "mode" in body:
+            zones[body["mode"]["parentId"]]["zone"]["setTemperature"] = body["mode"][
+                "setTemperature"
+            ]
+        if "zone" in body:
+            zones[body["zone"]["id"]]["zone"]["zoneState"] = body["zone"]["zoneState"]
+        return web.json_response({"status": "ok"})
+
+    async def _translations(self, request: web.Request) -> web.Response:
+        return web.json_response(self.translations)
@@ -0,0 +1,215 @@
+"""Tests for account entries polling all controllers together."""
+from functools import partial
+import time
+from unittest.mock import patch
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.tech import TechAccountCoordinator
+from custom_components.tech.const import (
+    ACCOUNT,
+    CONF_CONNECTION_LIMIT_PER_HOST,
+    CONF_MAX_PARALLEL_POLLS,
+    CONF_UNAVAILABLE_AFTER_FAILURES,
+    CONTROLLERS,
+    DOMAIN,
+    USER_ID,
+)
+from custom_components.tech.diagnostics import async_get_config_entry_diagnostics
+from custom_components.tech.tech import Tech
+from homeassistant import config_entries
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import (
+    CONF_PASSWORD,
+    CONF_TOKEN,
+    CONF_USERNAME,
+    STATE_UNAVAILABLE,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.data_entry_flow import FlowResultType
+
+from .conftest import entity_id_for, patch_base_url
+from .fake_emodul import PASSWORD, TOKEN, USERNAME, build_controller
+
+MODULE_ROUTE = "/api/v1/users/{user_id}/modules/{udid}"
+
+
+def build_account_entry(controllers, **options) -> MockConfigEntry:
+    """Return an account entry for the given controllers."""
+    return MockConfigEntry(
+        domain=DOMAIN,
+        version=3,
+        unique_id=f"{ACCOUNT}_{USER_ID}",
+        data={USER_ID: "1234", CONF_TOKEN: TOKEN, CONTROLLERS: controllers},
+        options=options,
+    )
+
+
+async def _setup(hass: HomeAssistant, url: str, entry: MockConfigEntry):
+    entry.add_to_hass(hass)
+    with patch_base_url(url):
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+    return hass.data[DOMAIN].get(entry.entry_id)
+
+
+async def test_account_polls_all_controllers(
+    hass: HomeAssistant, fake_emodul_factory
+) -> None:
+    """One poll refreshes every controller with bounded parallelism."""
+    fake, url = await fake_emodul_factory(controllers=3, zones=2, tiles=4)
+    entry = build_account_entry(fake.controllers, **{CONF_MAX_PARALLEL_POLLS: 1})
+    coordinator = await _setup(hass, url, entry)
+
+    assert isinstance(coordinator, TechAccountCoordinator)
+    assert len(coordinator.controller_coordinators) == 3
+    for index in range(3):
+        assert entity_id_for(hass, "climate", f"udid-{index:04d}_1")
+    assert all(
+        child.update_interval is None for child in coordinator.controller_coordinators
+    )
+
+    fake.reset_stats()
+    fake.delay = 0.05
+    started = time.monotonic()
+    await coordinator.async_refresh()
+    # one controller at a time
+    assert time.monotonic() - started >= 0.15
+    assert fake.requests[MODULE_ROUTE] == 3
+    assert fake.total_requests == 3
+    assert coordinator.data == {f"udid-{index:04d}": True for index in range(3)}
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_parallel_polls_follow_the_option(
+    hass: HomeAssistant, fake_emodul_factory
+) -> None:
+    """As many controllers are polled at once as the option and queue allow."""
+    fake, url = await fake_emodul_factory(controllers=8, zones=1, tiles=1)
+    entry = build_account_entry(
+        fake.controllers,
+        **{CONF_MAX_PARALLEL_POLLS: 6, CONF_CONNECTION_LIMIT_PER_HOST: 8},
+    )
+    coordinator = await _setup(hass, url, entry)
+
+    fake.reset_stats()
+    fake.delay = 0.05
+    await coordinator.async_refresh()
+    assert fake.max_in_flight == 6
+
+    # one slot of the queue is left for writes
+    with patch_base_url(url):
+        hass.config_entries.async_update_entry(
+            entry, options={**entry.options, CONF_CONNECTION_LIMIT_PER_HOST: 4}
+        )
+        await hass.async_block_till_done()
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    fake.reset_stats()
+    await coordinator.async_refresh()
+    assert fake.max_in_flight == 3
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_controller_failure_is_isolated(
+    hass: HomeAssistant, fake_emodul_factory
+) -> None:
+    """A failing controller only makes its own entities unavailable."""
+    fake, url = await fake_emodul_factory(controllers=2, zones=2, tiles=4)
+    entry = build_account_entry(
+        fake.controllers, **{CONF_UNAVAILABLE_AFTER_FAILURES: 1}
+    )
+    coordinator = await _setup(hass, url, entry)
+    failing = entity_id_for(hass, "climate", "udid-0001_1")
+    working = entity_id_for(hass, "climate", "udid-0000_1")
+
+    module = fake.modules.pop("udid-0001")
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert coordinator.last_update_success
+    assert hass.states.get(failing).state == STATE_UNAVAILABLE
+    assert hass.states.get(working).state != STATE_UNAVAILABLE
+    diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+    assert not diagnostics["controllers"]["udid-0001"]["last_update_success"]
+
+    fake.modules["udid-0001"] = module
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    assert hass.states.get(failing).state != STATE_UNAVAILABLE
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_unreachable_controller_is_skipped_on_setup(
+    hass: HomeAssistant, fake_emodul_factory
+) -> None:
+    """The entry loads with the controllers that could be fetched."""
+    fake, url = await fake_emodul_factory(controllers=1, zones=2, tiles=4)
+    missing = {**build_controller(1), "udid": "missing"}
+    entry = build_account_entry([*fake.controllers, missing])
+    await _setup(hass, url, entry)
+
+    assert entry.state is ConfigEntryState.LOADED
+    assert entity_id_for(hass, "climate", "udid-0000_1")
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_account_fails_when_no_controller_is_fetched(
+    hass: HomeAssistant, fake_emodul_factory
+) -> None:
+    """The setup is retried when no controller could be fetched."""
+    fake, url = await fake_emodul_factory(controllers=1, zones=2, tiles=4)
+    fake.status_override = 500
+    entry = build_account_entry(fake.controllers)
+    await _setup(hass, url, entry)
+
+    assert entry.state is ConfigEntryState.SETUP_RETRY
+
+
+async def test_config_flow_creates_account_entry(
+    hass: HomeAssistant, fake_emodul_factory
+) -> None:
+    """Selecting account mode creates one entry for all selected controllers."""
+    fake, url = await fake_emodul_factory(controllers=3, zones=2, tiles=4)
+    with patch(
+        "custom_components.tech.config_flow.Tech", partial(Tech, base_url=url)
+    ), patch("custom_components.tech.async_setup_entry", return_value=True):
+        result = await hass.config_entries.flow.async_init(
+            DOMAIN, context={"source": config_entries.SOURCE_USER}
+        )
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"], {CONF_USERNAME: USERNAME, CONF_PASSWORD: PASSWORD}
+        )
+        assert result["step_id"] == "select_controllers"
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"], {CONTROLLERS: ["100", "102"], ACCOUNT: True}
+        )
+        await hass.async_block_till_done()
+
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    entries = hass.config_entries.async_entries(DOMAIN)
+    assert len(entries) == 1
+    assert [c["udid"] for c in entries[0].data[CONTROLLERS]] == [
+        "udid-0000",
+        "udid-0002",
+    ]
+
+
+async def test_config_flow_rejects_controller_of_account_entry(
+    hass: HomeAssistant, fake_emodul_factory
+) -> None:
+    """A controller polled by an account entry cannot be added again."""
+    fake, url = await fake_emodul_factory(controllers=2, zones=2, tiles=4)
+    build_account_entry(fake.controllers[:1]).add_to_hass(hass)
+    with patch("custom_components.tech.config_flow.Tech", partial(Tech, base_url=url)):
+        result = await hass.config_entries.flow.async_init(
+            DOMAIN, context={"source": config_entries.SOURCE_USER}
+        )
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"], {CONF_USERNAME: USERNAME, CONF_PASSWORD: PASSWORD}
+        )
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"], {CONTROLLERS: ["100"]}
+        )
+
+    assert result["type"] == FlowResultType.ABORT
+    assert result["reason"] == "already_configured"
@@ -0,0 +1,79 @@
+"""Tests for the relay on-time and duty-cycle accumulators."""
+from custom_components.tech.accumulators import (
+    MAX_GAP,
+    OnTimeTracker,
+    tile_key,
+    zone_key,
+)
+from homeassistant.components.sensor import DOMAIN as SENSOR_DOMAIN
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .conftest import build_config_entry, entity_id_for, patch_base_url
+from .fake_emodul import build_module
+
+STORAGE_KEY = "tech.udid-0000.on_time"
+
+
+def _module_data(relay_on: bool) -> dict:
+    """Return module data with one zone and one relay tile."""
+    module = build_module(zones=1, tiles=3)
+    zone = module["zones"]["elements"][0]
+    zone["zone"]["flags"]["relayState"] = "on" if relay_on else "off"
+    tile = module["tiles"][2]
+    tile["params"]["workingStatus"] = relay_on
+    return {"zones": {1: zone}, "tiles": {3: tile}}
+
+
+async def test_on_time_is_credited_per_poll(hass: HomeAssistant) -> None:
+    """The interval after an 'on' poll counts, gaps and 'off' polls do not."""
+    tracker = OnTimeTracker(hass, "udid-0000")
+    tracker.async_update(_module_data(True), 0)
+    tracker.async_update(_module_data(False), 120)
+    tracker.async_update(_module_data(True), 240)
+    tracker.async_update(_module_data(True), 360)
+    # a restart or outage longer than MAX_GAP is not credited
+    tracker.async_update(_module_data(True), 360 + MAX_GAP + 1)
+
+    for key in (zone_key(1), tile_key(3)):
+        assert tracker.on_time(key) == round(240 / 3600, 3)
+        assert 0 < tracker.duty_cycle(key) < 100
+    assert tracker.on_time(zone_key(2)) is None
+
+
+async def test_counters_persist(
+    hass: HomeAssistant, hass_storage, fake_emodul_factory
+) -> None:
+    """Saved counters are restored and exposed as total_increasing sensors."""
+    now = dt_util.utcnow().timestamp()
+    hass_storage[STORAGE_KEY] = {
+        "version": 1,
+        "key": STORAGE_KEY,
+        "data": {
+            zone_key(1): {
+                "on_time": 7200.0,
+                "duty_cycle": 50.0,
+                "on": True,
+                "time": now,
+            },
+        },
+    }
+    fake, url = await fake_emodul_factory(zones=1, tiles=4)
+    entry = build_config_entry(fake.controllers[0])
+    entry.add_to_hass(hass)
+    with patch_base_url(url):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+    entity_id = entity_id_for(hass, SENSOR_DOMAIN, "udid-0000_zone_1_on_time")
+    state = hass.states.get(entity_id)
+    assert 2 <= float(state.state) < 2.1
+    assert state.attributes["state_class"] == "total_increasing"
+    assert hass.states.get(
+        entity_id_for(hass, SENSOR_DOMAIN, "udid-0000_tile_3_on_time")
+    )
+
+    # unloading writes the counters without waiting for the delayed save
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    assert hass_storage[STORAGE_KEY]["data"][zone_key(1)]["on_time"] >= 7200
+    assert tile_key(3) in hass_storage[STORAGE_KEY]["data"]
@@ -0,0 +1,164 @@
+"""Tests for the language pack index.
+
+The cost test compares the memory and lookup time of the index with the
+language pack as fetched, for a pack of TECH_TRANSLATIONS_TEXTS texts,
+e.g.::
+
+    TECH_TRANSLATIONS_TEXTS=20000 python -m pytest tests/test_assets.py \
+    -o log_cli=true --log-cli-level=INFO
+"""
+import gc
+import json
+import logging
+import os
+import random
+import time
+import tracemalloc
+
+from custom_components.tech import assets
+from custom_components.tech.const import CONF_TRIM_TRANSLATIONS, DOMAIN
+from homeassistant.core import HomeAssistant
+
+from .conftest import build_config_entry, patch_base_url
+
+_LOGGER = logging.getLogger(__name__)
+
+TEXTS = int(os.environ.get("TECH_TRANSLATIONS_TEXTS", "10000"))
+LOOKUPS = 200_000
+
+
+def _build_pack(texts: int) -> bytes:
+    """Return a language pack where some texts repeat, as in real packs."""
+    rng = random.Random(42)
+    common = [f"Common text {i}" for i in range(texts // 20)]
+    data = {
+        str(text_id): rng.choice(common) if rng.random() < 0.3 else f"Text {text_id}"
+        for text_id in range(1, texts + 1)
+    }
+    return json.dumps({"data": data}).encode()
+
+
+def _retained(factory) -> tuple[object, int]:
+    """Return the result of factory and the memory it holds on to."""
+    gc.collect()
+    tracemalloc.start()
+    result = factory()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size
+
+
+def test_build_index() -> None:
+    """Test that the index has integer keys and shares equal texts."""
+    pack = json.loads(
+        json.dumps({"data": {"0": "None", "1": "On", "2": "Off", "3": "On"}})
+    )
+
+    index = assets.build_index(pack)
+
+    assert index == {1: "On", 2: "Off", 3: "On"}
+    assert index[1] is index[3]
+    assert assets.build_index(pack, keep={2, 4}) == {2: "Off"}
+
+
+async def test_entries_share_the_language_pack(
+    hass: HomeAssistant, fake_emodul_factory
+) -> None:
+    """Test that the language pack is fetched once and trimmed on request."""
+    fake, url = await fake_emodul_factory(controllers=2, zones=2, tiles=12)
+    entries = [build_config_entry(controller) for controller in fake.controllers]
+    for entry in entries:
+        entry.add_to_hass(hass)
+        hass.config_entries.async_update_entry(
+            entry, options={CONF_TRIM_TRANSLATIONS: True}
+        )
+
+    with patch_base_url(url):
+        # sets up every entry of the integration
+        assert await hass.config_entries.async_setup(entries[0].entry_id)
+        await hass.async_block_till_done()
+
+    assert fake.requests["/api/v1/i18n/{language}"] == 1
+    coordinators = [hass.data[DOMAIN][entry.entry_id] for entry in entries]
+    referenced = assets.referenced_text_ids(c.data for c in coordinators)
+    assert set(assets.TRANSLATIONS) == referenced & set(
+        map(int, fake.translations["data"])
+    )
+    assert len(assets.TRANSLATIONS) < len(fake.translations["data"])
+    assert assets.get_text(1002) == "Text 1002"
+
+    for entry in entries:
+        assert await hass.config_entries.async_unload(entry.entry_id)
+    assert "tech_translations" not in hass.data
+
+
+async def test_trimmed_pack_follows_new_texts(
+    hass: HomeAssistant, fake_emodul_factory
+) -> None:
+    """Test that a trimmed pack is extended by texts first used after setup."""
+    fake, url = await fake_emodul_factory(zones=1, tiles=12)
+    entry = build_config_entry(fake.controllers[0])
+    entry.add_to_hass(hass)
+    hass.config_entries.async_update_entry(
+        entry, options={CONF_TRIM_TRANSLATIONS: True}
+    )
+    with patch_base_url(url):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    tile = next(t for t in fake.modules["udid-0000"]["tiles"] if t["type"] == 40)
+    status_id = next(i for i in range(2000, 2010) if i not in assets.TRANSLATIONS)
+
+    tile["params"]["statusId"] = status_id
+    await coordinator.async_refresh()
+    assert assets.get_text(status_id) == f"Text {status_id}"
+    assert fake.requests["/api/v1/i18n/{language}"] == 2
+
+    # a txtId missing from the pack is asked for once
+    tile["params"]["statusId"] = 9999
+    await coordinator.async_refresh()
+    await coordinator.async_refresh()
+    assert assets.get_text(9999) == "txtId 9999"
+    assert fake.requests["/api/v1/i18n/{language}"] == 3
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+def test_index_cost(monkeypatch, record_property) -> None:
+    """Measure the memory and lookup time of the index against the pack."""
+    raw = _build_pack(TEXTS)
+    pack, pack_bytes = _retained(lambda: json.loads(raw))
+    index, index_bytes = _retained(lambda: assets.build_index(json.loads(raw)))
+    # an installation refers to a few hundred texts
+    _, trimmed_bytes = _retained(
+        lambda: assets.build_index(json.loads(raw), keep=range(1, 301))
+    )
+    rng = random.Random(7)
+    text_ids = [rng.randint(1, TEXTS) for _ in range(LOOKUPS)]
+
+    def pack_get_text(text_id) -> str:
+        # the lookup before the index
+        if text_id != 0:
+            return pack["data"].get(str(text_id), f"txtId {text_id}")
+        return f"txtId {text_id}"
+
+    started = time.perf_counter()
+    for text_id in text_ids:
+        pack_get_text(text_id)
+    pack_seconds = time.perf_counter() - started
+    monkeypatch.setattr(assets, "TRANSLATIONS", index)
+    started = time.perf_counter()
+    for text_id in text_ids:
+        assets.get_text(text_id)
+    index_seconds = time.perf_counter() - started
+
+    report = (
+        f"{TEXTS} texts: pack {pack_bytes / 1024:.0f} KiB, "
+        f"index {index_bytes / 1024:.0f} KiB, "
+        f"trimmed to 300 texts {trimmed_bytes / 1024:.0f} KiB; {LOOKUPS} lookups: "
+        f"pack {pack_seconds * 1000:.1f} ms, index {index_seconds * 1000:.1f} ms"
+    )
+    _LOGGER.info("Tech translations: %s", report)
+    record_property("tech_translations", report)
+    assert trimmed_bytes < index_bytes < pack_bytes
+    assert index_seconds < pack_seconds
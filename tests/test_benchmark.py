@@ -0,0 +1,158 @@
+"""Setup and steady-state benchmark with many Tech config entries.
+
+Every entry is one controller served by the local fake emodul server. The
+sizes are read from the environment so that the same harness runs quickly in
+CI and at fleet scale locally, e.g.::
+
+    TECH_BENCHMARK_ENTRIES=1,8,32 TECH_BENCHMARK_ZONES=32 \
+    TECH_BENCHMARK_TILES=64 python -m pytest tests/test_benchmark.py \
+    -o log_cli=true --log-cli-level=INFO
+"""
+import asyncio
+from dataclasses import dataclass
+import logging
+import os
+import time
+import tracemalloc
+
+from custom_components.tech.const import DOMAIN
+from homeassistant.core import HomeAssistant
+
+from .conftest import build_config_entry, patch_base_url
+
+_LOGGER = logging.getLogger(__name__)
+
+ENTRIES = [int(n) for n in os.environ.get("TECH_BENCHMARK_ENTRIES", "1,2,4").split(",")]
+ZONES = int(os.environ.get("TECH_BENCHMARK_ZONES", "8"))
+TILES = int(os.environ.get("TECH_BENCHMARK_TILES", "22"))
+POLLS = int(os.environ.get("TECH_BENCHMARK_POLLS", "3"))
+
+
+@dataclass
+class BenchmarkResult:
+    """Measurements for one benchmark run."""
+
+    entries: int
+    entities: int
+    setup_seconds: float
+    setup_requests: int
+    peak_memory: int
+    poll_cpu_seconds: float
+    poll_requests: float
+
+    def per_entry(self) -> dict[str, float]:
+        """Return the measurements normalised by the number of entries."""
+        return {
+            "setup_ms": self.setup_seconds * 1000 / self.entries,
+            "setup_requests": self.setup_requests / self.entries,
+            "peak_kib": self.peak_memory / 1024 / self.entries,
+            "poll_cpu_ms": self.poll_cpu_seconds * 1000 / self.entries,
+            "poll_requests": self.poll_requests / self.entries,
+        }
+
+
+async def _setup_entries(hass: HomeAssistant, entries) -> float:
+    """Set up all entries concurrently, returning the elapsed wall time."""
+    started = time.perf_counter()
+    await asyncio.gather(
+        *(hass.config_entries.async_setup(entry.entry_id) for entry in entries)
+    )
+    await hass.async_block_till_done()
+    return time.perf_counter() - started
+
+
+async def _unload_entries(hass: HomeAssistant, entries) -> None:
+    for entry in entries:
+        await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def run_benchmark(
+    hass: HomeAssistant,
+    fake_emodul_factory,
+    entries: int,
+    zones: int = ZONES,
+    tiles: int = TILES,
+    polls: int = POLLS,
+) -> BenchmarkResult:
+    """Set up entries against a fake server and measure setup and polling.
+
+    Setup is timed on a cold start without tracing, then the entries are
+    unloaded and set up again under tracemalloc to capture peak memory. Poll
+    CPU excludes the time spent inside the fake server handlers.
+    """
+    fake, url = await fake_emodul_factory(controllers=entries, zones=zones, tiles=tiles)
+    config_entries = [build_config_entry(c) for c in fake.controllers]
+    for entry in config_entries:
+        entry.add_to_hass(hass)
+
+    with patch_base_url(url):
+        setup_seconds = await _setup_entries(hass, config_entries)
+        setup_requests = fake.total_requests
+        entities = len(hass.states.async_all())
+        await _unload_entries(hass, config_entries)
+
+        tracemalloc.start()
+        await _setup_entries(hass, config_entries)
+        _, peak_memory = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        coordinators = [hass.data[DOMAIN][entry.entry_id] for entry in config_entries]
+        fake.reset_stats()
+        cpu = 0.0
+        for _ in range(polls):
+            started = time.process_time()
+            await asyncio.gather(*(c.async_refresh() for c in coordinators))
+            await hass.async_block_till_done()
+            cpu += time.process_time() - started
+
+        result = BenchmarkResult(
+            entries=entries,
+            entities=entities,
+            setup_seconds=setup_seconds,
+            setup_requests=setup_requests,
+            peak_memory=peak_memory,
+            poll_cpu_seconds=(cpu - fake.cpu_time) / polls,
+            poll_requests=fake.total_requests / polls,
+        )
+        await _unload_entries(hass, config_entries)
+
+    return result
+
+
+def _report(results: list[BenchmarkResult]) -> str:
+    lines = [
+        "entries entities setup_ms/entry req/entry peak_kib/entry "
+        "poll_cpu_ms/entry poll_req/entry"
+    ]
+    for result in results:
+        per_entry = result.per_entry()
+        lines.append(
+            f"{result.entries:7d} {result.entities:8d} {per_entry['setup_ms']:14.1f} "
+            f"{per_entry['setup_requests']:9.1f} {per_entry['peak_kib']:14.1f} "
+            f"{per_entry['poll_cpu_ms']:17.2f} {per_entry['poll_requests']:14.1f}"
+        )
+    return "\n".join(lines)
+
+
+async def test_setup_and_polling_scale_with_entries(
+    hass: HomeAssistant, fake_emodul_factory, record_property
+) -> None:
+    """Benchmark setup and steady-state polling for a growing number of entries."""
+    logging.getLogger("custom_components.tech").setLevel(logging.INFO)
+    results = []
+    for entries in ENTRIES:
+        results.append(await run_benchmark(hass, fake_emodul_factory, entries))
+        for entry in hass.config_entries.async_entries(DOMAIN):
+            await hass.config_entries.async_remove(entry.entry_id)
+        await hass.async_block_till_done()
+
+    report = _report(results)
+    _LOGGER.info("Tech benchmark (%s zones, %s tiles):\n%s", ZONES, TILES, report)
+    record_property("tech_benchmark", report)
+
+    # Requests must grow at most linearly: the cost per entry never grows, the
+    # language pack is fetched once for all entries.
+    setup_requests = [r.per_entry()["setup_requests"] for r in results]
+    assert setup_requests == sorted(setup_requests, reverse=True)
+    assert all(r.per_entry()["poll_requests"] == 1 for r in results)
@@ -0,0 +1,23 @@
+"""Tests for the Tech binary sensor platform."""
+from homeassistant.components.binary_sensor import DOMAIN as BINARY_SENSOR_DOMAIN
+from homeassistant.const import STATE_OFF, STATE_ON
+from homeassistant.core import HomeAssistant
+
+from .cassette import CassetteSession
+from .conftest import async_init_integration, entity_id_for
+
+
+async def test_relay_sensors(hass: HomeAssistant, hass_cassette: CassetteSession):
+    """Test the binary sensors created for relay-like tiles."""
+    entry = await async_init_integration(hass)
+
+    def state(tile_id):
+        return hass.states.get(
+            entity_id_for(hass, BINARY_SENSOR_DOMAIN, f"udid-0000_{tile_id}")
+        ).state
+
+    assert state(1) == STATE_ON  # fire sensor
+    assert state(3) == STATE_OFF  # relay
+    assert state(4) == STATE_OFF  # additional pump
+    assert len(hass.states.async_entity_ids(BINARY_SENSOR_DOMAIN)) == 3
+    assert await hass.config_entries.async_unload(entry.entry_id)
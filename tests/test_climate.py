@@ -0,0 +1,77 @@
+"""Tests for the Tech climate platform."""
+import json
+
+from homeassistant.components.climate import (
+    ATTR_CURRENT_HUMIDITY,
+    ATTR_CURRENT_TEMPERATURE,
+    ATTR_HVAC_ACTION,
+    DOMAIN as CLIMATE_DOMAIN,
+    SERVICE_SET_HVAC_MODE,
+    SERVICE_SET_TEMPERATURE,
+    HVACAction,
+    HVACMode,
+)
+from homeassistant.const import ATTR_ENTITY_ID, ATTR_TEMPERATURE
+from homeassistant.core import HomeAssistant
+
+from .cassette import CassetteSession
+from .conftest import async_init_integration, entity_id_for
+from .fake_emodul import USER_ID
+
+ZONES_PATH = f"users/{USER_ID}/modules/udid-0000/zones"
+SERVICE_BUDGET = 0.25
+
+
+async def test_zone_state(hass: HomeAssistant, hass_cassette: CassetteSession):
+    """Test the climate entity created for a zone."""
+    entry = await async_init_integration(hass)
+    state = hass.states.get(entity_id_for(hass, CLIMATE_DOMAIN, "udid-0000_1"))
+
+    assert state.state == HVACMode.HEAT
+    assert state.attributes[ATTR_CURRENT_TEMPERATURE] == 19.6
+    assert state.attributes[ATTR_TEMPERATURE] == 21
+    assert state.attributes[ATTR_CURRENT_HUMIDITY] == 41
+    assert state.attributes[ATTR_HVAC_ACTION] == HVACAction.HEATING
+    assert len(hass.states.async_entity_ids(CLIMATE_DOMAIN)) == 2
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_set_temperature(hass: HomeAssistant, hass_cassette: CassetteSession):
+    """Test that setting the temperature sends one write."""
+    entry = await async_init_integration(hass)
+    entity_id = entity_id_for(hass, CLIMATE_DOMAIN, "udid-0000_1")
+    hass_cassette.latencies.clear()
+
+    await hass.services.async_call(
+        CLIMATE_DOMAIN,
+        SERVICE_SET_TEMPERATURE,
+        {ATTR_ENTITY_ID: entity_id, ATTR_TEMPERATURE: 22.5},
+        blocking=True,
+    )
+
+    writes = hass_cassette.interactions_for("POST", ZONES_PATH)
+    assert len(writes) == 1
+    assert json.loads(writes[0]["data"])["mode"]["setTemperature"] == 225
+    assert max(hass_cassette.latencies) < SERVICE_BUDGET
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_set_hvac_mode(hass: HomeAssistant, hass_cassette: CassetteSession):
+    """Test that switching a zone off and on sends one write each."""
+    entry = await async_init_integration(hass)
+    entity_id = entity_id_for(hass, CLIMATE_DOMAIN, "udid-0000_2")
+
+    for mode in (HVACMode.OFF, HVACMode.HEAT):
+        await hass.services.async_call(
+            CLIMATE_DOMAIN,
+            SERVICE_SET_HVAC_MODE,
+            {ATTR_ENTITY_ID: entity_id, "hvac_mode": mode},
+            blocking=True,
+        )
+
+    states = [
+        json.loads(write["data"])["zone"]["zoneState"]
+        for write in hass_cassette.interactions_for("POST", ZONES_PATH)
+    ]
+    assert states == ["zoneOff", "zoneOn"]
+    assert await hass.config_entries.async_unload(entry.entry_id)
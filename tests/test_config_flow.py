@@ -0,0 +1,113 @@
+"""Tests for the Tech Controllers config flow."""
+from functools import partial
+from unittest.mock import patch
+
+from custom_components.tech.const import CONTROLLERS, DOMAIN, FILTER, SELECT_ALL
+from custom_components.tech.tech import Tech
+from homeassistant import config_entries
+from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+from homeassistant.data_entry_flow import FlowResultType
+
+from .fake_emodul import PASSWORD, USERNAME
+
+
+async def _async_select_step(hass: HomeAssistant) -> dict:
+    """Sign in and return the controller selection form."""
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": config_entries.SOURCE_USER}
+    )
+    return await hass.config_entries.flow.async_configure(
+        result["flow_id"], {CONF_USERNAME: USERNAME, CONF_PASSWORD: PASSWORD}
+    )
+
+
+async def test_selected_controllers_get_entries(
+    hass: HomeAssistant, fake_emodul_factory
+) -> None:
+    """Each selected controller gets an entry with its udid as unique id."""
+    fake, url = await fake_emodul_factory(controllers=3, zones=2, tiles=4)
+    with patch(
+        "custom_components.tech.config_flow.Tech", partial(Tech, base_url=url)
+    ), patch("custom_components.tech.async_setup_entry", return_value=True):
+        result = await _async_select_step(hass)
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"], {CONTROLLERS: ["102", "100"]}
+        )
+        await hass.async_block_till_done()
+
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    assert result["title"] == "Controller 2"
+    entries = hass.config_entries.async_entries(DOMAIN)
+    assert sorted(entry.unique_id for entry in entries) == ["udid-0000", "udid-0002"]
+
+
+async def test_filter_and_select_all(hass: HomeAssistant, fake_emodul_factory) -> None:
+    """A filter narrows the list and select all imports the shown controllers."""
+    fake, url = await fake_emodul_factory(controllers=12, zones=1, tiles=1)
+    with patch(
+        "custom_components.tech.config_flow.Tech", partial(Tech, base_url=url)
+    ), patch("custom_components.tech.async_setup_entry", return_value=True):
+        result = await _async_select_step(hass)
+        assert result["description_placeholders"] == {"shown": "12", "total": "12"}
+
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"], {FILTER: "controller 1"}
+        )
+        assert result["step_id"] == "select_controllers"
+        assert result["description_placeholders"] == {"shown": "3", "total": "12"}
+
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"], {FILTER: "controller 1", SELECT_ALL: True}
+        )
+        await hass.async_block_till_done()
+
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    entries = hass.config_entries.async_entries(DOMAIN)
+    assert sorted(entry.title for entry in entries) == [
+        "Controller 1",
+        "Controller 10",
+        "Controller 11",
+    ]
+
+
+async def test_select_all_with_a_new_filter(
+    hass: HomeAssistant, fake_emodul_factory
+) -> None:
+    """Select all submitted with a new filter imports the matching controllers."""
+    fake, url = await fake_emodul_factory(controllers=12, zones=1, tiles=1)
+    with patch(
+        "custom_components.tech.config_flow.Tech", partial(Tech, base_url=url)
+    ), patch("custom_components.tech.async_setup_entry", return_value=True):
+        result = await _async_select_step(hass)
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"], {FILTER: "controller 1", SELECT_ALL: True}
+        )
+        await hass.async_block_till_done()
+
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    entries = hass.config_entries.async_entries(DOMAIN)
+    assert sorted(entry.title for entry in entries) == [
+        "Controller 1",
+        "Controller 10",
+        "Controller 11",
+    ]
+
+
+async def test_select_all_of_a_large_account(
+    hass: HomeAssistant, fake_emodul_factory
+) -> None:
+    """All controllers of a large account are imported in one submission."""
+    fake, url = await fake_emodul_factory(controllers=200, zones=1, tiles=1)
+    with patch(
+        "custom_components.tech.config_flow.Tech", partial(Tech, base_url=url)
+    ), patch("custom_components.tech.async_setup_entry", return_value=True):
+        result = await _async_select_step(hass)
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"], {SELECT_ALL: True}
+        )
+        await hass.async_block_till_done()
+
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    entries = hass.config_entries.async_entries(DOMAIN)
+    assert len({entry.unique_id for entry in entries}) == 200
@@ -0,0 +1,85 @@
+"""Tests for the dedicated, tuned connection pool."""
+from datetime import timedelta
+
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.tech.const import (
+    CONF_DEDICATED_SESSION,
+    CONF_WARM_UP_LEAD,
+    DATA_SESSIONS,
+    DOMAIN,
+    SCAN_INTERVAL,
+)
+from custom_components.tech.diagnostics import async_get_config_entry_diagnostics
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .conftest import build_config_entry, patch_base_url
+from .fake_emodul import TOKEN
+
+
+async def test_dedicated_session_reuses_connections(
+    hass: HomeAssistant, fake_emodul_factory
+) -> None:
+    """Entries of one account share a pool whose connections are reused."""
+    fake, url = await fake_emodul_factory(controllers=2, zones=2, tiles=4)
+    entries = [build_config_entry(controller) for controller in fake.controllers]
+    for entry in entries:
+        entry.options = {CONF_DEDICATED_SESSION: True, CONF_WARM_UP_LEAD: 10}
+        entry.add_to_hass(hass)
+
+    with patch_base_url(url):
+        # setting up the first entry sets up the whole domain
+        assert await hass.config_entries.async_setup(entries[0].entry_id)
+        await hass.async_block_till_done()
+        first, second = (hass.data[DOMAIN][entry.entry_id] for entry in entries)
+        assert first.api.session is second.api.session
+        assert first.connection_stats is second.connection_stats
+
+        for _ in range(3):
+            await first.async_refresh()
+        stats = first.connection_stats.as_dict()
+        assert stats["connections_reused"] > stats["connections_created"]
+        assert stats["average_connect_ms"] is not None
+
+        # the warm-up runs shortly before the next scheduled poll
+        fake.reset_stats()
+        async_fire_time_changed(
+            hass, dt_util.utcnow() + SCAN_INTERVAL - timedelta(seconds=5)
+        )
+        await hass.async_block_till_done()
+        assert stats["warm_ups"] < first.connection_stats.warm_ups
+        assert fake.requests["/api/v1/"] >= 1
+
+        diagnostics = await async_get_config_entry_diagnostics(hass, entries[0])
+        assert diagnostics["connection"]["connections_reused"] > 0
+        assert TOKEN not in str(diagnostics)
+
+        session = first.api.session
+        for entry in entries:
+            assert await hass.config_entries.async_unload(entry.entry_id)
+        await hass.async_block_till_done()
+        assert session.closed
+        assert not hass.data[DATA_SESSIONS]
+
+
+async def test_dedicated_session_closed_on_shutdown(
+    hass: HomeAssistant, fake_emodul_factory
+) -> None:
+    """The pool is closed when Home Assistant closes without unloading."""
+    fake, url = await fake_emodul_factory(zones=2, tiles=4)
+    entry = build_config_entry(fake.controllers[0])
+    entry.options = {CONF_DEDICATED_SESSION: True}
+    entry.add_to_hass(hass)
+    with patch_base_url(url):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+    session = hass.data[DOMAIN][entry.entry_id].api.session
+
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_CLOSE)
+    await hass.async_block_till_done()
+
+    assert session.closed
+    assert not hass.data[DATA_SESSIONS]
+    assert await hass.config_entries.async_unload(entry.entry_id)
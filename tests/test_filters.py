@@ -0,0 +1,79 @@
+"""Tests for the filtering of sensor state writes."""
+from custom_components.tech.const import DOMAIN
+from custom_components.tech.filters import WriteFilter
+from homeassistant.components.sensor import DOMAIN as SENSOR_DOMAIN
+from homeassistant.core import HomeAssistant
+
+from .conftest import build_config_entry, entity_id_for, patch_base_url
+
+
+def test_write_filter() -> None:
+    """Test the deadband, minimum interval and heartbeat."""
+    write_filter = WriteFilter(deadband=0.5, min_interval=60, heartbeat=600)
+    assert write_filter.should_write(20.0, 0)
+    assert not write_filter.should_write(20.0, 10)
+    # a large change within the minimum interval waits
+    assert not write_filter.should_write(25.0, 30)
+    assert write_filter.should_write(25.0, 60)
+    # jitter below the deadband is dropped until the heartbeat
+    assert not write_filter.should_write(25.3, 120)
+    assert not write_filter.should_write(24.8, 600)
+    assert write_filter.should_write(24.8, 660)
+    # values that are not numbers are written on any change
+    assert write_filter.should_write(None, 670)
+    assert write_filter.should_write(24.9, 680)
+
+
+async def test_tile_temperature_jitter_is_not_written(
+    hass: HomeAssistant, fake_emodul_factory
+) -> None:
+    """Test that a tile temperature is only written on significant changes."""
+    fake, url = await fake_emodul_factory(zones=1, tiles=11)
+    entry = build_config_entry(fake.controllers[0])
+    entry.add_to_hass(hass)
+    with patch_base_url(url):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    entity_id = entity_id_for(hass, SENSOR_DOMAIN, "udid-0000_11")
+    tile = fake.modules["udid-0000"]["tiles"][10]
+    assert hass.states.get(entity_id).state == "21.1"
+
+    tile["params"]["value"] = 212
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    assert hass.states.get(entity_id).state == "21.1"
+
+    tile["params"]["value"] = 215
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    assert hass.states.get(entity_id).state == "21.5"
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_valve_attributes_follow_filtered_updates(
+    hass: HomeAssistant, fake_emodul_factory
+) -> None:
+    """Test that a valve updates its attributes when the opening is unchanged."""
+    fake, url = await fake_emodul_factory(zones=1, tiles=11)
+    entry = build_config_entry(fake.controllers[0])
+    entry.add_to_hass(hass)
+    with patch_base_url(url):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    tile = next(t for t in fake.modules["udid-0000"]["tiles"] if t["type"] == 23)
+    entity_id = entity_id_for(hass, SENSOR_DOMAIN, f"udid-0000_{tile['id']}")
+    valve = hass.data[SENSOR_DOMAIN].get_entity(entity_id)
+    written = hass.states.get(entity_id)
+
+    tile["params"]["currentTemp"] = 520
+    tile["params"]["boilerProtection"] = "1"
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    # the opening did not change, so nothing is written
+    assert hass.states.get(entity_id) is written
+    assert valve.extra_state_attributes["currentTemp"] == 52
+    assert valve.extra_state_attributes["boilerProtection"] == "on"
+    assert await hass.config_entries.async_unload(entry.entry_id)
@@ -0,0 +1,113 @@
+"""Tests for the payload flight recorder and replay."""
+import gzip
+import json
+import os
+
+from custom_components.tech.const import CONF_RECORD_PAYLOADS, DOMAIN, RECORDINGS_DIR
+from custom_components.tech.flight_recorder import (
+    REDACTED,
+    PayloadRecorder,
+    async_replay,
+    load_recording,
+    recording_files,
+)
+from custom_components.tech.tech import Tech
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+from .conftest import build_config_entry, patch_base_url
+from .fake_emodul import PASSWORD, TOKEN, USER_ID, USERNAME
+
+
+async def test_recording_is_redacted(
+    hass: HomeAssistant, fake_emodul_factory, tmp_path
+):
+    """Credentials and the user ID never reach the recording."""
+    fake, url = await fake_emodul_factory()
+    recorder = PayloadRecorder(str(tmp_path))
+    api = Tech(async_get_clientsession(hass), base_url=url, recorder=recorder)
+    await api.authenticate(USERNAME, PASSWORD)
+    await api.list_modules()
+    await recorder.async_close()
+
+    records = await hass.async_add_executor_job(load_recording, str(tmp_path))
+    assert [r["method"] for r in records] == ["POST", "GET"]
+    assert records[0]["request"]["password"] == REDACTED
+    assert records[0]["payload"]["token"] == REDACTED
+    assert records[1]["path"] == f"users/{REDACTED}/modules"
+    raw = str(records)
+    for secret in (TOKEN, PASSWORD, USERNAME, f"users/{USER_ID}"):
+        assert secret not in raw
+
+
+async def test_rotation_respects_disk_cap(hass: HomeAssistant, tmp_path):
+    """Old files are removed once the disk cap is exceeded."""
+    recorder = PayloadRecorder(str(tmp_path), max_file_bytes=200, max_total_bytes=1000)
+    for _ in range(200):
+        await recorder.async_record(
+            "GET", "i18n/en", 200, {"data": os.urandom(64).hex()}, 0.1
+        )
+    await recorder.async_close()
+
+    files = recording_files(str(tmp_path))
+    assert len(files) > 1
+    # the last file may pass max_file_bytes by one batch of records
+    assert sum(os.path.getsize(f) for f in files) <= 1000 + 200
+    records = await hass.async_add_executor_job(load_recording, str(tmp_path))
+    assert 0 < len(records) < 200
+
+
+async def test_records_share_one_stream(hass: HomeAssistant, tmp_path):
+    """Records compress together rather than as a gzip member each."""
+    recorder = PayloadRecorder(str(tmp_path))
+    payload = {"tiles": [{"id": i, "params": {"value": 200 + i}} for i in range(32)]}
+    for _ in range(100):
+        await recorder.async_record("GET", "users/1/modules/udid", 200, payload, 0.1)
+
+    # the records are readable while the file is written
+    records = await hass.async_add_executor_job(load_recording, str(tmp_path))
+    assert records
+    await recorder.async_close()
+
+    records = await hass.async_add_executor_job(load_recording, str(tmp_path))
+    assert len(records) == 100
+    (path,) = recording_files(str(tmp_path))
+    one_record = len(gzip.compress(json.dumps(records[0]).encode()))
+    assert os.path.getsize(path) < 10 * one_record
+
+
+async def test_record_and_replay_into_coordinator(
+    hass: HomeAssistant, fake_emodul_factory, tmp_path
+) -> None:
+    """A recorded session replays into the coordinator without the network."""
+    hass.config.config_dir = str(tmp_path)
+    fake, url = await fake_emodul_factory(zones=2, tiles=4)
+    controller = fake.controllers[0]
+    entry = build_config_entry(controller)
+    entry.options = {CONF_RECORD_PAYLOADS: True}
+    entry.add_to_hass(hass)
+    with patch_base_url(url):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        coordinator = hass.data[DOMAIN][entry.entry_id]
+        module = fake.modules[controller["udid"]]
+        module["zones"]["elements"][0]["zone"]["currentTemperature"] = 250
+        await coordinator.async_refresh()
+
+    await coordinator.api.recorder.async_close()
+    directory = hass.config.path(RECORDINGS_DIR, entry.entry_id)
+    records = await hass.async_add_executor_job(load_recording, directory)
+    assert records
+
+    module["zones"]["elements"][0]["zone"]["currentTemperature"] = 100
+    fake.reset_stats()
+    polls = await async_replay(coordinator, controller["udid"], records, speed=0)
+    await hass.async_block_till_done()
+
+    assert polls >= 2
+    assert fake.total_requests == 0
+    assert coordinator.last_update_success
+    assert coordinator.data["zones"][1]["zone"]["currentTemperature"] == 250
+    assert hass.states.get("climate.zone_1").attributes["current_temperature"] == 25
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
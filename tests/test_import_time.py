@@ -0,0 +1,93 @@
+"""Import time of the integration package.
+
+The package is imported in a fresh interpreter with the parts of Home
+Assistant a running instance has already loaded, timed with
+``-X importtime``. The budget in milliseconds is read from the
+environment, e.g.::
+
+    TECH_IMPORT_BUDGET_MS=20 python -m pytest tests/test_import_time.py \
+    -o log_cli=true --log-cli-level=INFO
+"""
+import logging
+import os
+from pathlib import Path
+import subprocess
+import sys
+
+_LOGGER = logging.getLogger(__name__)
+
+ROOT = Path(__file__).parents[1]
+BUDGET_MS = float(os.environ.get("TECH_IMPORT_BUDGET_MS", "100"))
+# modules a running instance has imported before it loads an integration
+PRELOADED = (
+    "homeassistant.config_entries",
+    "homeassistant.helpers.aiohttp_client",
+    "homeassistant.helpers.config_validation",
+    "homeassistant.helpers.entity_platform",
+    "homeassistant.helpers.entity_registry",
+    "homeassistant.helpers.storage",
+    "homeassistant.helpers.update_coordinator",
+)
+# loaded only when an entry needs them
+DEFERRED = (
+    "custom_components.tech.binary_sensor",
+    "custom_components.tech.climate",
+    "custom_components.tech.flight_recorder",
+    "custom_components.tech.migration",
+    "custom_components.tech.sensor",
+    "custom_components.tech.services",
+    "homeassistant.components.climate",
+    "homeassistant.components.sensor",
+)
+IMPORT_PACKAGE = """
+import importlib, sys
+for name in sys.argv[1:]:
+    importlib.import_module(name)
+print("START", file=sys.stderr, flush=True)
+import custom_components.tech
+print(" ".join(sorted(sys.modules)))
+"""
+IMPORT_CLIENT = """
+import importlib.util, sys
+spec = importlib.util.spec_from_file_location("tech_client", sys.argv[1])
+spec.loader.exec_module(importlib.util.module_from_spec(spec))
+print(" ".join(sorted(sys.modules)))
+"""
+
+
+def _run(*args: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *args],
+        cwd=ROOT,
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+
+
+def test_package_import_time(record_property) -> None:
+    """Test that importing the package stays cheap and loads no platforms."""
+    result = _run("-X", "importtime", "-c", IMPORT_PACKAGE, *PRELOADED)
+    modules = set(result.stdout.split())
+    timings = result.stderr.split("START", 1)[1]
+    # "import time: self [us] | cumulative | module", nested imports indented
+    package = next(
+        line
+        for line in timings.splitlines()
+        if line.endswith("| custom_components.tech")
+    )
+    elapsed_ms = int(package.split("|")[1]) / 1000
+
+    _LOGGER.info("Tech package import: %.1f ms", elapsed_ms)
+    record_property("tech_import_ms", elapsed_ms)
+    assert not modules.intersection(DEFERRED)
+    assert elapsed_ms < BUDGET_MS
+
+
+def test_client_is_independent_of_home_assistant() -> None:
+    """Test that the API client imports without Home Assistant."""
+    result = _run("-c", IMPORT_CLIENT, "custom_components/tech/tech.py")
+
+    assert not any(
+        module.startswith("homeassistant") for module in result.stdout.split()
+    )
@@ -0,0 +1,153 @@
+"""Tests for the Tech Controllers setup and coordinator."""
+from functools import partial
+from unittest.mock import patch
+
+from custom_components.tech.const import BINARY_SENSOR_TILE_TYPES, DOMAIN
+from custom_components.tech.tech import Tech
+from homeassistant.config_entries import SOURCE_REAUTH, ConfigEntryState
+from homeassistant.const import CONF_PASSWORD, CONF_TOKEN, CONF_USERNAME, Platform
+from homeassistant.core import HomeAssistant
+from homeassistant.data_entry_flow import FlowResultType
+
+from .cassette import CassetteSession
+from .conftest import async_init_integration, build_config_entry, patch_base_url
+from .fake_emodul import PASSWORD, TOKEN, USER_ID, USERNAME, build_controller
+
+MODULE_PATH = f"users/{USER_ID}/modules/udid-0000"
+
+# Requests issued while setting up one entry: first refresh, language pack,
+# the module fetches done by the platforms and the refresh requested by
+# update_before_add.
+SETUP_REQUESTS = 7
+REFRESH_BUDGET = 0.25
+
+
+async def test_setup_and_unload(hass: HomeAssistant, hass_cassette: CassetteSession):
+    """Test setting up and unloading an entry."""
+    entry = await async_init_integration(hass)
+
+    assert entry.state is ConfigEntryState.LOADED
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    assert list(coordinator.data["zones"]) == [1, 2]
+    assert hass_cassette.request_count() == SETUP_REQUESTS
+    assert hass_cassette.request_count("GET", "i18n/en") == 1
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    assert entry.state is ConfigEntryState.NOT_LOADED
+    assert entry.entry_id not in hass.data[DOMAIN]
+
+
+async def test_coordinator_refresh(hass: HomeAssistant, hass_cassette: CassetteSession):
+    """Test that a poll is a single request within the latency budget."""
+    entry = await async_init_integration(hass)
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    hass_cassette.latencies.clear()
+    requests = hass_cassette.request_count()
+
+    await coordinator.async_refresh()
+
+    assert coordinator.last_update_success
+    assert hass_cassette.request_count() == requests + 1
+    assert hass_cassette.request_count("GET", MODULE_PATH) >= 1
+    assert max(hass_cassette.latencies) < REFRESH_BUDGET
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_setup_skips_platforms_without_entities(
+    hass: HomeAssistant, fake_emodul_factory
+) -> None:
+    """Test that platforms without entities are not set up."""
+    fake, url = await fake_emodul_factory(zones=0, tiles=12)
+    module = fake.modules["udid-0000"]
+    module["tiles"] = [
+        tile for tile in module["tiles"] if tile["type"] not in BINARY_SENSOR_TILE_TYPES
+    ]
+    entry = build_config_entry(fake.controllers[0])
+    entry.add_to_hass(hass)
+
+    with patch_base_url(url):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+    assert hass.data[DOMAIN][entry.entry_id].platforms == [Platform.SENSOR]
+    assert hass.states.async_entity_ids("sensor")
+    assert not hass.states.async_entity_ids("climate")
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_setup_retry_on_api_error(
+    hass: HomeAssistant, hass_cassette: CassetteSession
+):
+    """Test that an API error on the first refresh retries the setup."""
+    controller = {**build_controller(0), "udid": "missing"}
+    entry = await async_init_integration(hass, controller)
+
+    assert entry.state is ConfigEntryState.SETUP_RETRY
+    assert hass_cassette.request_count() == 1
+
+
+async def test_setup_retry_on_rejected_token(
+    hass: HomeAssistant, hass_cassette: CassetteSession
+):
+    """Test that a rejected token without credentials starts a reauth flow."""
+    entry = await async_init_integration(hass, **{CONF_TOKEN: "expired"})
+
+    assert entry.state is ConfigEntryState.SETUP_ERROR
+    assert hass_cassette.request_count() == 1
+    flows = hass.config_entries.flow.async_progress()
+    assert [flow["context"]["source"] for flow in flows] == [SOURCE_REAUTH]
+
+
+async def test_setup_renews_expired_token(
+    hass: HomeAssistant, fake_emodul_factory
+) -> None:
+    """Test that an expired token is renewed and saved with the entry."""
+    fake, url = await fake_emodul_factory(zones=2, tiles=4)
+    entry = build_config_entry(fake.controllers[0])
+    entry.add_to_hass(hass)
+    hass.config_entries.async_update_entry(
+        entry, data={**entry.data, CONF_USERNAME: USERNAME, CONF_PASSWORD: PASSWORD}
+    )
+    fake.token = "renewed-token"
+
+    with patch_base_url(url):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+    assert entry.state is ConfigEntryState.LOADED
+    assert entry.data[CONF_TOKEN] == "renewed-token"
+    assert fake.requests["/api/v1/authentication"] == 1
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_reauth_stores_credentials(
+    hass: HomeAssistant, fake_emodul_factory
+) -> None:
+    """Test that a reauth flow saves a new token and the credentials."""
+    fake, url = await fake_emodul_factory(zones=2, tiles=4)
+    entry = build_config_entry(fake.controllers[0])
+    entry.add_to_hass(hass)
+    hass.config_entries.async_update_entry(
+        entry, data={**entry.data, CONF_TOKEN: "expired"}
+    )
+
+    with patch_base_url(url), patch(
+        "custom_components.tech.config_flow.Tech", partial(Tech, base_url=url)
+    ):
+        result = await hass.config_entries.flow.async_init(
+            DOMAIN,
+            context={"source": SOURCE_REAUTH, "entry_id": entry.entry_id},
+            data=entry.data,
+        )
+        assert result["step_id"] == "reauth_confirm"
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"], {CONF_USERNAME: USERNAME, CONF_PASSWORD: PASSWORD}
+        )
+        await hass.async_block_till_done()
+
+    assert result["type"] == FlowResultType.ABORT
+    assert result["reason"] == "reauth_successful"
+    assert entry.data[CONF_TOKEN] == TOKEN
+    assert entry.data[CONF_USERNAME] == USERNAME
+    assert entry.state is ConfigEntryState.LOADED
+    assert await hass.config_entries.async_unload(entry.entry_id)
@@ -0,0 +1,253 @@
+"""Tests for the Tech Controllers config entry migrations.
+
+The scaling benchmark migrates registries of growing size, up to
+TECH_MIGRATION_ENTITIES entities, e.g.::
+
+    TECH_MIGRATION_ENTITIES=10000 python -m pytest tests/test_migration.py \
+    -o log_cli=true --log-cli-level=INFO
+"""
+import logging
+import os
+import time
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.tech.const import DOMAIN, UDID as CONF_UDID, USER_ID
+from custom_components.tech.migration import async_migrate_device_layout
+from homeassistant.components.sensor import SensorDeviceClass
+from homeassistant.const import CONF_TOKEN
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import (
+    area_registry as ar,
+    device_registry as dr,
+    entity_registry as er,
+)
+
+from .conftest import build_config_entry, patch_base_url
+from .fake_emodul import TOKEN, USER_ID as FAKE_USER_ID
+
+_LOGGER = logging.getLogger(__name__)
+
+UDID = "udid-0000"
+ENTITIES = int(os.environ.get("TECH_MIGRATION_ENTITIES", "2000"))
+# tiles per zone in the benchmark, each zone also has a thermostat and sensors
+TILES_PER_ZONE = 6
+
+
+async def test_migrate_device_layout(hass: HomeAssistant, fake_emodul_factory) -> None:
+    """Test moving a version 2 entry to one device per controller and zone."""
+    fake, url = await fake_emodul_factory(zones=2, tiles=12)
+    entry = build_config_entry(fake.controllers[0])
+    entry.add_to_hass(hass)
+    hass.config_entries.async_update_entry(entry, version=2)
+    device_registry = dr.async_get(hass)
+    entity_registry = er.async_get(hass)
+
+    # version 2: zone devices named after the zone, a device per tile
+    zone_device = device_registry.async_get_or_create(
+        config_entry_id=entry.entry_id, identifiers={(DOMAIN, "Zone 1")}, name="Zone 1"
+    )
+    tile_device = device_registry.async_get_or_create(
+        config_entry_id=entry.entry_id, identifiers={(DOMAIN, f"{UDID}_11")}
+    )
+    old = {
+        unique_id: entity_registry.async_get_or_create(
+            domain,
+            DOMAIN,
+            unique_id,
+            config_entry=entry,
+            device_id=device.id,
+            original_device_class=device_class,
+        ).entity_id
+        for domain, unique_id, device, device_class in (
+            ("climate", f"{UDID}_1", zone_device, None),
+            ("sensor", "climate_1_battery", zone_device, SensorDeviceClass.TEMPERATURE),
+            ("sensor", "1", zone_device, SensorDeviceClass.BATTERY),
+            ("sensor", "climate_1_humidity", zone_device, SensorDeviceClass.HUMIDITY),
+            ("sensor", f"{UDID}_11", tile_device, SensorDeviceClass.TEMPERATURE),
+        )
+    }
+
+    with patch_base_url(url):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+    assert entry.version == 3
+    controller = device_registry.async_get_device({(DOMAIN, UDID)})
+    zone = device_registry.async_get_device({(DOMAIN, f"{UDID}_1")})
+    assert zone.name == "Zone 1"
+    assert zone.via_device_id == controller.id
+    assert device_registry.async_get(zone_device.id) is None
+    assert device_registry.async_get(tile_device.id) is None
+    devices = dr.async_entries_for_config_entry(device_registry, entry.entry_id)
+    assert len(devices) == 3
+
+    for old_id, unique_id, device in (
+        (f"{UDID}_1", f"{UDID}_1", zone),
+        ("climate_1_battery", f"{UDID}_1_temperature", zone),
+        ("1", f"{UDID}_1_battery", zone),
+        ("climate_1_humidity", f"{UDID}_1_humidity", zone),
+        (f"{UDID}_11", f"{UDID}_11", controller),
+    ):
+        entity = entity_registry.async_get(old[old_id])
+        assert entity.unique_id == unique_id
+        assert entity.device_id == device.id
+
+    # every tile entity sits on the controller device
+    tiles = [
+        entity
+        for entity in er.async_entries_for_config_entry(entity_registry, entry.entry_id)
+        if entity.domain != "climate" and entity.unique_id.count("_") == 1
+    ]
+    assert len(tiles) > 1
+    assert all(entity.device_id == controller.id for entity in tiles)
+
+
+async def test_migrate_device_layout_keeps_areas(
+    hass: HomeAssistant, fake_emodul_factory
+) -> None:
+    """Test that areas of the old devices survive the version 3 migration."""
+    fake, url = await fake_emodul_factory(zones=2, tiles=12)
+    entry = build_config_entry(fake.controllers[0])
+    entry.add_to_hass(hass)
+    hass.config_entries.async_update_entry(entry, version=2)
+    area_registry = ar.async_get(hass)
+    living_room = area_registry.async_create("Living room")
+    boiler_room = area_registry.async_create("Boiler room")
+    device_registry = dr.async_get(hass)
+    entity_registry = er.async_get(hass)
+    zone_device = device_registry.async_get_or_create(
+        config_entry_id=entry.entry_id, identifiers={(DOMAIN, "Zone 1")}, name="Zone 1"
+    )
+    device_registry.async_update_device(zone_device.id, area_id=living_room.id)
+    tile_device = device_registry.async_get_or_create(
+        config_entry_id=entry.entry_id, identifiers={(DOMAIN, f"{UDID}_11")}
+    )
+    device_registry.async_update_device(tile_device.id, area_id=boiler_room.id)
+    climate = entity_registry.async_get_or_create(
+        "climate", DOMAIN, f"{UDID}_1", config_entry=entry, device_id=zone_device.id
+    )
+    battery = entity_registry.async_get_or_create(
+        "sensor", DOMAIN, "1", config_entry=entry, device_id=zone_device.id
+    )
+    tile = entity_registry.async_get_or_create(
+        "sensor", DOMAIN, f"{UDID}_11", config_entry=entry, device_id=tile_device.id
+    )
+
+    with patch_base_url(url):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+    zone = device_registry.async_get_device({(DOMAIN, f"{UDID}_1")})
+    controller = device_registry.async_get_device({(DOMAIN, UDID)})
+    assert zone.area_id == living_room.id
+    assert controller.area_id is None
+    assert entity_registry.async_get(climate.entity_id).area_id is None
+    assert entity_registry.async_get(battery.entity_id).area_id is None
+    assert entity_registry.async_get(tile.entity_id).device_id == controller.id
+    assert entity_registry.async_get(tile.entity_id).area_id == boiler_room.id
+
+
+async def test_migrate_version_1(hass: HomeAssistant, fake_emodul_factory) -> None:
+    """Test migrating a version 1 entry through to version 3."""
+    fake, url = await fake_emodul_factory(zones=2, tiles=4)
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        version=1,
+        data={USER_ID: FAKE_USER_ID, CONF_TOKEN: TOKEN, CONF_UDID: UDID},
+    )
+    entry.add_to_hass(hass)
+    entity_registry = er.async_get(hass)
+    climate = entity_registry.async_get_or_create(
+        "climate", DOMAIN, "1", config_entry=entry, original_name="Zone 1"
+    )
+    gone = entity_registry.async_get_or_create(
+        "sensor", DOMAIN, "99", config_entry=entry, original_name="Gone"
+    )
+
+    with patch_base_url(url):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+    assert entry.version == 3
+    assert entry.unique_id == UDID
+    assert entry.data["controller"]["udid"] == UDID
+    assert fake.requests["/api/v1/users/{user_id}/modules"] == 1
+    assert entity_registry.async_get(gone.entity_id) is None
+    entity = entity_registry.async_get(climate.entity_id)
+    assert entity.unique_id == f"{UDID}_1"
+    zone = dr.async_get(hass).async_get_device({(DOMAIN, f"{UDID}_1")})
+    assert entity.device_id == zone.id
+    assert zone.name == "Zone 1"
+
+
+def _populate_version_2(hass: HomeAssistant, zones: int) -> MockConfigEntry:
+    """Return a version 2 entry with a device per zone and per tile.
+
+    The udids include the number of zones, so entries of several sizes
+    can share the registries.
+    """
+    controllers = [
+        {"id": 100 + i, "udid": f"udid-{zones}-{i}", "name": f"C{i}", "version": "1"}
+        for i in range(4)
+    ]
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        version=2,
+        data={USER_ID: FAKE_USER_ID, CONF_TOKEN: TOKEN, "controllers": controllers},
+    )
+    entry.add_to_hass(hass)
+    device_registry = dr.async_get(hass)
+    entity_registry = er.async_get(hass)
+    for zone_id in range(zones):
+        udid = controllers[zone_id % len(controllers)]["udid"]
+        name = f"Zone {zones}-{zone_id}"
+        device = device_registry.async_get_or_create(
+            config_entry_id=entry.entry_id, identifiers={(DOMAIN, name)}, name=name
+        )
+        for domain, unique_id, device_class in (
+            ("climate", f"{udid}_{zone_id}", None),
+            ("sensor", f"climate_{zone_id}_battery", SensorDeviceClass.TEMPERATURE),
+            ("sensor", f"{zone_id}", SensorDeviceClass.BATTERY),
+            ("sensor", f"climate_{zone_id}_humidity", SensorDeviceClass.HUMIDITY),
+        ):
+            entity_registry.async_get_or_create(
+                domain,
+                DOMAIN,
+                unique_id,
+                config_entry=entry,
+                device_id=device.id,
+                original_device_class=device_class,
+            )
+        for tile in range(TILES_PER_ZONE):
+            unique_id = f"{udid}_{zone_id * TILES_PER_ZONE + tile}"
+            device = device_registry.async_get_or_create(
+                config_entry_id=entry.entry_id, identifiers={(DOMAIN, unique_id)}
+            )
+            entity_registry.async_get_or_create(
+                "sensor", DOMAIN, unique_id, config_entry=entry, device_id=device.id
+            )
+    return entry
+
+
+async def test_migration_scales_linearly(hass: HomeAssistant, record_property) -> None:
+    """Test that the migration time grows linearly with the entities."""
+    per_zone = 4 + TILES_PER_ZONE
+    results = []
+    for entities in (ENTITIES // 4, ENTITIES):
+        entry = _populate_version_2(hass, entities // per_zone)
+        started = time.perf_counter()
+        await async_migrate_device_layout(hass, entry)
+        elapsed = time.perf_counter() - started
+        migrated = er.async_entries_for_config_entry(er.async_get(hass), entry.entry_id)
+        assert len(migrated) == entities // per_zone * per_zone
+        results.append((entities, elapsed))
+
+    report = ", ".join(
+        f"{entities} entities in {elapsed:.2f} s" for entities, elapsed in results
+    )
+    _LOGGER.info("Tech registry migration: %s", report)
+    record_property("tech_migration", report)
+    (small, small_time), (large, large_time) = results
+    # quadratic lookups would take 16 times as long for 4 times the entities
+    assert large_time / large < 3 * small_time / small
@@ -0,0 +1,133 @@
+"""Tests for the Tech Controllers options flow."""
+from datetime import timedelta
+
+from custom_components.tech.const import (
+    CONF_BINARY_SENSORS,
+    CONF_HUMIDITY_DEADBAND,
+    CONF_POLL_TIMEOUT,
+    CONF_RECORD_PAYLOADS,
+    CONF_RETRIES,
+    CONF_TILE_TYPES,
+    CONF_ZONE_CLIMATE,
+    CONF_ZONE_SENSORS,
+    DOMAIN,
+    TYPE_TEMPERATURE,
+)
+from custom_components.tech.tech import ENDPOINT_POLL
+from homeassistant.components.binary_sensor import DOMAIN as BINARY_SENSOR_DOMAIN
+from homeassistant.components.climate import DOMAIN as CLIMATE_DOMAIN
+from homeassistant.components.sensor import DOMAIN as SENSOR_DOMAIN
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import CONF_SCAN_INTERVAL
+from homeassistant.core import HomeAssistant
+from homeassistant.data_entry_flow import FlowResultType
+from homeassistant.helpers import entity_registry as er
+
+from .conftest import build_config_entry, entity_id_for, patch_base_url
+
+
+async def test_entity_categories(hass: HomeAssistant, fake_emodul_factory) -> None:
+    """Test that disabled entity categories are not created."""
+    fake, url = await fake_emodul_factory(zones=2, tiles=22)
+    entry = build_config_entry(fake.controllers[0])
+    entry.add_to_hass(hass)
+    hass.config_entries.async_update_entry(entry, options={CONF_RECORD_PAYLOADS: False})
+    with patch_base_url(url):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        assert hass.states.async_entity_ids(CLIMATE_DOMAIN)
+        assert hass.states.async_entity_ids(BINARY_SENSOR_DOMAIN)
+
+        result = await hass.config_entries.options.async_init(entry.entry_id)
+        assert result["type"] == FlowResultType.MENU
+        result = await hass.config_entries.options.async_configure(
+            result["flow_id"], {"next_step_id": "entities"}
+        )
+        assert result["type"] == FlowResultType.FORM
+        result = await hass.config_entries.options.async_configure(
+            result["flow_id"],
+            user_input={
+                CONF_ZONE_CLIMATE: False,
+                CONF_ZONE_SENSORS: False,
+                CONF_TILE_TYPES: [str(TYPE_TEMPERATURE)],
+                CONF_BINARY_SENSORS: False,
+            },
+        )
+        assert result["type"] == FlowResultType.CREATE_ENTRY
+        await hass.async_block_till_done()
+
+    assert entry.state is ConfigEntryState.LOADED
+    assert entry.options[CONF_TILE_TYPES] == [TYPE_TEMPERATURE]
+    # options not in the form are kept
+    assert entry.options[CONF_RECORD_PAYLOADS] is False
+    assert hass.data[DOMAIN][entry.entry_id].platforms == [SENSOR_DOMAIN]
+    assert not hass.states.async_entity_ids(CLIMATE_DOMAIN)
+    assert not hass.states.async_entity_ids(BINARY_SENSOR_DOMAIN)
+    entities = er.async_entries_for_config_entry(er.async_get(hass), entry.entry_id)
+    assert {entity.domain for entity in entities} == {SENSOR_DOMAIN}
+    # of the tiles only the temperature tiles (11, 22) have sensors left
+    assert hass.states.get(entity_id_for(hass, SENSOR_DOMAIN, "udid-0000_11"))
+    assert hass.states.get(entity_id_for(hass, SENSOR_DOMAIN, "udid-0000_22"))
+    unique_ids = {entity.unique_id for entity in entities}
+    assert "udid-0000_6" not in unique_ids  # valve
+    assert "udid-0000_6_currentTemp" not in unique_ids
+    assert "udid-0000_1_humidity" not in unique_ids  # zone sensor
+    assert "udid-0000_zone_1_temperature_trend" not in unique_ids
+    assert "udid-0000_average_temperature" in unique_ids
+    # nothing is tracked for the sensors of the disabled categories
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    with patch_base_url(url):
+        await coordinator.async_refresh()
+    assert coordinator.trends == {}
+    assert coordinator.on_time is None
+    assert coordinator.track_aggregates
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_polling_options_applied_live(
+    hass: HomeAssistant, fake_emodul_factory
+) -> None:
+    """Test that polling options change the running entry without a reload."""
+    fake, url = await fake_emodul_factory(zones=2, tiles=8)
+    entry = build_config_entry(fake.controllers[0])
+    entry.add_to_hass(hass)
+    with patch_base_url(url):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    humidity = entity_id_for(hass, SENSOR_DOMAIN, "udid-0000_1_humidity")
+    added = hass.states.get(humidity).last_updated
+
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"], {"next_step_id": "polling"}
+    )
+    assert result["step_id"] == "polling"
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        user_input={
+            CONF_SCAN_INTERVAL: 300,
+            CONF_POLL_TIMEOUT: 6,
+            CONF_RETRIES: 3,
+            CONF_HUMIDITY_DEADBAND: 0,
+            CONF_RECORD_PAYLOADS: False,
+        },
+    )
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    await hass.async_block_till_done()
+
+    # same coordinator and entities, new settings
+    assert hass.data[DOMAIN][entry.entry_id] is coordinator
+    assert hass.states.get(humidity).last_updated == added
+    assert coordinator.update_interval == timedelta(seconds=300)
+    assert coordinator.api.retries == 3
+    assert coordinator.api.timeouts[ENDPOINT_POLL].total == 6
+    assert coordinator.api.timeouts[ENDPOINT_POLL].sock_connect <= 6
+    assert coordinator.on_time.max_gap == 900
+
+    # a 1 % change is below the default humidity deadband of 2 %
+    fake.modules["udid-0000"]["zones"]["elements"][0]["zone"]["humidity"] += 1
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    assert hass.states.get(humidity).state == "42"
+    assert await hass.config_entries.async_unload(entry.entry_id)
@@ -0,0 +1,187 @@
+"""Tests for the caching proxy, run against the fake emodul upstream."""
+import asyncio
+import time
+
+from aiohttp import ClientTimeout
+from aiohttp.test_utils import TestServer
+import pytest
+
+from custom_components.tech.const import CONF_API_URL, DOMAIN
+from custom_components.tech.proxy import MAX_CLIENT_TOKENS, TechProxy
+from custom_components.tech.tech import ENDPOINT_WRITE, Tech, TechError
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+from .conftest import build_config_entry
+from .fake_emodul import PASSWORD, TOKEN, USER_ID, USERNAME
+
+UDID = "udid-0000"
+MODULE_ROUTE = "/api/v1/users/{user_id}/modules/{udid}"
+
+
+@pytest.fixture
+async def proxy_factory(hass: HomeAssistant, fake_emodul_factory):
+    """Return a factory starting a proxy in front of a fake upstream."""
+    servers: list[TestServer] = []
+
+    async def _start(**kwargs):
+        fake, upstream_url = await fake_emodul_factory(zones=2, tiles=4)
+        proxy = TechProxy(
+            async_get_clientsession(hass), USER_ID, TOKEN, upstream_url, **kwargs
+        )
+        server = TestServer(proxy.application(), host="127.0.0.1")
+        await server.start_server()
+        servers.append(server)
+        return fake, proxy, str(server.make_url("/api/v1/"))
+
+    yield _start
+
+    for server in servers:
+        await server.close()
+
+
+def _client(hass: HomeAssistant, url: str, token: str = TOKEN) -> Tech:
+    return Tech(async_get_clientsession(hass), USER_ID, token, base_url=url)
+
+
+async def test_clients_share_one_upstream_poll(
+    hass: HomeAssistant, proxy_factory
+) -> None:
+    """Concurrent reads of many clients cost one upstream request."""
+    fake, proxy, url = await proxy_factory()
+    clients = [_client(hass, url) for _ in range(5)]
+    fake.delay = 0.05
+
+    results = await asyncio.gather(
+        *(client.get_module_data(UDID) for client in clients)
+    )
+    await asyncio.gather(*(client.get_translations("en") for client in clients))
+    await clients[0].list_modules()
+    await clients[1].list_modules()
+
+    assert all(result == results[0] for result in results)
+    assert fake.requests[MODULE_ROUTE] == 1
+    assert fake.requests["/api/v1/i18n/{language}"] == 1
+    assert fake.requests["/api/v1/users/{user_id}/modules"] == 1
+    assert proxy.stats["hits"] == 4 + 4 + 1
+
+    # the background poll refreshes the modules clients asked for
+    await proxy.async_refresh()
+    assert fake.requests[MODULE_ROUTE] == 2
+    await clients[2].get_module_data(UDID)
+    assert fake.requests[MODULE_ROUTE] == 2
+
+
+async def test_writes_pass_through_and_invalidate(
+    hass: HomeAssistant, proxy_factory
+) -> None:
+    """A write reaches upstream and the next read shows its result."""
+    fake, _, url = await proxy_factory()
+    writer, reader = _client(hass, url), _client(hass, url)
+    await reader.module_data(UDID)
+    await writer.module_data(UDID)
+
+    await writer.set_const_temp(UDID, 1, 23.5)
+
+    assert fake.writes[0]["mode"]["setTemperature"] == 235
+    data = await reader.module_data(UDID)
+    assert data["zones"][1]["zone"]["setTemperature"] == 235
+    assert fake.requests[MODULE_ROUTE] == 2
+
+
+async def test_clients_must_authenticate(hass: HomeAssistant, proxy_factory) -> None:
+    """Only the proxied account's tokens are accepted."""
+    fake, _, url = await proxy_factory()
+
+    with pytest.raises(TechError) as err:
+        await _client(hass, url, "wrong").get_module_data(UDID)
+    assert err.value.status_code == 401
+
+    api = Tech(async_get_clientsession(hass), base_url=url)
+    assert await api.authenticate(USERNAME, PASSWORD)
+    assert await api.get_module_data(UDID)
+    assert fake.requests["/api/v1/authentication"] == 1
+
+
+async def test_client_logins_are_capped(hass: HomeAssistant, proxy_factory) -> None:
+    """Only the latest client logins stay accepted besides the proxy's token."""
+    fake, proxy, url = await proxy_factory()
+    api = Tech(async_get_clientsession(hass), base_url=url)
+    for login in range(MAX_CLIENT_TOKENS + 1):
+        fake.token = f"token-{login}"
+        assert await api.authenticate(USERNAME, PASSWORD)
+    fake.token = TOKEN
+
+    with pytest.raises(TechError) as err:
+        await _client(hass, url, "token-0").get_module_data(UDID)
+    assert err.value.status_code == 401
+    assert await _client(hass, url, "token-1").list_modules()
+    assert await _client(hass, url, TOKEN).list_modules()
+
+
+async def test_upstream_token_is_renewed(hass: HomeAssistant, proxy_factory) -> None:
+    """The proxy logs in again when its upstream token expires."""
+    fake, proxy, url = await proxy_factory(credentials=(USERNAME, PASSWORD))
+    fake.token = "renewed-token"
+
+    assert await _client(hass, url).get_module_data(UDID)
+    assert proxy.api.token == "renewed-token"
+    assert fake.requests["/api/v1/authentication"] == 1
+
+
+async def test_stalled_login_is_retried(hass: HomeAssistant, proxy_factory) -> None:
+    """A login stalling upstream is retried with the write timeouts."""
+    fake, proxy, url = await proxy_factory()
+    proxy.api.timeouts[ENDPOINT_WRITE] = ClientTimeout(total=5, sock_read=0.2)
+    fake.stalls = 1
+
+    started = time.monotonic()
+    api = Tech(async_get_clientsession(hass), base_url=url)
+    assert await api.authenticate(USERNAME, PASSWORD)
+    assert time.monotonic() - started < 2
+    assert fake.requests["/api/v1/authentication"] == 2
+
+
+async def test_refresh_logs_unexpected_errors(
+    hass: HomeAssistant, proxy_factory, caplog
+) -> None:
+    """A module refresh failing with any exception is logged."""
+    fake, proxy, url = await proxy_factory()
+    await _client(hass, url).get_module_data(UDID)
+
+    async def _broken(udid):
+        raise ValueError("malformed payload")
+
+    proxy.api.get_module_data = _broken
+    await proxy.async_refresh()
+
+    assert f"Unexpected error refreshing module {UDID}" in caplog.text
+    assert "malformed payload" in caplog.text
+
+
+async def test_upstream_errors_are_passed_on(
+    hass: HomeAssistant, proxy_factory
+) -> None:
+    """An upstream error reaches the client with its status."""
+    fake, _, url = await proxy_factory()
+    fake.status_override = 503
+
+    with pytest.raises(TechError) as err:
+        await _client(hass, url).get_module_data(UDID)
+    assert err.value.status_code == 503
+
+
+async def test_entry_polls_through_proxy(hass: HomeAssistant, proxy_factory) -> None:
+    """An entry with the api_url option uses the proxy."""
+    fake, proxy, url = await proxy_factory()
+    entry = build_config_entry(fake.controllers[0])
+    entry.options = {CONF_API_URL: url}
+    entry.add_to_hass(hass)
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert hass.data[DOMAIN][entry.entry_id].api.base_url == url
+    assert fake.requests[MODULE_ROUTE] == 1
+    assert proxy.stats["hits"] > 0
+    assert await hass.config_entries.async_unload(entry.entry_id)
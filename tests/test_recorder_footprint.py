@@ -0,0 +1,121 @@
+"""Recorder write volume of a simulated installation.
+
+Polls a fake installation whose readings drift like a real one and counts
+what the recorder would write for the resulting state changes: one state
+row per change and one attributes row per distinct set of recorded
+attributes, with the bytes of the latter. The results are extrapolated to
+a day of polls. The size is read from the environment, e.g.::
+
+    TECH_FOOTPRINT_ZONES=16 TECH_FOOTPRINT_TILES=64 \
+    TECH_FOOTPRINT_POLLS=720 python -m pytest tests/test_recorder_footprint.py \
+    -o log_cli=true --log-cli-level=INFO
+"""
+import logging
+import os
+import random
+
+from custom_components.tech.const import DOMAIN
+from homeassistant.const import (
+    ATTR_ATTRIBUTION,
+    ATTR_RESTORED,
+    ATTR_SUPPORTED_FEATURES,
+    EVENT_STATE_CHANGED,
+)
+from homeassistant.core import HomeAssistant, State
+from homeassistant.helpers.json import json_bytes
+
+from .conftest import build_config_entry, patch_base_url
+
+_LOGGER = logging.getLogger(__name__)
+
+ZONES = int(os.environ.get("TECH_FOOTPRINT_ZONES", "8"))
+TILES = int(os.environ.get("TECH_FOOTPRINT_TILES", "22"))
+POLLS = int(os.environ.get("TECH_FOOTPRINT_POLLS", "60"))
+POLL_SECONDS = 120
+POLLS_PER_DAY = 86400 // POLL_SECONDS
+# attributes the recorder never stores, see recorder.const
+ALL_DOMAIN_EXCLUDE_ATTRS = {ATTR_ATTRIBUTION, ATTR_RESTORED, ATTR_SUPPORTED_FEATURES}
+
+
+def _recorded_attributes(state: State) -> bytes:
+    """Return the attributes as the recorder stores them."""
+    exclude = set(ALL_DOMAIN_EXCLUDE_ATTRS)
+    if state.state_info:
+        exclude.update(state.state_info["unrecorded_attributes"])
+    return json_bytes({k: v for k, v in state.attributes.items() if k not in exclude})
+
+
+def _drift(rng: random.Random, params: dict, key: str, step: int, low, high) -> None:
+    params[key] = min(high, max(low, params[key] + rng.randint(-step, step)))
+
+
+def _simulate_poll(rng: random.Random, module: dict) -> None:
+    """Move the readings of a module as a real installation would."""
+    for element in module["zones"]["elements"]:
+        zone = element["zone"]
+        _drift(rng, zone, "currentTemperature", 1, 150, 260)
+        if rng.random() < 0.2:
+            _drift(rng, zone, "humidity", 1, 20, 80)
+    for tile in module["tiles"]:
+        params = tile["params"]
+        if tile["type"] == 1:
+            _drift(rng, params, "value", 1, 150, 260)
+        elif tile["type"] == 6:
+            _drift(rng, params["widget2"], "value", 2, 300, 700)
+        elif tile["type"] == 23:
+            _drift(rng, params, "currentTemp", 3, 300, 700)
+            _drift(rng, params, "returnTemp", 3, 200, 600)
+            _drift(rng, params, "openingPercentage", 2, 0, 100)
+        elif tile["type"] == 24:
+            _drift(rng, params, "openingPercentage", 2, 0, 100)
+
+
+async def test_recorder_footprint(
+    hass: HomeAssistant, fake_emodul_factory, freezer, record_property
+) -> None:
+    """Measure the rows and bytes recorded per day for one controller."""
+    fake, url = await fake_emodul_factory(zones=ZONES, tiles=TILES)
+    entry = build_config_entry(fake.controllers[0])
+    entry.add_to_hass(hass)
+    with patch_base_url(url):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+
+    state_rows = 0
+    attributes: set[bytes] = set()
+    attribute_bytes = 0
+
+    def _count(event) -> None:
+        nonlocal state_rows, attribute_bytes
+        if (state := event.data.get("new_state")) is None:
+            return
+        state_rows += 1
+        recorded = _recorded_attributes(state)
+        if recorded not in attributes:
+            attributes.add(recorded)
+            attribute_bytes += len(recorded)
+
+    unsub = hass.bus.async_listen(EVENT_STATE_CHANGED, _count)
+    rng = random.Random(42)
+    module = fake.modules[fake.controllers[0]["udid"]]
+    for _ in range(POLLS):
+        _simulate_poll(rng, module)
+        freezer.tick(POLL_SECONDS)
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+    unsub()
+
+    scale = POLLS_PER_DAY / POLLS
+    report = (
+        f"{len(hass.states.async_all())} entities, per day: "
+        f"{state_rows * scale:.0f} state rows, "
+        f"{len(attributes) * scale:.0f} attribute rows, "
+        f"{attribute_bytes * scale / 1024:.1f} KiB of attributes"
+    )
+    _LOGGER.info(
+        "Tech recorder footprint (%s zones, %s tiles): %s", ZONES, TILES, report
+    )
+    record_property("tech_recorder_footprint", report)
+    assert state_rows > 0
+    assert await hass.config_entries.async_unload(entry.entry_id)
@@ -0,0 +1,76 @@
+"""Tests for spreading the polls of an account over the interval."""
+import pytest
+
+from custom_components.tech.const import DATA_SCHEDULERS, DOMAIN, SCAN_INTERVAL
+from custom_components.tech.diagnostics import async_get_config_entry_diagnostics
+from custom_components.tech.scheduler import PollScheduler
+from homeassistant.core import HomeAssistant
+
+from .conftest import build_config_entry, patch_base_url
+
+INTERVAL = SCAN_INTERVAL.total_seconds()
+
+
+class _Member:
+    def async_reschedule(self) -> None:
+        """Nothing is scheduled."""
+
+
+@pytest.mark.parametrize("now", [0.0, 1000.5, 123456.7])
+def test_phases_are_spread_evenly(now: float) -> None:
+    """Members poll at evenly spaced offsets, at least half an interval apart."""
+    scheduler = PollScheduler()
+    for key in ("d", "b", "a", "c"):
+        scheduler.async_register(key, _Member())
+
+    assert [scheduler.phase(key, 120) for key in "abcd"] == [0, 30, 60, 90]
+    for key in "abcd":
+        next_refresh = scheduler.next_refresh(key, 120, now)
+        assert (next_refresh - scheduler.phase(key, 120)) % 120 == pytest.approx(0)
+        assert 60 <= next_refresh - now <= 180
+
+    scheduler.async_unregister("b")
+    assert scheduler.as_dict(120) == {"members": 3, "phases_s": [0, 40, 80]}
+
+
+def _phase_of(coordinator) -> float:
+    # _unsub_refresh is the cancel method of the refresh's TimerHandle
+    return coordinator._unsub_refresh.__self__.when() % INTERVAL
+
+
+async def test_entries_of_account_poll_out_of_phase(
+    hass: HomeAssistant, fake_emodul_factory
+) -> None:
+    """Entries set up together keep distinct phases across failures and reloads."""
+    fake, url = await fake_emodul_factory(controllers=3, zones=2, tiles=4)
+    entries = [build_config_entry(controller) for controller in fake.controllers]
+    for entry in entries:
+        entry.add_to_hass(hass)
+
+    with patch_base_url(url):
+        assert await hass.config_entries.async_setup(entries[0].entry_id)
+        await hass.async_block_till_done()
+        coordinators = [hass.data[DOMAIN][entry.entry_id] for entry in entries]
+        phases = sorted(_phase_of(coordinator) for coordinator in coordinators)
+        gaps = [(b - a) % INTERVAL for a, b in zip(phases, phases[1:] + phases[:1])]
+        assert gaps == pytest.approx([INTERVAL / 3] * 3)
+
+        # a failed poll does not move the phase
+        phase = _phase_of(coordinators[0])
+        fake.status_override = 500
+        await coordinators[0].async_refresh()
+        fake.status_override = None
+        assert _phase_of(coordinators[0]) == pytest.approx(phase)
+
+        # neither does a reload
+        assert await hass.config_entries.async_reload(entries[0].entry_id)
+        await hass.async_block_till_done()
+        reloaded = hass.data[DOMAIN][entries[0].entry_id]
+        assert _phase_of(reloaded) == pytest.approx(phase)
+
+        diagnostics = await async_get_config_entry_diagnostics(hass, entries[0])
+        assert diagnostics["poll_phase"]["members"] == 3
+
+        for entry in entries:
+            assert await hass.config_entries.async_unload(entry.entry_id)
+        assert not hass.data[DATA_SCHEDULERS]
@@ -0,0 +1,122 @@
+"""Tests for the Tech sensor platform."""
+from unittest.mock import patch
+
+from custom_components.tech.const import DOMAIN
+from custom_components.tech.sensor import ControllerAggregateSensor
+from homeassistant.components.sensor import DOMAIN as SENSOR_DOMAIN
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+
+from .cassette import CassetteSession
+from .conftest import (
+    async_init_integration,
+    build_config_entry,
+    entity_id_for,
+    patch_base_url,
+)
+
+
+async def test_tile_sensors(hass: HomeAssistant, hass_cassette: CassetteSession):
+    """Test the sensors created for tiles."""
+    entry = await async_init_integration(hass)
+    await hass.data[DOMAIN][entry.entry_id].async_refresh()
+
+    def state(tile_id):
+        return hass.states.get(
+            entity_id_for(hass, SENSOR_DOMAIN, f"udid-0000_{tile_id}")
+        )
+
+    assert state(11).state == "21.1"  # temperature
+    assert state(2).state == "45.2"  # central heating widget
+    assert state(5).state == "0"  # fan gear
+    assert state(6).state == "6"  # valve opening
+    assert state(6).attributes["currentTemp"] == 40.6
+    assert state(6).attributes["returnTemp"] == 30.6
+    assert state(7).state == "49"  # mixing valve opening
+    assert state(8).state == "8"  # fuel supply
+    # status texts are disabled by default
+    text = er.async_get(hass).async_get(
+        entity_id_for(hass, SENSOR_DOMAIN, "udid-0000_9")
+    )
+    assert text.disabled_by is er.RegistryEntryDisabler.INTEGRATION
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_zone_sensors(hass: HomeAssistant, hass_cassette: CassetteSession):
+    """Test the humidity sensors created for zones."""
+    entry = await async_init_integration(hass)
+
+    humidity = entity_id_for(hass, SENSOR_DOMAIN, "udid-0000_1_humidity")
+    assert hass.states.get(humidity).state == "41"
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_aggregate_sensors(hass: HomeAssistant, fake_emodul_factory):
+    """Test the per-controller aggregates and that they are written on change."""
+    fake, url = await fake_emodul_factory(zones=3, tiles=8)
+    entry = build_config_entry(fake.controllers[0])
+    entry.add_to_hass(hass)
+    with patch_base_url(url):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+
+    def state(key):
+        entity_id = entity_id_for(hass, SENSOR_DOMAIN, f"udid-0000_{key}")
+        return hass.states.get(entity_id).state
+
+    assert state("average_temperature") == "19.7"
+    assert state("min_temperature") == "19.6"
+    assert state("max_temperature") == "19.8"
+    assert state("zones_heating") == "3"
+    assert state("zones_below_setpoint") == "3"
+    assert state("max_valve_opening") == "49"
+    assert state("min_battery") == "90"
+
+    # a poll with unchanged inputs writes none of the aggregate states
+    with patch.object(ControllerAggregateSensor, "async_write_ha_state") as write:
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+    assert write.call_count == 0
+
+    zone = fake.modules["udid-0000"]["zones"]["elements"][0]["zone"]
+    zone["currentTemperature"] = 230
+    zone["flags"]["relayState"] = "off"
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    assert state("average_temperature") == "20.8"
+    assert state("max_temperature") == "23.0"
+    assert state("zones_heating") == "2"
+    assert state("zones_below_setpoint") == "2"
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_aggregate_sensors_without_readings(
+    hass: HomeAssistant, fake_emodul_factory
+):
+    """Test that aggregates are created while their inputs report nothing."""
+    fake, url = await fake_emodul_factory(zones=2, tiles=4)
+    zones = fake.modules["udid-0000"]["zones"]["elements"]
+    for zone in zones:
+        zone["zone"]["currentTemperature"] = None
+    entry = build_config_entry(fake.controllers[0])
+    entry.add_to_hass(hass)
+    with patch_base_url(url):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+    entity_id = entity_id_for(hass, SENSOR_DOMAIN, "udid-0000_average_temperature")
+    assert hass.states.get(entity_id).state == "unknown"
+    # no valve tiles among the first four
+    unique_ids = {
+        entity.unique_id
+        for entity in er.async_entries_for_config_entry(
+            er.async_get(hass), entry.entry_id
+        )
+    }
+    assert "udid-0000_max_valve_opening" not in unique_ids
+
+    zones[0]["zone"]["currentTemperature"] = 215
+    await hass.data[DOMAIN][entry.entry_id].async_refresh()
+    await hass.async_block_till_done()
+    assert hass.states.get(entity_id).state == "21.5"
+    assert await hass.config_entries.async_unload(entry.entry_id)
@@ -0,0 +1,129 @@
+"""Tests for the Tech services."""
+import pytest
+
+from custom_components.tech.const import DOMAIN, SERVICE_GET_SNAPSHOT, SERVICE_SET_ZONES
+from homeassistant.components.climate import ATTR_HVAC_MODE, HVACMode
+from homeassistant.const import ATTR_ENTITY_ID, ATTR_TEMPERATURE
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ServiceValidationError
+
+from .conftest import build_config_entry, entity_id_for, patch_base_url
+
+MODULE_ROUTE = "/api/v1/users/{user_id}/modules/{udid}"
+ZONES_ROUTE = MODULE_ROUTE + "/zones"
+
+
+async def _setup(hass: HomeAssistant, fake_emodul_factory, controllers=2):
+    fake, url = await fake_emodul_factory(controllers=controllers, zones=3, tiles=4)
+    entries = [build_config_entry(controller) for controller in fake.controllers]
+    for entry in entries:
+        entry.add_to_hass(hass)
+    patcher = patch_base_url(url)
+    patcher.start()
+    assert await hass.config_entries.async_setup(entries[0].entry_id)
+    await hass.async_block_till_done()
+    return fake, patcher
+
+
+async def test_set_zones_across_controllers(
+    hass: HomeAssistant, fake_emodul_factory
+) -> None:
+    """Zones of several controllers are written and each refreshed once."""
+    fake, patcher = await _setup(hass, fake_emodul_factory)
+    entity_ids = [
+        entity_id_for(hass, "climate", f"udid-{controller:04d}_{zone}")
+        for controller in range(2)
+        for zone in (1, 2, 3)
+    ]
+    fake.reset_stats()
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_SET_ZONES,
+        {ATTR_ENTITY_ID: entity_ids, ATTR_TEMPERATURE: 18},
+        blocking=True,
+        return_response=True,
+    )
+    await hass.async_block_till_done()
+
+    assert response == {
+        "zones": {entity_id: {"success": True} for entity_id in entity_ids}
+    }
+    assert fake.requests[ZONES_ROUTE] == 6
+    assert {write["mode"]["setTemperature"] for write in fake.writes} == {180}
+    assert fake.requests[MODULE_ROUTE] == 2
+    for entity_id in entity_ids:
+        assert hass.states.get(entity_id).attributes[ATTR_TEMPERATURE] == 18
+    patcher.stop()
+
+
+async def test_set_zones_reports_failures_per_zone(
+    hass: HomeAssistant, fake_emodul_factory
+) -> None:
+    """A zone that cannot be written does not fail the others."""
+    fake, patcher = await _setup(hass, fake_emodul_factory, controllers=1)
+    zone = entity_id_for(hass, "climate", "udid-0000_1")
+    fake.reset_stats()
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_SET_ZONES,
+        {ATTR_ENTITY_ID: [zone, "climate.not_tech"], ATTR_HVAC_MODE: HVACMode.OFF},
+        blocking=True,
+        return_response=True,
+    )
+
+    assert response["zones"][zone] == {"success": True}
+    assert not response["zones"]["climate.not_tech"]["success"]
+    assert fake.writes == [{"zone": {"id": 1, "zoneState": "zoneOff"}}]
+    patcher.stop()
+
+
+async def test_get_snapshot(hass: HomeAssistant, fake_emodul_factory) -> None:
+    """The snapshot holds scaled, named values without requesting emodul.eu."""
+    fake, patcher = await _setup(hass, fake_emodul_factory)
+    fake.reset_stats()
+
+    response = await hass.services.async_call(
+        DOMAIN, SERVICE_GET_SNAPSHOT, {}, blocking=True, return_response=True
+    )
+
+    assert [c["udid"] for c in response["controllers"]] == ["udid-0000", "udid-0001"]
+    controller = response["controllers"][0]
+    assert controller["age_s"] < 60
+    assert not controller["stale"]
+    assert controller["zones"][0] == {
+        "id": 1,
+        "name": "Zone 1",
+        "hvac_mode": HVACMode.HEAT,
+        "temperature": 19.6,
+        "target_temperature": 21.0,
+        "humidity": 41,
+        "battery": 90,
+        "relay": True,
+    }
+    tiles = {tile["id"]: tile for tile in controller["tiles"]}
+    assert tiles[1]["value"] is True
+    assert tiles[2]["value"] == 45.2
+    assert tiles[2]["name"] == "Text 1002"
+    assert tiles[3]["value"] is False
+    assert fake.total_requests == 0
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_GET_SNAPSHOT,
+        {"controller": "Controller 1"},
+        blocking=True,
+        return_response=True,
+    )
+    assert [c["udid"] for c in response["controllers"]] == ["udid-0001"]
+
+    with pytest.raises(ServiceValidationError):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_GET_SNAPSHOT,
+            {"controller": "missing"},
+            blocking=True,
+            return_response=True,
+        )
+    patcher.stop()
@@ -0,0 +1,84 @@
+"""Tests for serving stale data through short cloud outages."""
+from datetime import timedelta
+from unittest.mock import patch
+
+from custom_components.tech.const import (
+    CONF_MAX_STALE_AGE,
+    CONF_UNAVAILABLE_AFTER_FAILURES,
+    DOMAIN,
+)
+from custom_components.tech.diagnostics import async_get_config_entry_diagnostics
+from homeassistant.const import STATE_UNAVAILABLE
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .conftest import build_config_entry, entity_id_for, patch_base_url
+
+
+async def _setup(hass: HomeAssistant, fake_emodul_factory, **options):
+    fake, url = await fake_emodul_factory(zones=2, tiles=4)
+    entry = build_config_entry(fake.controllers[0])
+    entry.options = options
+    entry.add_to_hass(hass)
+    with patch_base_url(url):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+    return fake, entry, hass.data[DOMAIN][entry.entry_id]
+
+
+async def test_transient_errors_serve_last_data(
+    hass: HomeAssistant, fake_emodul_factory
+) -> None:
+    """Entities keep their state until the failure threshold is reached."""
+    fake, entry, coordinator = await _setup(
+        hass, fake_emodul_factory, **{CONF_UNAVAILABLE_AFTER_FAILURES: 3}
+    )
+    entity_id = entity_id_for(hass, "climate", "udid-0000_1")
+    state = hass.states.get(entity_id)
+    fake.status_override = 500
+
+    for failures in (1, 2):
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+        assert coordinator.last_update_success
+        assert coordinator.stale
+        assert coordinator.consecutive_failures == failures
+        # the state was not rewritten
+        assert hass.states.get(entity_id).last_updated == state.last_updated
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+    assert diagnostics["coordinator"]["stale"]
+    assert diagnostics["coordinator"]["data_age_s"] is not None
+
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    assert not coordinator.last_update_success
+    assert hass.states.get(entity_id).state == STATE_UNAVAILABLE
+
+    fake.status_override = None
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    assert coordinator.last_update_success
+    assert not coordinator.stale
+    assert coordinator.consecutive_failures == 0
+    assert hass.states.get(entity_id).state == state.state
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_stale_data_expires(hass: HomeAssistant, fake_emodul_factory) -> None:
+    """Entities become unavailable once the data is older than the maximum age."""
+    fake, entry, coordinator = await _setup(
+        hass,
+        fake_emodul_factory,
+        **{CONF_UNAVAILABLE_AFTER_FAILURES: 100, CONF_MAX_STALE_AGE: 600},
+    )
+    fake.status_override = 503
+
+    await coordinator.async_refresh()
+    assert coordinator.last_update_success
+
+    later = dt_util.utcnow() + timedelta(seconds=601)
+    with patch("homeassistant.util.dt.utcnow", return_value=later):
+        await coordinator.async_refresh()
+    assert not coordinator.last_update_success
+    assert await hass.config_entries.async_unload(entry.entry_id)
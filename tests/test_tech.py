@@ -0,0 +1,299 @@
+"""Tests for the Tech API client, replayed from cassettes."""
+import asyncio
+import json
+import time
+
+from aiohttp import ClientTimeout
+import pytest
+
+from custom_components.tech.tech import (
+    ENDPOINT_POLL,
+    PRIORITY_CONFIRM,
+    PRIORITY_POLL,
+    PRIORITY_WRITE,
+    RequestQueue,
+    Tech,
+    TechError,
+    TechLoginError,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+from .cassette import CassetteSession
+from .fake_emodul import PASSWORD, TOKEN, USER_ID, USERNAME
+
+UDID = "udid-0000"
+MODULE_PATH = f"users/{USER_ID}/modules/{UDID}"
+ZONES_PATH = MODULE_PATH + "/zones"
+
+# Client-side budget for one replayed call: parsing and bookkeeping only.
+CALL_BUDGET = 0.1
+
+
+def assert_within_budget(session: CassetteSession) -> None:
+    """Assert that every call finished within the latency budget."""
+    assert session.latencies
+    assert max(session.latencies) < CALL_BUDGET
+
+
+def authenticated(session: CassetteSession) -> Tech:
+    """Return a client using the fake account's credentials."""
+    return Tech(session, USER_ID, TOKEN)
+
+
+async def test_authenticate(cassette: CassetteSession) -> None:
+    """Test a successful authentication."""
+    api = Tech(cassette)
+    assert await api.authenticate(USERNAME, PASSWORD)
+    assert api.user_id == USER_ID
+    assert api.token == TOKEN
+    assert api.headers["Authorization"] == "Bearer " + TOKEN
+    assert cassette.request_count("POST", "authentication") == 1
+    assert_within_budget(cassette)
+
+
+async def test_authenticate_invalid(cassette: CassetteSession) -> None:
+    """Test that rejected credentials raise TechLoginError."""
+    api = Tech(cassette)
+    with pytest.raises(TechLoginError):
+        await api.authenticate(USERNAME, "wrong")
+    assert not api.authenticated
+    assert cassette.request_count() == 1
+
+
+async def test_unauthenticated_requests_are_refused(cassette: CassetteSession) -> None:
+    """Test that no request is sent without a token."""
+    api = Tech(cassette)
+    with pytest.raises(TechError):
+        await api.list_modules()
+    with pytest.raises(TechError):
+        await api.get_module_data(UDID)
+    with pytest.raises(TechError):
+        await api.get_translations("en")
+    assert cassette.request_count() == 0
+
+
+async def test_list_modules(cassette: CassetteSession) -> None:
+    """Test listing the modules of the account."""
+    result = await authenticated(cassette).list_modules()
+    assert [module["udid"] for module in result] == [UDID]
+    assert cassette.request_count() == 1
+    assert_within_budget(cassette)
+
+
+async def test_get_module_data(cassette: CassetteSession) -> None:
+    """Test fetching the raw module data."""
+    result = await authenticated(cassette).get_module_data(UDID)
+    assert "zones" in result
+    assert "tiles" in result
+    assert cassette.request_count("GET", MODULE_PATH) == 1
+    assert_within_budget(cassette)
+
+
+async def test_get_translations(cassette: CassetteSession) -> None:
+    """Test fetching a language pack."""
+    result = await authenticated(cassette).get_translations("en")
+    assert result["data"]["205"] == "Text 205"
+    assert cassette.request_count("GET", "i18n/en") == 1
+    assert_within_budget(cassette)
+
+
+async def test_module_data(cassette: CassetteSession) -> None:
+    """Test that module_data fills the zone and tile caches in one request."""
+    api = authenticated(cassette)
+    result = await api.module_data(UDID)
+    assert list(result["zones"]) == [1, 2]
+    assert len(result["tiles"]) == 11
+    assert result["last_update"] is not None
+    assert api.modules[UDID] is result
+    assert cassette.request_count() == 1
+    assert_within_budget(cassette)
+
+
+async def test_get_module_zones_and_tiles(cassette: CassetteSession) -> None:
+    """Test the zone and tile getters."""
+    api = authenticated(cassette)
+    api.modules.setdefault(UDID, {"last_update": None, "zones": {}, "tiles": {}})
+    zones = await api.get_module_zones(UDID)
+    tiles = await api.get_module_tiles(UDID)
+    assert zones[1]["description"]["name"] == "Zone 1"
+    assert tiles[1]["params"]["description"]
+    assert (await api.get_zone(UDID, 2))["zone"]["id"] == 2
+    assert (await api.get_tile(UDID, 3))["id"] == 3
+    assert cassette.request_count("GET", MODULE_PATH) == 4
+    assert_within_budget(cassette)
+
+
+async def test_set_const_temp(cassette: CassetteSession) -> None:
+    """Test setting the constant temperature of a zone."""
+    api = authenticated(cassette)
+    await api.module_data(UDID)
+    assert await api.set_const_temp(UDID, 1, 22.5) == {"status": "ok"}
+    body = json.loads(cassette.interactions_for("POST", ZONES_PATH)[0]["data"])
+    assert body["mode"]["setTemperature"] == 225
+    assert body["mode"]["parentId"] == 1
+    zones = await api.module_data(UDID)
+    assert zones["zones"][1]["zone"]["setTemperature"] == 225
+    assert cassette.request_count("POST", ZONES_PATH) == 1
+    assert cassette.request_count("GET", MODULE_PATH) == 2
+    assert_within_budget(cassette)
+
+
+async def test_set_zone(cassette: CassetteSession) -> None:
+    """Test turning a zone off and on."""
+    api = authenticated(cassette)
+    await api.set_zone(UDID, 1, False)
+    await api.set_zone(UDID, 1, True)
+    states = [
+        json.loads(interaction["data"])["zone"]["zoneState"]
+        for interaction in cassette.interactions_for("POST", ZONES_PATH)
+    ]
+    assert states == ["zoneOff", "zoneOn"]
+    assert cassette.request_count() == 2
+    assert_within_budget(cassette)
+
+
+async def test_error_response(cassette: CassetteSession) -> None:
+    """Test that unexpected statuses raise TechError."""
+    with pytest.raises(TechError) as err:
+        await authenticated(cassette).get_module_data("missing")
+    assert err.value.status_code == 404
+    assert cassette.request_count() == 1
+
+
+async def test_stalled_request_is_retried(
+    hass: HomeAssistant, fake_emodul_factory
+) -> None:
+    """Test that a hung connection is cancelled and retried quickly."""
+    fake, url = await fake_emodul_factory()
+    api = Tech(
+        async_get_clientsession(hass),
+        USER_ID,
+        TOKEN,
+        base_url=url,
+        timeouts={ENDPOINT_POLL: ClientTimeout(total=5, sock_read=0.2)},
+    )
+    fake.stalls = 1
+
+    started = time.monotonic()
+    result = await api.module_data(UDID)
+
+    assert list(result["zones"]) == list(range(1, 9))
+    assert fake.requests["/api/v1/users/{user_id}/modules/{udid}"] == 2
+    assert time.monotonic() - started < 2
+
+
+async def test_stalled_request_gives_up(
+    hass: HomeAssistant, fake_emodul_factory
+) -> None:
+    """Test that a request stalling on every attempt raises TechError."""
+    fake, url = await fake_emodul_factory()
+    api = Tech(
+        async_get_clientsession(hass),
+        USER_ID,
+        TOKEN,
+        base_url=url,
+        timeouts={ENDPOINT_POLL: ClientTimeout(total=5, sock_read=0.2)},
+        retries=2,
+    )
+    fake.stalls = 3
+
+    with pytest.raises(TechError) as err:
+        await api.get_module_data(UDID)
+
+    assert err.value.status_code == 408
+    assert fake.total_requests == 3
+
+
+async def test_expired_token_is_renewed_once(
+    hass: HomeAssistant, fake_emodul_factory
+) -> None:
+    """Test that concurrent requests rejected with 401 share one renewal."""
+    fake, url = await fake_emodul_factory(zones=2, tiles=4)
+    api = Tech(
+        async_get_clientsession(hass),
+        USER_ID,
+        TOKEN,
+        base_url=url,
+        credentials=(USERNAME, PASSWORD),
+    )
+    fake.token = "renewed-token"
+
+    results = await asyncio.gather(*(api.get_module_data(UDID) for _ in range(3)))
+
+    assert all(result["zones"] for result in results)
+    assert fake.requests["/api/v1/authentication"] == 1
+    assert api.token == "renewed-token"
+    assert api.token_renewals == 1
+
+
+async def test_expired_token_without_credentials(
+    hass: HomeAssistant, fake_emodul_factory
+) -> None:
+    """Test that a rejected token raises TechLoginError without credentials."""
+    fake, url = await fake_emodul_factory(zones=2, tiles=4)
+    api = Tech(async_get_clientsession(hass), USER_ID, TOKEN, base_url=url)
+    fake.token = "renewed-token"
+
+    with pytest.raises(TechLoginError):
+        await api.get_module_data(UDID)
+    assert fake.requests["/api/v1/authentication"] == 0
+
+
+async def test_request_queue_serves_higher_priority_first() -> None:
+    """Test that a freed slot goes to the waiting request of highest priority."""
+    queue = RequestQueue(slots=1)
+    order = []
+
+    async def request(priority):
+        async with queue.slot(priority):
+            order.append(priority)
+
+    async with queue.slot(PRIORITY_POLL):
+        tasks = [
+            asyncio.create_task(request(priority))
+            for priority in (PRIORITY_POLL, PRIORITY_CONFIRM, PRIORITY_WRITE)
+        ]
+        await asyncio.sleep(0)
+        cancelled = asyncio.create_task(request(PRIORITY_WRITE))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        assert queue.as_dict()["poll"]["queued"] == 1
+    await asyncio.gather(*tasks)
+
+    assert order == [PRIORITY_WRITE, PRIORITY_CONFIRM, PRIORITY_POLL]
+    assert queue.as_dict()["write"]["active"] == 0
+    assert queue.as_dict()["write"]["queued"] == 0
+
+
+async def test_writes_do_not_wait_behind_polls(
+    hass: HomeAssistant, fake_emodul_factory
+) -> None:
+    """Test that a write gets a slot while many polls are queued."""
+    fake, url = await fake_emodul_factory(controllers=1, zones=2, tiles=4)
+    queue = RequestQueue()
+    clients = [
+        Tech(async_get_clientsession(hass), USER_ID, TOKEN, base_url=url, queue=queue)
+        for _ in range(4)
+    ]
+    fake.delay = 0.1
+
+    polls = [
+        asyncio.create_task(client.get_module_data(UDID))
+        for client in clients
+        for _ in range(2)
+    ]
+    await asyncio.sleep(0.01)
+    await clients[0].set_zone(UDID, 1, False)
+    assert not all(poll.done() for poll in polls)
+    await asyncio.gather(*polls)
+
+    stats = queue.as_dict()
+    assert stats["write"]["requests"] == 1
+    assert stats["write"]["max_wait_ms"] < 50
+    assert stats["poll"]["requests"] == 8
+    assert stats["poll"]["max_wait_ms"] >= 250
+
+    # the next read of the module confirms the write
+    await clients[0].get_module_data(UDID)
+    assert queue.as_dict()["confirm"]["requests"] == 1
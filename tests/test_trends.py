@@ -0,0 +1,67 @@
+"""Tests for the zone temperature trends."""
+import pytest
+
+from custom_components.tech.const import DOMAIN
+from custom_components.tech.trends import TREND_SAMPLES, ZoneTrend
+from homeassistant.components.sensor import DOMAIN as SENSOR_DOMAIN
+from homeassistant.core import HomeAssistant
+
+from .conftest import build_config_entry, entity_id_for, patch_base_url
+
+START = 1_700_000_000.0
+
+
+def test_rate_of_a_linear_series() -> None:
+    """A steady rise gives its rate, also after many wraps of the buffer."""
+    trend = ZoneTrend()
+    trend.push(START, 20.0)
+    trend.push(START + 120, 20.1)
+    assert trend.rate is None
+
+    # 0.1 °C per 2 minutes is 3 °C/h
+    for i in range(2, 100 * TREND_SAMPLES):
+        trend.push(START + 120 * i, 20.0 + 0.1 * i)
+    assert trend.count == TREND_SAMPLES
+    assert trend.rate == pytest.approx(3.0)
+
+
+def test_rate_follows_the_window() -> None:
+    """Readings evicted from the buffer no longer affect the trend."""
+    trend = ZoneTrend(size=5)
+    for i in range(5):
+        trend.push(START + 120 * i, 25.0 - i)
+    for i in range(5, 10):
+        trend.push(START + 120 * i, 20.0)
+    assert trend.rate == pytest.approx(0.0)
+
+
+def test_time_to() -> None:
+    """The time to a target follows the trend and its direction."""
+    trend = ZoneTrend()
+    for i in range(5):
+        trend.push(START + 600 * i, 19.0 + 0.5 * i)
+    # 3 °C/h from 21 °C
+    assert trend.time_to(22.5) == pytest.approx(30)
+    assert trend.time_to(21.05) == 0
+    assert trend.time_to(20.0) is None
+
+
+async def test_trend_sensors(hass: HomeAssistant, fake_emodul_factory) -> None:
+    """The trend sensors of a zone follow the polled temperatures."""
+    fake, url = await fake_emodul_factory(zones=1, tiles=1)
+    entry = build_config_entry(fake.controllers[0])
+    entry.add_to_hass(hass)
+    with patch_base_url(url):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    trend_id = entity_id_for(hass, SENSOR_DOMAIN, "udid-0000_zone_1_temperature_trend")
+    assert hass.states.get(trend_id).state == "unknown"
+
+    zone = fake.modules["udid-0000"]["zones"]["elements"][0]["zone"]
+    for _ in range(3):
+        zone["currentTemperature"] += 1
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+    assert float(hass.states.get(trend_id).state) > 0
+    assert await hass.config_entries.async_unload(entry.entry_id)